@@ -0,0 +1,121 @@
+"""Cold-start benchmark: import time and time-to-first-response.
+
+Run from the backend directory (or via ``make bench-startup``):
+
+    python scripts/bench_startup.py [--runs 5] [--budget-ms 1000]
+
+Each run uses a fresh interpreter, so module caches don't hide import cost.
+Exits with status 1 if the median time-to-first-response exceeds the budget.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = (
+    "import time; t = time.perf_counter(); import src.main; "
+    "print((time.perf_counter() - t) * 1000)"
+)
+
+
+def _env() -> dict[str, str]:
+    return {**os.environ, "PYTHONPATH": str(BACKEND_DIR), "PYTHONDONTWRITEBYTECODE": ""}
+
+
+def measure_import() -> float:
+    """Milliseconds to import the app in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def slowest_imports(limit: int = 8) -> list[tuple[str, int]]:
+    """Project modules with the highest self import time, in microseconds."""
+    out = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=BACKEND_DIR,
+        env=_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in out.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip().startswith("src"):
+            rows.append((parts[2].strip(), int(parts[0].split(":")[1])))
+    return sorted(rows, key=lambda row: row[1], reverse=True)[:limit]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(path: str, timeout: float = 30.0) -> float:
+    """Milliseconds from process spawn until ``path`` answers 200."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}{path}"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        env=_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.005)
+        raise TimeoutError(f"No response from {url} within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--path", default="/api/v1/system/overview")
+    args = parser.parse_args()
+
+    imports = [measure_import() for _ in range(args.runs)]
+    first = [measure_first_response(args.path) for _ in range(args.runs)]
+    import_ms = statistics.median(imports)
+    first_ms = statistics.median(first)
+
+    print(f"import src.main          median {import_ms:7.1f} ms  (min {min(imports):.1f})")
+    print(f"first response {args.path}")
+    print(f"                         median {first_ms:7.1f} ms  (min {min(first):.1f})")
+    print("slowest project imports (self time):")
+    for module, micros in slowest_imports():
+        print(f"  {module:40s} {micros / 1000:6.1f} ms")
+
+    if first_ms > args.budget_ms:
+        print(f"FAIL: first response {first_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        sys.exit(1)
+    print(f"OK: within {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,17 @@
+from .events import router as events_router
+from .jobs import router as jobs_router
+from .models import router as models_router
 from .services import router as services_router
-from .workers import router as workers_router
 from .system import router as system_router
+from .workers import batch_router as workers_batch_router
+from .workers import router as workers_router
 
-__all__ = ["services_router", "workers_router", "system_router"]
+__all__ = [
+    "services_router",
+    "workers_router",
+    "workers_batch_router",
+    "system_router",
+    "jobs_router",
+    "models_router",
+    "events_router",
+]
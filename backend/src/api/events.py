@@ -0,0 +1,39 @@
+"""Event journal API endpoints."""
+import asyncio
+import time
+from typing import Any
+
+from fastapi import APIRouter, Query
+from pydantic import BaseModel
+
+from ..services.events import event_journal
+
+router = APIRouter(prefix="/api/v1/events", tags=["events"])
+
+
+class EventListResponse(BaseModel):
+    events: list[dict[str, Any]]
+    next_since: float | None = None  # Pass as `since` for the next page
+    timestamp: float
+
+
+@router.get("", response_model=EventListResponse)
+async def list_events(
+    since: float | None = Query(None, description="Unix time; default: the last 24 hours"),
+    until: float | None = Query(None, description="Unix time"),
+    service: str | None = Query(None, description="Only events of this service"),
+    kind: str | None = Query(
+        None,
+        description="service_status, worker_status, action_requested, action_finished "
+        "or eviction",
+    ),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Query the event journal, oldest first."""
+    if since is None:
+        since = time.time() - 86400
+    # Segment reads are blocking file I/O
+    events, next_since = await asyncio.to_thread(
+        event_journal.query, since, until, service, kind, limit
+    )
+    return EventListResponse(events=events, next_since=next_since, timestamp=time.time())
@@ -0,0 +1,29 @@
+"""Job tracking API endpoints."""
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+
+from ..services.jobs import job_table
+from .workers import JobStatus
+
+router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+
+class JobListResponse(BaseModel):
+    jobs: list[JobStatus]
+
+
+@router.get("", response_model=JobListResponse)
+async def list_jobs():
+    """List recent worker action jobs."""
+    return JobListResponse(jobs=[JobStatus(**job) for job in job_table.list_jobs()])
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """Get the state of a worker action job."""
+    job = job_table.get(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    return JobStatus(**job)
@@ -0,0 +1,78 @@
+"""Model catalog API endpoints."""
+from fastapi import APIRouter, HTTPException, Query
+from pydantic import BaseModel
+
+from ..services.model_catalog import model_catalog
+
+router = APIRouter(prefix="/api/v1/models", tags=["models"])
+
+
+class CatalogModel(BaseModel):
+    model: str
+    alias: str | None = None
+    type: str | None = None
+    service_id: str
+    service_name: str
+    owned_by: str | None = None
+
+
+class CatalogSource(BaseModel):
+    service_id: str
+    fetched_at: float
+    model_count: int
+    error: str | None = None
+
+
+class ModelCatalogResponse(BaseModel):
+    models: list[CatalogModel]
+    total: int
+    sources: list[CatalogSource]
+
+
+def _sources() -> list[CatalogSource]:
+    return [
+        CatalogSource(
+            service_id=service_id,
+            fetched_at=source["fetched_at"],
+            model_count=len(source["models"]),
+            error=source["error"],
+        )
+        for service_id, source in model_catalog.sources.items()
+    ]
+
+
+@router.get("", response_model=ModelCatalogResponse)
+async def search_models(
+    q: str | None = Query(None, description="Substring of model ID or alias"),
+    type: str | None = Query(None, description="Model/worker type, e.g. vlm, llm"),
+    service: str | None = Query(None, description="Only models hosted by this service"),
+    refresh: bool = Query(False, description="Refetch every gateway now"),
+):
+    """Search models across every service's gateway."""
+    await model_catalog.refresh(force=refresh)
+    models = model_catalog.search(q, type, service)
+
+    return ModelCatalogResponse(
+        models=[CatalogModel(**m) for m in models],
+        total=len(models),
+        sources=_sources(),
+    )
+
+
+@router.get("/{name:path}", response_model=ModelCatalogResponse)
+async def locate_model(name: str):
+    """Find which services host a model, by exact model ID or alias.
+
+    Model IDs may contain slashes (``mlx-community/...``).
+    """
+    await model_catalog.refresh()
+    models = model_catalog.lookup(name)
+
+    if not models:
+        raise HTTPException(status_code=404, detail=f"Model not found: {name}")
+
+    return ModelCatalogResponse(
+        models=[CatalogModel(**m) for m in models],
+        total=len(models),
+        sources=_sources(),
+    )
@@ -1,15 +1,29 @@
 """Service status API endpoints."""
+import asyncio
+import base64
+import bisect
+import json
 import time
+from collections.abc import Callable
 from typing import Any
 
-import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
 from ..core import ServiceRegistry
+from ..services.edge_cache import edge_cache
+from ..services.probes import gateway_prober
+from ..services.proxy import proxy_get
+from ..services.status_store import status_store
+from ..services.synthetic_probes import synthetic_prober
+from ..services.upstream import CircuitOpenError, upstream
 
 router = APIRouter(prefix="/api/v1/services", tags=["services"])
 
+# Gateway endpoints from EndpointsConfig that may be read through the dashboard
+PROXIED_ENDPOINTS = ("status", "models")
+
 
 class GatewayStatus(BaseModel):
     reachable: bool
@@ -26,6 +40,7 @@ class WorkerStatus(BaseModel):
     memory_gb: float | None = None
     uptime_seconds: float | None = None
     idle_seconds: float | None = None
+    discovered: bool = False  # Found by worker discovery rather than configured
 
 
 class ServiceStatus(BaseModel):
@@ -36,84 +51,80 @@ class ServiceStatus(BaseModel):
     status: str  # healthy, unhealthy, unknown
     gateway: GatewayStatus
     workers: list[WorkerStatus]
+    peer: str | None = None  # Set for services merged in from a peer dashboard
 
 
 class ServiceListResponse(BaseModel):
     services: list[ServiceStatus]
     timestamp: float
-
-
-async def check_gateway_health(gateway_url: str, health_endpoint: str) -> GatewayStatus:
-    """Check if a gateway is reachable."""
-    try:
-        start = time.time()
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{gateway_url}{health_endpoint}")
-            latency = (time.time() - start) * 1000
-            if response.status_code == 200:
-                return GatewayStatus(reachable=True, latency_ms=round(latency, 2))
-            return GatewayStatus(
-                reachable=False,
-                latency_ms=round(latency, 2),
-                error=f"HTTP {response.status_code}",
-            )
-    except httpx.TimeoutException:
-        return GatewayStatus(reachable=False, error="Timeout")
-    except httpx.ConnectError:
-        return GatewayStatus(reachable=False, error="Connection refused")
-    except Exception as e:
-        return GatewayStatus(reachable=False, error=str(e))
+    next_cursor: str | None = None
+    total: int | None = None  # Services matching the filters, across all pages
 
 
 async def get_worker_status(
-    worker_manager_url: str, workers_config: list
+    worker_manager_url: str, workers_config: list, service_id: str | None = None
 ) -> list[WorkerStatus]:
     """Get worker status from worker manager."""
     workers = []
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{worker_manager_url}/status")
-            if response.status_code == 200:
-                data = response.json()
-                active_workers = data.get("workers", {})
-
-                for worker_cfg in workers_config:
-                    alias = worker_cfg.alias
-                    if alias in active_workers:
-                        w = active_workers[alias]
-                        workers.append(
-                            WorkerStatus(
-                                alias=alias,
-                                name=worker_cfg.name,
-                                type=worker_cfg.type,
-                                status="running",
-                                port=w.get("port"),
-                                memory_gb=w.get("memory_gb"),
-                                uptime_seconds=w.get("uptime_seconds"),
-                                idle_seconds=w.get("idle_seconds"),
-                            )
-                        )
-                    else:
-                        workers.append(
-                            WorkerStatus(
-                                alias=alias,
-                                name=worker_cfg.name,
-                                type=worker_cfg.type,
-                                status="stopped",
-                            )
+        response = await upstream.get(f"{worker_manager_url}/status", timeout=5.0)
+        if response.status_code == 200:
+            data = response.json()
+            active_workers = data.get("workers", {})
+
+            for worker_cfg in workers_config:
+                alias = worker_cfg.alias
+                if alias in active_workers:
+                    w = active_workers[alias]
+                    workers.append(
+                        WorkerStatus(
+                            alias=alias,
+                            name=worker_cfg.name,
+                            type=worker_cfg.type,
+                            status="running",
+                            port=w.get("port"),
+                            memory_gb=w.get("memory_gb"),
+                            uptime_seconds=w.get("uptime_seconds"),
+                            idle_seconds=synthetic_prober.effective_idle(
+                                service_id, alias, w.get("idle_seconds")
+                            ),
+                            discovered=worker_cfg.discovered,
                         )
-            else:
-                # Worker manager not responding properly
-                for worker_cfg in workers_config:
+                    )
+                else:
                     workers.append(
                         WorkerStatus(
-                            alias=worker_cfg.alias,
+                            alias=alias,
                             name=worker_cfg.name,
                             type=worker_cfg.type,
-                            status="unknown",
+                            status="stopped",
+                            discovered=worker_cfg.discovered,
                         )
                     )
+        else:
+            # Worker manager not responding properly
+            for worker_cfg in workers_config:
+                workers.append(
+                    WorkerStatus(
+                        alias=worker_cfg.alias,
+                        name=worker_cfg.name,
+                        type=worker_cfg.type,
+                        status="unknown",
+                        discovered=worker_cfg.discovered,
+                    )
+                )
+    except CircuitOpenError:
+        # Fail fast with the last known workers while the breaker is open
+        cached = status_store.get_service(service_id) if service_id else None
+        if cached:
+            return [WorkerStatus(**w) for w in cached["workers"]]
+        workers = [
+            WorkerStatus(
+                alias=w.alias, name=w.name, type=w.type, status="unknown", discovered=w.discovered
+            )
+            for w in workers_config
+        ]
     except Exception:
         # Worker manager not reachable
         for worker_cfg in workers_config:
@@ -123,73 +134,68 @@ async def get_worker_status(
                     name=worker_cfg.name,
                     type=worker_cfg.type,
                     status="unknown",
+                    discovered=worker_cfg.discovered,
                 )
             )
 
     return workers
 
 
-@router.get("", response_model=ServiceListResponse)
-async def list_services():
-    """List all services with their current status."""
-    registry = ServiceRegistry()
-    services = []
+def _sort_key_latency(status: dict[str, Any]) -> float:
+    latency = status.get("gateway", {}).get("latency_ms")
+    return latency if latency is not None else float("inf")
 
-    for service_cfg in registry.list_services():
-        # Check gateway health
-        gateway_status = await check_gateway_health(
-            service_cfg.gateway.url, service_cfg.endpoints.health
-        )
 
-        # Get worker status
-        workers = await get_worker_status(
-            service_cfg.worker_manager.url, service_cfg.workers
-        )
+# Sortable fields for service listings
+SORT_KEYS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    "service_id": lambda status: status["service_id"],
+    "name": lambda status: status.get("name", "").lower(),
+    "status": lambda status: status.get("status", "unknown"),
+    "latency_ms": _sort_key_latency,
+}
 
-        # Determine overall status
-        if gateway_status.reachable:
-            status = "healthy"
-        else:
-            status = "unhealthy"
-
-        services.append(
-            ServiceStatus(
-                service_id=service_cfg.id,
-                name=service_cfg.name,
-                description=service_cfg.description,
-                icon=service_cfg.icon,
-                status=status,
-                gateway=gateway_status,
-                workers=workers,
-            )
-        )
 
-    return ServiceListResponse(services=services, timestamp=time.time())
+def _encode_cursor(sort: str, key: tuple) -> str:
+    raw = json.dumps([sort, *key]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
 
 
-@router.get("/{service_id}", response_model=ServiceStatus)
-async def get_service(service_id: str):
-    """Get detailed status for a specific service."""
-    registry = ServiceRegistry()
-    service_cfg = registry.get_service(service_id)
-
-    if not service_cfg:
-        raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
-
-    # Check gateway health
-    gateway_status = await check_gateway_health(
-        service_cfg.gateway.url, service_cfg.endpoints.health
+def _decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        decoded = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(decoded, list) or len(decoded) != 3:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    cursor_sort, *key = decoded
+    if cursor_sort != sort:
+        raise HTTPException(status_code=400, detail="Cursor does not match this sort order")
+    # The key is compared against (sort value, service ID) tuples, so its types must match
+    value_type = (int, float) if sort.removeprefix("-") == "latency_ms" else str
+    value, service_id = key
+    if isinstance(value, bool) or not isinstance(value, value_type):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(service_id, str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return tuple(key)
+
+
+async def _check_service(service_cfg) -> ServiceStatus:
+    """Check a service live and record the result in the status store."""
+    # Check gateway health with the service's probe, now, without breaker trials
+    gateway_status = GatewayStatus(
+        **await gateway_prober.check(service_cfg, force=True, trial=False)
     )
 
     # Get worker status
     workers = await get_worker_status(
-        service_cfg.worker_manager.url, service_cfg.workers
+        service_cfg.worker_manager.url, service_cfg.workers, service_cfg.id
     )
 
     # Determine overall status
     status = "healthy" if gateway_status.reachable else "unhealthy"
 
-    return ServiceStatus(
+    service_status = ServiceStatus(
         service_id=service_cfg.id,
         name=service_cfg.name,
         description=service_cfg.description,
@@ -198,22 +204,144 @@ async def get_service(service_id: str):
         gateway=gateway_status,
         workers=workers,
     )
+    # Keep the overview aggregates consistent with what we just served
+    status_store.update_service(service_status.model_dump())
+    return service_status
 
 
-@router.get("/{service_id}/status")
-async def get_service_system_status(service_id: str) -> dict[str, Any]:
-    """Proxy to the service's /v1/system/status endpoint."""
+@router.get("", response_model=ServiceListResponse)
+async def list_services(
+    request: Request,
+    status: str | None = Query(None, description="healthy, unhealthy or unknown"),
+    type: str | None = Query(None, description="Only services with a worker of this type"),
+    worker_status: str | None = Query(
+        None, description="Only services with a worker in this status (with type: that worker)"
+    ),
+    sort: str = Query(
+        "service_id", description="service_id, name, status or latency_ms; '-' for descending"
+    ),
+    limit: int | None = Query(None, ge=1, le=1000, description="Page size (default: all)"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page"),
+    fields: str | None = Query(None, description="Comma-separated fields, e.g. service_id,status"),
+    refresh: bool = Query(False, description="Check the returned services live first"),
+):
+    """List services from the status store with filtering, sorting and pagination.
+
+    Filters are answered from the store's index, so the work done scales
+    with the page requested rather than the size of the fleet. Without
+    ``refresh`` the response is built once per snapshot and carries edge
+    cache headers.
+    """
+    if not status_store.services:
+        status_store.seed(ServiceRegistry().list_services())
+    if not refresh:
+        cached = edge_cache.cached(request)
+        if cached is not None:
+            return cached
+
+    descending = sort.startswith("-")
+    sort_field = sort.removeprefix("-")
+    if sort_field not in SORT_KEYS:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by: {sort_field}")
+
+    selected = None
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = set(selected) - ServiceStatus.model_fields.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {sorted(unknown)}")
+
+    after = _decode_cursor(cursor, sort) if cursor else None
+    ids = status_store.query(status, type, worker_status)
+    if ids is None and sort == "service_id":
+        # The store keeps IDs sorted, so the default listing needs no sort
+        total = len(status_store.sorted_ids)
+        start = bisect.bisect_right(status_store.sorted_ids, after[1]) if after else 0
+        end = start + limit if limit else total
+        keyed = [(sid, sid) for sid in status_store.sorted_ids[start : end + 1]]
+    else:
+        key_fn = SORT_KEYS[sort_field]
+        candidates = status_store.sorted_ids if ids is None else ids
+        total = len(candidates)
+        keyed = sorted(
+            ((key_fn(status_store.services[sid]), sid) for sid in candidates),
+            reverse=descending,
+        )
+        if after:
+            keyed = [k for k in keyed if (k < after if descending else k > after)]
+
+    page = keyed[:limit] if limit else keyed
+    next_cursor = _encode_cursor(sort, page[-1]) if limit and len(keyed) > limit else None
+
+    if refresh:
+        registry = ServiceRegistry()
+        service_cfgs = [registry.get_service(sid) for _, sid in page]
+        await asyncio.gather(*(_check_service(cfg) for cfg in service_cfgs if cfg))
+
+    statuses = [status_store.services[sid] for _, sid in page]
+    if selected is not None:
+        # Sparse fieldsets skip response model validation
+        content = {
+            "services": [{f: s.get(f) for f in selected} for s in statuses],
+            "timestamp": time.time(),
+            "next_cursor": next_cursor,
+            "total": total,
+        }
+    else:
+        content = ServiceListResponse(
+            services=[ServiceStatus(**s) for s in statuses],
+            timestamp=time.time(),
+            next_cursor=next_cursor,
+            total=total,
+        ).model_dump()
+
+    if refresh:
+        return JSONResponse(content)
+    surrogate_keys = ["services", *(f"service/{sid}" for _, sid in page)]
+    return edge_cache.respond(request, content, surrogate_keys)
+
+
+@router.get("/{service_id}", response_model=ServiceStatus)
+async def get_service(service_id: str):
+    """Get detailed status for a specific service."""
     registry = ServiceRegistry()
     service_cfg = registry.get_service(service_id)
 
     if not service_cfg:
         raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
 
+    return await _check_service(service_cfg)
+
+
+@router.get("/{service_id}/endpoints/{endpoint}")
+async def proxy_service_endpoint(service_id: str, endpoint: str, request: Request):
+    """Stream one of the service's configured gateway endpoints (status, models)."""
+    registry = ServiceRegistry()
+    service_cfg = registry.get_service(service_id)
+
+    if not service_cfg:
+        raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
+
+    if endpoint not in PROXIED_ENDPOINTS:
+        raise HTTPException(status_code=404, detail=f"Endpoint not proxied: {endpoint}")
+
+    path = getattr(service_cfg.endpoints, endpoint)
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                f"{service_cfg.gateway.url}{service_cfg.endpoints.status}"
-            )
-            return response.json()
+        return await proxy_get(
+            f"{service_cfg.gateway.url}{path}",
+            request.headers.get("accept-encoding", "identity"),
+        )
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Service unavailable: {e}")
+
+
+@router.get("/{service_id}/status")
+async def get_service_system_status(service_id: str, request: Request):
+    """Proxy to the service's /v1/system/status endpoint."""
+    return await proxy_service_endpoint(service_id, "status", request)
+
+
+@router.get("/{service_id}/models")
+async def get_service_models(service_id: str, request: Request):
+    """Proxy to the service's /v1/models endpoint."""
+    return await proxy_service_endpoint(service_id, "models", request)
@@ -1,12 +1,26 @@
 """System information API endpoints."""
 import time
+from datetime import datetime, timedelta
 from typing import Any
 
-import httpx
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 
-from ..core import ServiceRegistry
+from ..core import ServiceRegistry, get_config
+from ..services.admission import admission_controller
+from ..services.alerts import alert_engine
+from ..services.edge_cache import edge_cache
+from ..services.events import event_journal
+from ..services.eviction_policy import eviction_policy
+from ..services.federation import federation
+from ..services.jobs import job_table
+from ..services.prewarm import prewarm_scheduler
+from ..services.status_store import status_store
+from ..services.synthetic_probes import synthetic_prober
+from ..services.upstream import upstream
+from ..services.worker_actions import ALL_WORKERS
+from ..ws import ws_manager
+from .workers import client_id, rate_limited
 
 router = APIRouter(prefix="/api/v1/system", tags=["system"])
 
@@ -36,97 +50,21 @@ class SystemOverview(BaseModel):
     worker_managers: list[WorkerManagerStatus]
 
 
-async def get_worker_manager_status(
-    service_id: str, worker_manager_url: str
-) -> WorkerManagerStatus:
-    """Get status from a worker manager."""
-    try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{worker_manager_url}/status")
-            if response.status_code == 200:
-                data = response.json()
-                workers = data.get("workers", {})
-
-                # Extract memory info if available
-                memory = None
-                if "memory" in data:
-                    mem = data["memory"]
-                    memory = MemoryStatus(
-                        total_gb=mem.get("total_gb", 0),
-                        available_gb=mem.get("available_gb", 0),
-                        used_gb=mem.get("used_gb", 0),
-                        used_percent=mem.get("used_percent", 0),
-                    )
-
-                return WorkerManagerStatus(
-                    service_id=service_id,
-                    reachable=True,
-                    workers_count=len(workers),
-                    memory=memory,
-                )
-            return WorkerManagerStatus(
-                service_id=service_id,
-                reachable=False,
-                workers_count=0,
-                error=f"HTTP {response.status_code}",
-            )
-    except Exception as e:
-        return WorkerManagerStatus(
-            service_id=service_id,
-            reachable=False,
-            workers_count=0,
-            error=str(e),
-        )
-
-
 @router.get("/overview", response_model=SystemOverview)
-async def get_system_overview():
-    """Get overall system status."""
-    registry = ServiceRegistry()
-
-    healthy_services = 0
-    unhealthy_services = 0
-    total_workers = 0
-    running_workers = 0
-    worker_managers: list[WorkerManagerStatus] = []
-
-    # Track unique worker manager URLs to avoid duplicates
-    seen_wm_urls: set[str] = set()
-
-    for service_cfg in registry.list_services():
-        # Check gateway health
-        try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"{service_cfg.gateway.url}{service_cfg.endpoints.health}"
-                )
-                if response.status_code == 200:
-                    healthy_services += 1
-                else:
-                    unhealthy_services += 1
-        except Exception:
-            unhealthy_services += 1
-
-        # Count workers
-        total_workers += len(service_cfg.workers)
-
-        # Get worker manager status (deduplicated)
-        wm_url = service_cfg.worker_manager.url
-        if wm_url not in seen_wm_urls:
-            seen_wm_urls.add(wm_url)
-            wm_status = await get_worker_manager_status(service_cfg.id, wm_url)
-            worker_managers.append(wm_status)
-            running_workers += wm_status.workers_count
-
-    return SystemOverview(
-        timestamp=time.time(),
-        services_count=len(registry.list_services()),
-        healthy_services=healthy_services,
-        unhealthy_services=unhealthy_services,
-        total_workers=total_workers,
-        running_workers=running_workers,
-        worker_managers=worker_managers,
-    )
+async def get_system_overview(request: Request):
+    """Get overall system status from the aggregates kept by the health checker.
+
+    The overview only changes with the store's state version, so its body
+    is built and compressed once per version.
+    """
+    if not status_store.services:
+        status_store.seed(ServiceRegistry().list_services())
+    revision = f"v{status_store.version}"
+    cached = edge_cache.cached(request, revision)
+    if cached is not None:
+        return cached
+    content = SystemOverview(**status_store.overview()).model_dump()
+    return edge_cache.respond(request, content, ["overview"], revision)
 
 
 @router.get("/memory")
@@ -142,18 +80,17 @@ async def get_system_memory() -> dict[str, Any]:
         if wm_url not in seen_wm_urls:
             seen_wm_urls.add(wm_url)
             try:
-                async with httpx.AsyncClient(timeout=5.0) as client:
-                    response = await client.get(f"{wm_url}/status")
-                    if response.status_code == 200:
-                        data = response.json()
-                        if "memory" in data:
-                            memory_info.append(
-                                {
-                                    "source": wm_url,
-                                    "service_id": service_cfg.id,
-                                    **data["memory"],
-                                }
-                            )
+                response = await upstream.get(f"{wm_url}/status", timeout=5.0)
+                if response.status_code == 200:
+                    data = response.json()
+                    if "memory" in data:
+                        memory_info.append(
+                            {
+                                "source": wm_url,
+                                "service_id": service_cfg.id,
+                                **data["memory"],
+                            }
+                        )
             except Exception:
                 pass
 
@@ -163,26 +100,127 @@ async def get_system_memory() -> dict[str, Any]:
     }
 
 
-@router.post("/worker-manager/{service_id}/stop-all")
-async def stop_all_workers(service_id: str):
-    """Stop all workers for a service via worker manager."""
+@router.get("/eviction")
+async def get_eviction_audit() -> dict[str, Any]:
+    """Get the idle-worker eviction policy state and its audit log."""
+    config = eviction_policy.config
+    return {
+        "enabled": config.enabled,
+        "action": config.action,
+        "memory_pressure_percent": config.memory_pressure_percent,
+        "max_evictions": config.max_evictions,
+        "rate_window_seconds": config.rate_window_seconds,
+        "audit": list(reversed(eviction_policy.audit)),
+    }
+
+
+@router.get("/prewarm")
+async def get_prewarm_status() -> dict[str, Any]:
+    """Get the learned demand histogram and the workers due for pre-warming."""
+    config = prewarm_scheduler.config
+    target = datetime.now() + timedelta(minutes=config.lead_minutes)
+    slot = prewarm_scheduler.slot_of(target)
+    return {
+        "enabled": config.enabled,
+        "slot_minutes": config.slot_minutes,
+        "observed_days": prewarm_scheduler.history["days"],
+        "next_slot": slot,
+        "next_slot_probabilities": prewarm_scheduler.probabilities(slot),
+        "histogram": prewarm_scheduler.history["workers"],
+    }
+
+
+@router.get("/alerts")
+async def get_alerts() -> dict[str, Any]:
+    """Get firing alerts and recently resolved ones."""
+    return {
+        "enabled": alert_engine.config.enabled,
+        "timestamp": time.time(),
+        "active": list(alert_engine.active.values()),
+        "resolved": list(reversed(alert_engine.history)),
+    }
+
+
+@router.get("/probes")
+async def get_synthetic_probes() -> dict[str, Any]:
+    """Get synthetic inference probe latencies per worker."""
+    config = synthetic_prober.config
+    return {
+        "enabled": config.enabled,
+        "interval_seconds": config.interval_seconds,
+        "workers": synthetic_prober.summary(),
+    }
+
+
+@router.get("/admission")
+async def get_admission_status() -> dict[str, Any]:
+    """Get the spawn queue of every worker manager and the actions in flight."""
+    config = admission_controller.config
+    return {
+        "enabled": config.enabled,
+        "max_concurrent_spawns": config.max_concurrent_spawns,
+        "rate_per_minute": config.rate_per_minute,
+        "burst": config.burst,
+        "worker_managers": admission_controller.status(),
+        "in_flight": [
+            {"service_id": service_id, "alias": alias, "action": action, "job_id": job_id}
+            for (service_id, alias, action), job_id in admission_controller.in_flight.items()
+        ],
+    }
+
+
+@router.get("/connections")
+async def get_websocket_connections() -> dict[str, Any]:
+    """Get the liveness and heartbeat round-trip time of every WebSocket client."""
+    return {
+        "timestamp": time.time(),
+        "heartbeat_interval_seconds": get_config().websocket.heartbeat_interval_seconds,
+        "connections": ws_manager.connection_stats(),
+    }
+
+
+@router.get("/federation")
+async def get_federation_status() -> dict[str, Any]:
+    """Get the health and lag of every federated peer dashboard."""
+    return {"timestamp": time.time(), "peers": federation.status()}
+
+
+@router.get("/upstreams")
+async def get_upstream_breakers() -> dict[str, Any]:
+    """Get the circuit breaker state of every upstream target."""
+    return {
+        "timestamp": time.time(),
+        "breakers": [breaker.status() for breaker in upstream.breakers.values()],
+    }
+
+
+@router.post("/worker-manager/{service_id}/stop-all", dependencies=[Depends(rate_limited)])
+async def stop_all_workers(service_id: str, request: Request):
+    """Stop all workers for a service via worker manager.
+
+    Runs as a job through the admission controller like single worker
+    actions, so a stop-all already in flight is joined, not repeated.
+    """
     registry = ServiceRegistry()
     service_cfg = registry.get_service(service_id)
 
     if not service_cfg:
         raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
 
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{service_cfg.worker_manager.url}/stop-all"
-            )
-            if response.status_code == 200:
-                return {"success": True, "message": "All workers stopped"}
-            else:
-                return {
-                    "success": False,
-                    "message": f"Failed: HTTP {response.status_code}",
-                }
-    except httpx.ConnectError:
-        raise HTTPException(status_code=503, detail="Worker manager not reachable")
+    job, deduplicated = admission_controller.submit(service_cfg, ALL_WORKERS, "stop-all")
+    await event_journal.emit(
+        "action_requested",
+        service_id,
+        action="stop-all",
+        client=client_id(request),
+        job_id=job["job_id"],
+        deduplicated=deduplicated,
+    )
+    job = await job_table.wait(job["job_id"])
+    if job["result"] is None:
+        raise HTTPException(status_code=job["status_code"] or 500, detail=job["error"])
+    return {
+        "success": job["result"]["success"],
+        "message": job["result"]["message"],
+        "job_id": job["job_id"],
+    }
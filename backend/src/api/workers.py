@@ -1,13 +1,26 @@
 """Worker control API endpoints."""
-from typing import Any
+import asyncio
+import math
+import uuid
+from collections import defaultdict
+from typing import Any, Literal
 
 import httpx
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 
 from ..core import ServiceRegistry
+from ..services.admission import RateLimitExceeded, admission_controller
+from ..services.events import event_journal
+from ..services.jobs import job_table
+from ..services.planner import PlacementPlanner
+from ..services.synthetic_probes import synthetic_prober
+from ..services.upstream import upstream
+from ..ws import ws_manager
 
 router = APIRouter(prefix="/api/v1/services/{service_id}/workers", tags=["workers"])
+batch_router = APIRouter(prefix="/api/v1/workers", tags=["workers"])
 
 
 class WorkerActionResponse(BaseModel):
@@ -16,6 +29,87 @@ class WorkerActionResponse(BaseModel):
     worker_alias: str
     action: str
     data: dict[str, Any] | None = None
+    job_id: str | None = None
+
+
+class JobStatus(BaseModel):
+    job_id: str
+    action: str
+    service_id: str
+    worker_alias: str
+    state: str  # pending, running, succeeded, failed
+    created_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: WorkerActionResponse | None = None
+    error: str | None = None
+    status_code: int | None = None
+
+
+# Worker actions answer 202 with the job unless called with ?wait=true
+JOB_ACCEPTED_RESPONSES: dict[int | str, dict[str, Any]] = {
+    202: {
+        "model": JobStatus,
+        "description": "Job accepted; track it at /api/v1/jobs/{job_id}",
+        "headers": {
+            "X-Deduplicated": {
+                "description": "'true' when an identical action was already in flight",
+                "schema": {"type": "string"},
+            }
+        },
+    },
+}
+
+
+class EvictionCandidate(BaseModel):
+    service_id: str
+    alias: str
+    memory_gb: float
+    idle_seconds: float
+
+
+class PlacementPlan(BaseModel):
+    service_id: str
+    alias: str
+    required_gb: float | None = None
+    available_gb: float | None = None
+    headroom_gb: float
+    shortfall_gb: float
+    freed_gb: float
+    evict: list[EvictionCandidate]
+    feasible: bool
+    reason: str | None = None
+
+
+class BatchItem(BaseModel):
+    service_id: str
+    alias: str
+    action: Literal["spawn", "stop", "evict"]
+
+
+class BatchRequest(BaseModel):
+    items: list[BatchItem] = Field(min_length=1)
+    max_parallel: int = Field(default=2, ge=1, le=16)  # per worker manager
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    service_id: str
+    alias: str
+    action: str
+    success: bool
+    message: str
+    data: dict[str, Any] | None = None
+    job_id: str | None = None
+    deduplicated: bool = False
+
+
+class BatchResponse(BaseModel):
+    batch_id: str
+    total: int
+    succeeded: int
+    failed: int
+    results: list[BatchItemResult]
 
 
 @router.get("")
@@ -28,93 +122,152 @@ async def list_workers(service_id: str):
         raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
 
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{service_cfg.worker_manager.url}/status")
-            if response.status_code == 200:
-                data = response.json()
-                active_workers = data.get("workers", {})
-
-                workers = []
-                for worker_cfg in service_cfg.workers:
-                    alias = worker_cfg.alias
-                    if alias in active_workers:
-                        w = active_workers[alias]
-                        workers.append(
-                            {
-                                "alias": alias,
-                                "name": worker_cfg.name,
-                                "type": worker_cfg.type,
-                                "status": "running",
-                                "port": w.get("port"),
-                                "memory_gb": w.get("memory_gb"),
-                                "uptime_seconds": w.get("uptime_seconds"),
-                                "idle_seconds": w.get("idle_seconds"),
-                            }
-                        )
-                    else:
-                        workers.append(
-                            {
-                                "alias": alias,
-                                "name": worker_cfg.name,
-                                "type": worker_cfg.type,
-                                "status": "stopped",
-                            }
-                        )
-                return {"workers": workers}
-            else:
-                raise HTTPException(
-                    status_code=503, detail="Worker manager not responding"
-                )
+        response = await upstream.get(f"{service_cfg.worker_manager.url}/status", timeout=5.0)
+        if response.status_code == 200:
+            data = response.json()
+            active_workers = data.get("workers", {})
+
+            workers = []
+            for worker_cfg in service_cfg.workers:
+                alias = worker_cfg.alias
+                if alias in active_workers:
+                    w = active_workers[alias]
+                    workers.append(
+                        {
+                            "alias": alias,
+                            "name": worker_cfg.name,
+                            "type": worker_cfg.type,
+                            "status": "running",
+                            "port": w.get("port"),
+                            "memory_gb": w.get("memory_gb"),
+                            "uptime_seconds": w.get("uptime_seconds"),
+                            "idle_seconds": synthetic_prober.effective_idle(
+                                service_id, alias, w.get("idle_seconds")
+                            ),
+                        }
+                    )
+                else:
+                    workers.append(
+                        {
+                            "alias": alias,
+                            "name": worker_cfg.name,
+                            "type": worker_cfg.type,
+                            "status": "stopped",
+                        }
+                    )
+            return {"workers": workers}
+        else:
+            raise HTTPException(
+                status_code=503, detail="Worker manager not responding"
+            )
     except httpx.ConnectError:
         raise HTTPException(status_code=503, detail="Worker manager not reachable")
 
 
-@router.post("/{alias}/spawn", response_model=WorkerActionResponse)
-async def spawn_worker(service_id: str, alias: str):
-    """Start/spawn a worker."""
+def client_id(request: Request) -> str:
+    """Identify the client behind a request for rate limiting.
+
+    Forwarding headers are only believed when the request comes from one of
+    ``admission.trusted_proxies``; anyone else could set them to dodge the
+    rate limit.
+    """
+    return admission_controller.client_address(
+        request.client.host if request.client else "unknown",
+        request.headers.get("x-forwarded-for"),
+        request.headers.get("x-real-ip"),
+    )
+
+
+def charge_client(request: Request, cost: int = 1):
+    """Take ``cost`` worker actions from the client's budget or answer 429."""
+    try:
+        admission_controller.check_rate(client_id(request), cost)
+    except RateLimitExceeded as e:
+        if math.isinf(e.retry_after):
+            raise HTTPException(
+                status_code=429,
+                detail=f"{cost} worker action(s) exceed this client's rate limit",
+            )
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after)))},
+        )
+
+
+async def rate_limited(request: Request):
+    """Dependency charging one worker action to the client."""
+    charge_client(request)
+
+
+async def _submit_action(
+    service_cfg, alias: str, action: str, wait: bool, request: Request, run=None
+):
+    """Run a worker action as a job.
+
+    By default the job is returned right away (202, ``JobStatus``) and
+    progress is pushed over the 'workers' channel; with ``wait`` the request
+    blocks until the job finishes, which keeps running even if the client
+    disconnects, and answers 200 with its ``WorkerActionResponse``. An
+    identical action already in flight is not started again: its job is
+    returned instead, marked with ``X-Deduplicated: true``.
+    """
+    job, deduplicated = admission_controller.submit(service_cfg, alias, action, run)
+    await event_journal.emit(
+        "action_requested",
+        service_cfg.id,
+        alias=alias,
+        action=action,
+        client=client_id(request),
+        job_id=job["job_id"],
+        deduplicated=deduplicated,
+    )
+    if not wait:
+        return JSONResponse(
+            status_code=202,
+            content=JobStatus(**job).model_dump(),
+            headers={"X-Deduplicated": "true"} if deduplicated else None,
+        )
+
+    job = await job_table.wait(job["job_id"])
+    if job["result"] is None:
+        raise HTTPException(status_code=job["status_code"] or 500, detail=job["error"])
+    return WorkerActionResponse(**job["result"], job_id=job["job_id"])
+
+
+def _get_spawnable(service_id: str, alias: str):
+    """Look up a service and check the worker alias exists in its config."""
     registry = ServiceRegistry()
     service_cfg = registry.get_service(service_id)
 
     if not service_cfg:
         raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
 
-    # Verify worker alias exists in config
-    valid_aliases = [w.alias for w in service_cfg.workers]
-    if alias not in valid_aliases:
-        raise HTTPException(
-            status_code=404, detail=f"Worker not found: {alias}"
-        )
+    if alias not in [w.alias for w in service_cfg.workers]:
+        raise HTTPException(status_code=404, detail=f"Worker not found: {alias}")
 
-    try:
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            response = await client.post(
-                f"{service_cfg.worker_manager.url}/spawn/{alias}"
-            )
-            if response.status_code == 200:
-                data = response.json()
-                return WorkerActionResponse(
-                    success=True,
-                    message=f"Worker '{alias}' spawned successfully",
-                    worker_alias=alias,
-                    action="spawn",
-                    data=data,
-                )
-            else:
-                return WorkerActionResponse(
-                    success=False,
-                    message=f"Failed to spawn worker: HTTP {response.status_code}",
-                    worker_alias=alias,
-                    action="spawn",
-                    data=response.json() if response.content else None,
-                )
-    except httpx.TimeoutException:
-        raise HTTPException(status_code=504, detail="Worker spawn timeout")
-    except httpx.ConnectError:
-        raise HTTPException(status_code=503, detail="Worker manager not reachable")
+    return service_cfg
 
 
-@router.post("/{alias}/stop", response_model=WorkerActionResponse)
-async def stop_worker(service_id: str, alias: str):
+@router.post(
+    "/{alias}/spawn",
+    response_model=WorkerActionResponse,
+    responses=JOB_ACCEPTED_RESPONSES,
+    dependencies=[Depends(rate_limited)],
+)
+async def spawn_worker(service_id: str, alias: str, request: Request, wait: bool = False):
+    """Start/spawn a worker."""
+    service_cfg = _get_spawnable(service_id, alias)
+    return await _submit_action(service_cfg, alias, "spawn", wait, request)
+
+
+@router.post(
+    "/{alias}/stop",
+    response_model=WorkerActionResponse,
+    responses=JOB_ACCEPTED_RESPONSES,
+    dependencies=[Depends(rate_limited)],
+)
+async def stop_worker(service_id: str, alias: str, request: Request, wait: bool = False):
     """Stop a worker."""
     registry = ServiceRegistry()
     service_cfg = registry.get_service(service_id)
@@ -122,31 +275,16 @@ async def stop_worker(service_id: str, alias: str):
     if not service_cfg:
         raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
 
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{service_cfg.worker_manager.url}/stop/{alias}"
-            )
-            if response.status_code == 200:
-                return WorkerActionResponse(
-                    success=True,
-                    message=f"Worker '{alias}' stopped successfully",
-                    worker_alias=alias,
-                    action="stop",
-                )
-            else:
-                return WorkerActionResponse(
-                    success=False,
-                    message=f"Failed to stop worker: HTTP {response.status_code}",
-                    worker_alias=alias,
-                    action="stop",
-                )
-    except httpx.ConnectError:
-        raise HTTPException(status_code=503, detail="Worker manager not reachable")
+    return await _submit_action(service_cfg, alias, "stop", wait, request)
 
 
-@router.post("/{alias}/evict", response_model=WorkerActionResponse)
-async def evict_worker(service_id: str, alias: str):
+@router.post(
+    "/{alias}/evict",
+    response_model=WorkerActionResponse,
+    responses=JOB_ACCEPTED_RESPONSES,
+    dependencies=[Depends(rate_limited)],
+)
+async def evict_worker(service_id: str, alias: str, request: Request, wait: bool = False):
     """Force evict a worker through the gateway."""
     registry = ServiceRegistry()
     service_cfg = registry.get_service(service_id)
@@ -154,24 +292,165 @@ async def evict_worker(service_id: str, alias: str):
     if not service_cfg:
         raise HTTPException(status_code=404, detail=f"Service not found: {service_id}")
 
-    evict_url = service_cfg.endpoints.evict.replace("{alias}", alias)
+    return await _submit_action(service_cfg, alias, "evict", wait, request)
 
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(f"{service_cfg.gateway.url}{evict_url}")
-            if response.status_code == 200:
-                return WorkerActionResponse(
-                    success=True,
-                    message=f"Worker '{alias}' evicted successfully",
-                    worker_alias=alias,
-                    action="evict",
-                )
+
+@router.get("/{alias}/plan", response_model=PlacementPlan)
+async def plan_worker_spawn(service_id: str, alias: str):
+    """Dry run: show which idle workers would be evicted to fit a spawn."""
+    service_cfg = _get_spawnable(service_id, alias)
+    return PlacementPlan(**PlacementPlanner().plan(service_cfg, alias))
+
+
+@router.post(
+    "/{alias}/plan",
+    response_model=WorkerActionResponse,
+    responses=JOB_ACCEPTED_RESPONSES,
+    dependencies=[Depends(rate_limited)],
+)
+async def execute_worker_spawn_plan(
+    service_id: str, alias: str, request: Request, wait: bool = False
+):
+    """Evict idle workers as planned, then spawn the worker."""
+    service_cfg = _get_spawnable(service_id, alias)
+    planner = PlacementPlanner()
+    plan = planner.plan(service_cfg, alias)
+
+    if not plan["feasible"]:
+        raise HTTPException(status_code=409, detail=plan["reason"])
+
+    return await _submit_action(
+        service_cfg,
+        alias,
+        "spawn",
+        wait,
+        request,
+        run=lambda: planner.execute(service_cfg, alias, plan),
+    )
+
+
+async def _run_batch_item(
+    batch_id: str,
+    index: int,
+    item: BatchItem,
+    client: str,
+    registry: ServiceRegistry,
+    limits: dict[str, asyncio.Semaphore],
+) -> BatchItemResult:
+    """Run one batch item as a job under its worker manager's concurrency limit.
+
+    Items go through the admission controller like single actions, so an
+    identical action already in flight is joined rather than run twice.
+    """
+    result = BatchItemResult(
+        index=index,
+        service_id=item.service_id,
+        alias=item.alias,
+        action=item.action,
+        success=False,
+        message="",
+    )
+
+    service_cfg = registry.get_service(item.service_id)
+    if not service_cfg:
+        result.message = f"Service not found: {item.service_id}"
+    elif item.action == "spawn" and item.alias not in [w.alias for w in service_cfg.workers]:
+        result.message = f"Worker not found: {item.alias}"
+    else:
+        async with limits[service_cfg.worker_manager.url]:
+            await _publish_batch_progress(batch_id, result, "running")
+            job, result.deduplicated = admission_controller.submit(
+                service_cfg, item.alias, item.action
+            )
+            result.job_id = job["job_id"]
+            await _emit_batch_requested(batch_id, item, client, result)
+            job = await job_table.wait(job["job_id"])
+            if job["result"] is not None:
+                result.success = job["result"]["success"]
+                result.message = job["result"]["message"]
+                result.data = job["result"].get("data")
             else:
-                return WorkerActionResponse(
-                    success=False,
-                    message=f"Failed to evict worker: HTTP {response.status_code}",
-                    worker_alias=alias,
-                    action="evict",
-                )
-    except httpx.ConnectError:
-        raise HTTPException(status_code=503, detail="Gateway not reachable")
+                result.message = job["error"] or "Worker action failed"
+
+    if result.job_id is None:
+        # Rejected before a job existed, so no job reports how it ended
+        await _emit_batch_requested(batch_id, item, client, result)
+        await event_journal.emit(
+            "action_finished",
+            item.service_id,
+            alias=item.alias,
+            action=item.action,
+            batch_id=batch_id,
+            success=False,
+            error=result.message,
+        )
+    await _publish_batch_progress(batch_id, result, "done")
+    return result
+
+
+async def _emit_batch_requested(
+    batch_id: str, item: BatchItem, client: str, result: BatchItemResult
+):
+    await event_journal.emit(
+        "action_requested",
+        item.service_id,
+        alias=item.alias,
+        action=item.action,
+        client=client,
+        batch_id=batch_id,
+        job_id=result.job_id,
+        deduplicated=result.deduplicated,
+    )
+
+
+async def _publish_batch_progress(batch_id: str, result: BatchItemResult, state: str):
+    """Push per-item batch progress to the 'workers' channel."""
+    await ws_manager.broadcast(
+        "workers",
+        {"batch_id": batch_id, "state": state, **result.model_dump()},
+        message_type="worker_batch_update",
+    )
+
+
+@batch_router.post("/batch", response_model=BatchResponse)
+async def run_worker_batch(request: BatchRequest, http_request: Request):
+    """Run several worker actions with bounded parallelism per worker manager.
+
+    Every item counts against the client's rate limit and runs as a job
+    through the admission controller: spawns wait for their worker
+    manager's queue, and items identical to an action already in flight
+    join its job. A batch larger than the rate limit's burst could never
+    be admitted, so it is rejected with 413 rather than a 429.
+    """
+    admission = admission_controller.config
+    if admission.enabled and len(request.items) > admission.burst:
+        raise HTTPException(
+            status_code=413,
+            detail=(
+                f"Batch of {len(request.items)} actions exceeds the rate limit burst of "
+                f"{admission.burst}; split it into smaller batches"
+            ),
+        )
+    charge_client(http_request, len(request.items))
+    registry = ServiceRegistry()
+    batch_id = str(uuid.uuid4())[:8]
+    client = client_id(http_request)
+    limits: dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(request.max_parallel)
+    )
+
+    results = await asyncio.gather(
+        *(
+            _run_batch_item(batch_id, index, item, client, registry, limits)
+            for index, item in enumerate(request.items)
+        )
+    )
+    succeeded = sum(1 for r in results if r.success)
+
+    return BatchResponse(
+        batch_id=batch_id,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        results=results,
+    )
@@ -1,9 +1,12 @@
 """Configuration loader for Homelab Dashboard."""
+import ipaddress
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
-import yaml
+# Bump when ServiceConfig changes shape, to invalidate old registry caches
+REGISTRY_CACHE_VERSION = 2
 
 
 @dataclass
@@ -45,6 +48,21 @@ class WorkerConfig:
     alias: str
     name: str
     type: str
+    memory_gb: float | None = None  # Expected footprint before one is observed
+    idle_ttl_seconds: int | None = None  # Overrides the per-type eviction TTL
+    discovered: bool = False  # Found on a worker manager/gateway, not in YAML
+
+
+# Gateway probe kinds implemented by services.probes.PROBE_KINDS
+PROBE_KIND_NAMES = ("http", "tcp", "http2", "batch")
+
+
+@dataclass
+class ProbeConfig:
+    kind: str = "http"  # http, tcp, http2 or batch
+    interval_seconds: float | None = None  # Run at most this often; default: every poll
+    timeout_seconds: float = 5.0
+    options: dict[str, Any] = field(default_factory=dict)  # Kind-specific: path, url, key
 
 
 @dataclass
@@ -57,17 +75,160 @@ class ServiceConfig:
     worker_manager: WorkerManagerConfig
     endpoints: EndpointsConfig
     workers: list[WorkerConfig] = field(default_factory=list)
+    probe: ProbeConfig = field(default_factory=ProbeConfig)
 
 
 @dataclass
 class PollingConfig:
     health_interval_seconds: int = 10
     status_interval_seconds: int = 5
+    # Services polled at once; each holds up to ~2 of upstream's 100 pooled connections
+    max_concurrent_services: int = 32
 
 
 @dataclass
 class WebSocketConfig:
-    heartbeat_interval_seconds: int = 30
+    heartbeat_interval_seconds: int = 30  # 0 disables heartbeats
+    heartbeat_max_missed: int = 2  # Silent heartbeats before a connection is dropped
+
+
+@dataclass
+class PlannerConfig:
+    headroom_gb: float = 2.0
+    min_idle_seconds: int = 60
+
+
+@dataclass
+class EvictionConfig:
+    enabled: bool = False
+    action: str = "evict"  # evict (via gateway) or stop (via worker manager)
+    default_idle_ttl_seconds: int | None = None
+    type_idle_ttl_seconds: dict[str, int] = field(default_factory=dict)
+    memory_pressure_percent: float | None = None
+    pressure_min_idle_seconds: int = 120
+    max_evictions: int = 3
+    rate_window_seconds: int = 600
+    audit_log_path: str | None = None
+
+
+@dataclass
+class PrewarmConfig:
+    enabled: bool = False
+    history_path: str = "prewarm-history.json"
+    slot_minutes: int = 60
+    lead_minutes: int = 15
+    min_probability: float = 0.5
+    min_days: int = 3
+    window_days: int = 28
+    memory_budget_gb: float = 24.0
+    reserve_gb: float = 4.0
+
+
+@dataclass
+class StateConfig:
+    backend: str = "local"  # local, unix or redis
+    lock_path: str = "/tmp/homelab-dashboard.lock"
+    socket_path: str = "/tmp/homelab-dashboard.sock"
+    redis_url: str = "redis://localhost:6379/0"
+    channel: str = "homelab-dashboard"
+    failover_interval_seconds: int = 5
+
+
+@dataclass
+class PeerConfig:
+    name: str
+    url: str
+
+
+@dataclass
+class FederationConfig:
+    peers: list[PeerConfig] = field(default_factory=list)
+    stale_after_seconds: int = 30
+
+
+@dataclass
+class CircuitBreakerConfig:
+    failure_threshold: int = 3
+    recovery_timeout_seconds: int = 30
+
+
+@dataclass
+class ProxyConfig:
+    cache_ttl_seconds: float = 2.0
+    max_cache_bytes: int = 4 * 1024 * 1024  # Per response
+    max_cache_entries: int = 128
+    max_cache_total_bytes: int = 32 * 1024 * 1024
+
+
+@dataclass
+class ModelCatalogConfig:
+    cache_ttl_seconds: float = 60.0
+
+
+@dataclass
+class DiscoveryConfig:
+    enabled: bool = False
+    models_interval_seconds: int = 300
+    forget_after_seconds: int = 86400
+
+
+@dataclass
+class AlertRuleConfig:
+    name: str
+    kind: str  # latency_p95, flapping, memory_trend or stuck_unknown
+    threshold: float
+    window_seconds: int = 300
+    severity: str = "warning"
+    services: list[str] = field(default_factory=list)  # Empty: every service
+
+
+@dataclass
+class AlertsConfig:
+    enabled: bool = False
+    cooldown_seconds: int = 900
+    rules: list[AlertRuleConfig] = field(default_factory=list)
+    notifiers: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class SyntheticProbeConfig:
+    enabled: bool = False
+    interval_seconds: int = 600
+    max_concurrent: int = 1
+    timeout_seconds: float = 60.0
+    min_idle_seconds: int = 30  # Only probe workers without recent real traffic
+    # Per worker type: {path, payload} or {enabled: false}; overrides built-ins
+    types: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class AdmissionConfig:
+    enabled: bool = True
+    max_concurrent_spawns: int = 1  # Per worker manager; the rest wait in its queue
+    rate_per_minute: float = 30.0  # Worker actions per client
+    burst: int = 10
+    # Proxy addresses/CIDRs whose X-Forwarded-For / X-Real-IP identify the client
+    trusted_proxies: list[str] = field(default_factory=list)
+
+
+@dataclass
+class EventsConfig:
+    enabled: bool = True
+    path: str = "events"  # Directory of journal segments
+    segment_max_bytes: int = 8 * 1024 * 1024
+    segment_max_seconds: int = 86400
+    compact_after_days: int = 7  # Sealed segments older than this are gzipped
+    retention_days: int = 90
+
+
+@dataclass
+class EdgeCacheConfig:
+    enabled: bool = True
+    ttl_seconds: float | None = None  # Shared cache lifetime; default: one poll interval
+    max_entries: int = 256  # Response bodies kept per process
+    purge_url: str | None = None  # Sent the surrogate keys of services that changed
+    purge_method: str = "PURGE"
+    purge_header: str = "Surrogate-Key"
 
 
 @dataclass
@@ -76,11 +237,192 @@ class DashboardConfig:
     services: dict[str, ServiceConfig]
     polling: PollingConfig
     websocket: WebSocketConfig
+    planner: PlannerConfig = field(default_factory=PlannerConfig)
+    eviction: EvictionConfig = field(default_factory=EvictionConfig)
+    prewarm: PrewarmConfig = field(default_factory=PrewarmConfig)
+    state: StateConfig = field(default_factory=StateConfig)
+    federation: FederationConfig = field(default_factory=FederationConfig)
+    circuit_breaker: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig)
+    proxy: ProxyConfig = field(default_factory=ProxyConfig)
+    models: ModelCatalogConfig = field(default_factory=ModelCatalogConfig)
+    discovery: DiscoveryConfig = field(default_factory=DiscoveryConfig)
+    alerts: AlertsConfig = field(default_factory=AlertsConfig)
+    synthetic_probes: SyntheticProbeConfig = field(default_factory=SyntheticProbeConfig)
+    admission: AdmissionConfig = field(default_factory=AdmissionConfig)
+    events: EventsConfig = field(default_factory=EventsConfig)
+    edge_cache: EdgeCacheConfig = field(default_factory=EdgeCacheConfig)
 
 
 _config: DashboardConfig | None = None
 
 
+def _yaml_load(stream: Any) -> Any:
+    """Parse YAML, imported on first use to keep module import cheap."""
+    import yaml
+
+    # libyaml's C loader is several times faster; fall back to pure Python
+    return yaml.load(stream, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+def _parse_service(service_id: str, svc_raw: dict[str, Any]) -> ServiceConfig:
+    """Build a ServiceConfig from its raw YAML mapping."""
+    gateway_raw = svc_raw.get("gateway", {})
+    wm_raw = svc_raw.get("worker_manager", {})
+    endpoints_raw = svc_raw.get("endpoints", {})
+    probe_raw = dict(svc_raw.get("probe", {}))
+
+    workers = [
+        WorkerConfig(
+            alias=w.get("alias", ""),
+            name=w.get("name", ""),
+            type=w.get("type", ""),
+            memory_gb=w.get("memory_gb"),
+            idle_ttl_seconds=w.get("idle_ttl_seconds"),
+        )
+        for w in svc_raw.get("workers", [])
+    ]
+
+    return ServiceConfig(
+        id=service_id,
+        name=svc_raw.get("name", service_id),
+        description=svc_raw.get("description", ""),
+        icon=svc_raw.get("icon", "server"),
+        gateway=GatewayConfig(
+            host=gateway_raw.get("host", "localhost"),
+            port=gateway_raw.get("port", 8000),
+        ),
+        worker_manager=WorkerManagerConfig(
+            host=wm_raw.get("host", "localhost"),
+            port=wm_raw.get("port", 8100),
+        ),
+        endpoints=EndpointsConfig(
+            health=endpoints_raw.get("health", "/healthz"),
+            status=endpoints_raw.get("status", "/v1/system/status"),
+            models=endpoints_raw.get("models", "/v1/models"),
+            evict=endpoints_raw.get("evict", "/v1/system/evict/{alias}"),
+        ),
+        workers=workers,
+        probe=ProbeConfig(
+            kind=probe_raw.pop("kind", "http"),
+            interval_seconds=probe_raw.pop("interval_seconds", None),
+            timeout_seconds=probe_raw.pop("timeout_seconds", 5.0),
+            options=probe_raw,
+        ),
+    )
+
+
+def _validate_services(services: dict[str, ServiceConfig]) -> None:
+    """Reject service definitions that would break polling or worker actions."""
+    for service in services.values():
+        for endpoint in (service.gateway, service.worker_manager):
+            if not isinstance(endpoint.port, int) or not 0 < endpoint.port < 65536:
+                raise ValueError(f"Service '{service.id}': invalid port {endpoint.port!r}")
+        aliases = [w.alias for w in service.workers]
+        if "" in aliases or len(aliases) != len(set(aliases)):
+            raise ValueError(f"Service '{service.id}': worker aliases must be unique and set")
+        if service.probe.kind not in PROBE_KIND_NAMES:
+            raise ValueError(
+                f"Service '{service.id}': unknown probe kind {service.probe.kind!r}"
+                f" (expected one of {', '.join(PROBE_KIND_NAMES)})"
+            )
+
+
+def _parse_service_file(data: bytes) -> dict[str, ServiceConfig]:
+    raw = _yaml_load(data) or {}
+    # A file holds service_id -> definition, optionally under a `services` key
+    raw = raw.get("services", raw)
+    services = {
+        service_id: _parse_service(service_id, svc_raw) for service_id, svc_raw in raw.items()
+    }
+    _validate_services(services)
+    return services
+
+
+def load_services_dir(directory: Path, cache_path: Path | None = None) -> dict[str, ServiceConfig]:
+    """Load every ``*.yaml``/``*.yml`` service file in a directory (conf.d style).
+
+    Parsed files are kept in a pickled cache keyed by each file's mtime and
+    size, with a content hash as a fallback when only the mtime changed, so
+    a restart only re-parses files that were actually edited. Changed files
+    are read and parsed in parallel.
+    """
+    if not directory.is_dir():
+        return {}
+
+    import hashlib
+    import pickle
+    from concurrent.futures import ThreadPoolExecutor
+
+    import yaml
+
+    cache: dict[str, dict[str, Any]] = {}
+    if cache_path is not None:
+        try:
+            with open(cache_path, "rb") as f:
+                stored = pickle.load(f)
+            if stored.get("version") == REGISTRY_CACHE_VERSION:
+                cache = stored["files"]
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, KeyError):
+            pass
+
+    files = sorted(p for p in directory.iterdir() if p.suffix in (".yaml", ".yml"))
+    entries: dict[str, dict[str, Any]] = {}
+    misses: list[tuple[Path, os.stat_result]] = []
+    for file in files:
+        stat = file.stat()
+        entry = cache.get(file.name)
+        if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+            entries[file.name] = entry
+        else:
+            misses.append((file, stat))
+
+    def load(item: tuple[Path, os.stat_result]) -> dict[str, Any]:
+        file, stat = item
+        data = file.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        entry = cache.get(file.name)
+        if entry and entry["sha256"] == digest:
+            services = entry["services"]
+        else:
+            try:
+                services = _parse_service_file(data)
+            except (yaml.YAMLError, ValueError, AttributeError) as e:
+                raise ValueError(f"Invalid service file {file}: {e}") from e
+        return {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": digest,
+            "services": services,
+        }
+
+    if misses:
+        with ThreadPoolExecutor(max_workers=min(8, len(misses))) as pool:
+            for (file, _), entry in zip(misses, pool.map(load, misses)):
+                entries[file.name] = entry
+
+    services: dict[str, ServiceConfig] = {}
+    owners: dict[str, str] = {}
+    for name in sorted(entries):
+        for service_id, service in entries[name]["services"].items():
+            if service_id in owners:
+                raise ValueError(
+                    f"Service '{service_id}' is defined in {owners[service_id]} and {name}"
+                )
+            owners[service_id] = name
+            services[service_id] = service
+
+    if cache_path is not None and (misses or entries.keys() != cache.keys()):
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": REGISTRY_CACHE_VERSION, "files": entries}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"Could not write registry cache {cache_path}: {e}")
+
+    return services
+
+
 def load_config(config_path: str | Path) -> DashboardConfig:
     """Load configuration from YAML file."""
     path = Path(config_path)
@@ -88,7 +430,7 @@ def load_config(config_path: str | Path) -> DashboardConfig:
         raise FileNotFoundError(f"Config file not found: {path}")
 
     with open(path) as f:
-        raw = yaml.safe_load(f)
+        raw = _yaml_load(f)
 
     # Parse dashboard settings
     dashboard_raw = raw.get("dashboard", {})
@@ -97,55 +439,185 @@ def load_config(config_path: str | Path) -> DashboardConfig:
         port=dashboard_raw.get("port", 8080),
     )
 
-    # Parse services
-    services: dict[str, ServiceConfig] = {}
-    for service_id, svc_raw in raw.get("services", {}).items():
-        gateway_raw = svc_raw.get("gateway", {})
-        wm_raw = svc_raw.get("worker_manager", {})
-        endpoints_raw = svc_raw.get("endpoints", {})
-
-        workers = [
-            WorkerConfig(
-                alias=w.get("alias", ""),
-                name=w.get("name", ""),
-                type=w.get("type", ""),
-            )
-            for w in svc_raw.get("workers", [])
-        ]
-
-        services[service_id] = ServiceConfig(
-            id=service_id,
-            name=svc_raw.get("name", service_id),
-            description=svc_raw.get("description", ""),
-            icon=svc_raw.get("icon", "server"),
-            gateway=GatewayConfig(
-                host=gateway_raw.get("host", "localhost"),
-                port=gateway_raw.get("port", 8000),
-            ),
-            worker_manager=WorkerManagerConfig(
-                host=wm_raw.get("host", "localhost"),
-                port=wm_raw.get("port", 8100),
-            ),
-            endpoints=EndpointsConfig(
-                health=endpoints_raw.get("health", "/healthz"),
-                status=endpoints_raw.get("status", "/v1/system/status"),
-                models=endpoints_raw.get("models", "/v1/models"),
-                evict=endpoints_raw.get("evict", "/v1/system/evict/{alias}"),
-            ),
-            workers=workers,
+    # Parse services, then merge in the services directory (conf.d)
+    services = {
+        service_id: _parse_service(service_id, svc_raw)
+        for service_id, svc_raw in raw.get("services", {}).items()
+    }
+    services_dir = raw.get("services_dir")
+    if services_dir:
+        cache_path = raw.get("registry_cache")
+        dir_services = load_services_dir(
+            path.parent / services_dir,
+            path.parent / cache_path if cache_path else None,
         )
+        duplicates = dir_services.keys() & services.keys()
+        if duplicates:
+            raise ValueError(
+                f"Services defined in both {path.name} and {services_dir}: {sorted(duplicates)}"
+            )
+        services.update(dir_services)
+    _validate_services(services)
 
     # Parse polling settings
     polling_raw = raw.get("polling", {})
     polling = PollingConfig(
         health_interval_seconds=polling_raw.get("health_interval_seconds", 10),
         status_interval_seconds=polling_raw.get("status_interval_seconds", 5),
+        max_concurrent_services=polling_raw.get("max_concurrent_services", 32),
     )
 
     # Parse websocket settings
     ws_raw = raw.get("websocket", {})
     websocket = WebSocketConfig(
         heartbeat_interval_seconds=ws_raw.get("heartbeat_interval_seconds", 30),
+        heartbeat_max_missed=ws_raw.get("heartbeat_max_missed", 2),
+    )
+
+    # Parse planner settings
+    planner_raw = raw.get("planner", {})
+    planner = PlannerConfig(
+        headroom_gb=planner_raw.get("headroom_gb", 2.0),
+        min_idle_seconds=planner_raw.get("min_idle_seconds", 60),
+    )
+
+    # Parse idle-worker eviction policy
+    eviction_raw = raw.get("eviction", {})
+    eviction = EvictionConfig(
+        enabled=eviction_raw.get("enabled", False),
+        action=eviction_raw.get("action", "evict"),
+        default_idle_ttl_seconds=eviction_raw.get("default_idle_ttl_seconds"),
+        type_idle_ttl_seconds=eviction_raw.get("type_idle_ttl_seconds", {}),
+        memory_pressure_percent=eviction_raw.get("memory_pressure_percent"),
+        pressure_min_idle_seconds=eviction_raw.get("pressure_min_idle_seconds", 120),
+        max_evictions=eviction_raw.get("max_evictions", 3),
+        rate_window_seconds=eviction_raw.get("rate_window_seconds", 600),
+        audit_log_path=eviction_raw.get("audit_log_path"),
+    )
+
+    # Parse pre-warm scheduler settings
+    prewarm_raw = raw.get("prewarm", {})
+    prewarm = PrewarmConfig(
+        enabled=prewarm_raw.get("enabled", False),
+        history_path=prewarm_raw.get("history_path", "prewarm-history.json"),
+        slot_minutes=prewarm_raw.get("slot_minutes", 60),
+        lead_minutes=prewarm_raw.get("lead_minutes", 15),
+        min_probability=prewarm_raw.get("min_probability", 0.5),
+        min_days=prewarm_raw.get("min_days", 3),
+        window_days=prewarm_raw.get("window_days", 28),
+        memory_budget_gb=prewarm_raw.get("memory_budget_gb", 24.0),
+        reserve_gb=prewarm_raw.get("reserve_gb", 4.0),
+    )
+
+    # Parse shared state settings (multi-process deployments)
+    state_raw = raw.get("state", {})
+    state = StateConfig(
+        backend=state_raw.get("backend", "local"),
+        lock_path=state_raw.get("lock_path", "/tmp/homelab-dashboard.lock"),
+        socket_path=state_raw.get("socket_path", "/tmp/homelab-dashboard.sock"),
+        redis_url=state_raw.get("redis_url", "redis://localhost:6379/0"),
+        channel=state_raw.get("channel", "homelab-dashboard"),
+        failover_interval_seconds=state_raw.get("failover_interval_seconds", 5),
+    )
+
+    # Parse federation peers (other dashboards to merge in)
+    federation_raw = raw.get("federation", {})
+    federation = FederationConfig(
+        peers=[
+            PeerConfig(name=p.get("name", ""), url=p.get("url", ""))
+            for p in federation_raw.get("peers", [])
+        ],
+        stale_after_seconds=federation_raw.get("stale_after_seconds", 30),
+    )
+
+    # Parse circuit breaker settings for upstream calls
+    cb_raw = raw.get("circuit_breaker", {})
+    circuit_breaker = CircuitBreakerConfig(
+        failure_threshold=cb_raw.get("failure_threshold", 3),
+        recovery_timeout_seconds=cb_raw.get("recovery_timeout_seconds", 30),
+    )
+
+    # Parse gateway endpoint proxy settings
+    proxy_raw = raw.get("proxy", {})
+    proxy = ProxyConfig(
+        cache_ttl_seconds=proxy_raw.get("cache_ttl_seconds", 2.0),
+        max_cache_bytes=proxy_raw.get("max_cache_bytes", 4 * 1024 * 1024),
+        max_cache_entries=proxy_raw.get("max_cache_entries", 128),
+        max_cache_total_bytes=proxy_raw.get("max_cache_total_bytes", 32 * 1024 * 1024),
+    )
+
+    models_raw = raw.get("models", {})
+    models = ModelCatalogConfig(
+        cache_ttl_seconds=models_raw.get("cache_ttl_seconds", 60.0),
+    )
+
+    discovery_raw = raw.get("discovery", {})
+    discovery = DiscoveryConfig(
+        enabled=discovery_raw.get("enabled", False),
+        models_interval_seconds=discovery_raw.get("models_interval_seconds", 300),
+        forget_after_seconds=discovery_raw.get("forget_after_seconds", 86400),
+    )
+
+    alerts_raw = raw.get("alerts", {})
+    alerts = AlertsConfig(
+        enabled=alerts_raw.get("enabled", False),
+        cooldown_seconds=alerts_raw.get("cooldown_seconds", 900),
+        rules=[
+            AlertRuleConfig(
+                name=r.get("name", r.get("kind", "")),
+                kind=r.get("kind", ""),
+                threshold=r.get("threshold", 0),
+                window_seconds=r.get("window_seconds", 300),
+                severity=r.get("severity", "warning"),
+                services=r.get("services", []),
+            )
+            for r in alerts_raw.get("rules", [])
+        ],
+        notifiers=alerts_raw.get("notifiers", [{"kind": "log"}]),
+    )
+
+    probes_raw = raw.get("synthetic_probes", {})
+    synthetic_probes = SyntheticProbeConfig(
+        enabled=probes_raw.get("enabled", False),
+        interval_seconds=probes_raw.get("interval_seconds", 600),
+        max_concurrent=probes_raw.get("max_concurrent", 1),
+        timeout_seconds=probes_raw.get("timeout_seconds", 60.0),
+        min_idle_seconds=probes_raw.get("min_idle_seconds", 30),
+        types=probes_raw.get("types", {}),
+    )
+
+    admission_raw = raw.get("admission", {})
+    admission = AdmissionConfig(
+        enabled=admission_raw.get("enabled", True),
+        max_concurrent_spawns=admission_raw.get("max_concurrent_spawns", 1),
+        rate_per_minute=admission_raw.get("rate_per_minute", 30.0),
+        burst=admission_raw.get("burst", 10),
+        trusted_proxies=[str(p) for p in admission_raw.get("trusted_proxies", [])],
+    )
+    for trusted_proxy in admission.trusted_proxies:
+        try:
+            ipaddress.ip_network(trusted_proxy, strict=False)
+        except ValueError as e:
+            raise ValueError(f"admission.trusted_proxies: {e}") from e
+
+    events_raw = raw.get("events", {})
+    events = EventsConfig(
+        enabled=events_raw.get("enabled", True),
+        path=events_raw.get("path", "events"),
+        segment_max_bytes=events_raw.get("segment_max_bytes", 8 * 1024 * 1024),
+        segment_max_seconds=events_raw.get("segment_max_seconds", 86400),
+        compact_after_days=events_raw.get("compact_after_days", 7),
+        retention_days=events_raw.get("retention_days", 90),
+    )
+
+    edge_raw = raw.get("edge_cache", {})
+    edge_cache = EdgeCacheConfig(
+        enabled=edge_raw.get("enabled", True),
+        ttl_seconds=edge_raw.get("ttl_seconds"),
+        max_entries=edge_raw.get("max_entries", 256),
+        purge_url=edge_raw.get("purge_url"),
+        purge_method=edge_raw.get("purge_method", "PURGE"),
+        purge_header=edge_raw.get("purge_header", "Surrogate-Key"),
     )
 
     return DashboardConfig(
@@ -153,6 +625,20 @@ def load_config(config_path: str | Path) -> DashboardConfig:
         services=services,
         polling=polling,
         websocket=websocket,
+        planner=planner,
+        eviction=eviction,
+        prewarm=prewarm,
+        state=state,
+        federation=federation,
+        circuit_breaker=circuit_breaker,
+        proxy=proxy,
+        models=models,
+        discovery=discovery,
+        alerts=alerts,
+        synthetic_probes=synthetic_probes,
+        admission=admission,
+        events=events,
+        edge_cache=edge_cache,
     )
 
 
@@ -1,5 +1,5 @@
 """Service Registry for managing monitored services."""
-from .config import ServiceConfig, get_config
+from .config import ServiceConfig, WorkerConfig, get_config
 
 
 class ServiceRegistry:
@@ -29,3 +29,21 @@ class ServiceRegistry:
         """Get the worker manager URL for a service."""
         service = self.get_service(service_id)
         return service.worker_manager.url if service else None
+
+    def get_worker(self, service_id: str, alias: str) -> WorkerConfig | None:
+        """Get a worker of a service by alias."""
+        service = self.get_service(service_id)
+        if service is None:
+            return None
+        return next((w for w in service.workers if w.alias == alias), None)
+
+    def add_worker(self, service_id: str, worker: WorkerConfig) -> None:
+        """Register a worker at runtime (e.g. found by discovery)."""
+        service = self._config.services[service_id]
+        # Swap in a new list so in-progress iterations keep a stable view
+        service.workers = [*service.workers, worker]
+
+    def remove_worker(self, service_id: str, alias: str) -> None:
+        """Unregister a runtime worker."""
+        service = self._config.services[service_id]
+        service.workers = [w for w in service.workers if w.alias != alias]
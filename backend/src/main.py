@@ -5,9 +5,28 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api import services_router, workers_router, system_router
+from .api import (
+    events_router,
+    jobs_router,
+    models_router,
+    services_router,
+    system_router,
+    workers_batch_router,
+    workers_router,
+)
 from .core import get_config
+from .services.alerts import alert_engine
+from .services.discovery import worker_discovery
+from .services.edge_cache import edge_cache
+from .services.events import event_journal
+from .services.eviction_policy import eviction_policy
+from .services.federation import federation
 from .services.health_checker import health_checker
+from .services.prewarm import prewarm_scheduler
+from .services.probes import gateway_prober
+from .services.shared_state import shared_state
+from .services.synthetic_probes import synthetic_prober
+from .services.upstream import upstream
 from .ws import ws_manager
 
 
@@ -16,14 +35,29 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
     print("Starting Homelab Dashboard...")
-    await health_checker.start()
-    print("Health checker started")
+    health_checker.add_listener(eviction_policy.evaluate)
+    health_checker.add_listener(prewarm_scheduler.observe)
+    health_checker.add_listener(alert_engine.evaluate)
+    health_checker.add_listener(edge_cache.purge_changed)
+    shared_state.add_leader_service(event_journal.start, event_journal.stop)
+    shared_state.add_leader_service(federation.start, federation.stop)
+    shared_state.add_leader_service(worker_discovery.start, worker_discovery.stop)
+    shared_state.add_leader_service(synthetic_prober.start, synthetic_prober.stop)
+    await shared_state.start()
+    print("Health checker started" if shared_state.is_leader else "Following leader")
+    ws_config = get_config().websocket
+    await ws_manager.start_heartbeat(
+        ws_config.heartbeat_interval_seconds, ws_config.heartbeat_max_missed
+    )
 
     yield
 
     # Shutdown
     print("Shutting down...")
-    await health_checker.stop()
+    await ws_manager.stop_heartbeat()
+    await shared_state.stop()
+    await upstream.aclose()
+    await gateway_prober.aclose()
     print("Health checker stopped")
 
 
@@ -46,7 +80,11 @@ app.add_middleware(
 # Include routers
 app.include_router(services_router)
 app.include_router(workers_router)
+app.include_router(workers_batch_router)
 app.include_router(system_router)
+app.include_router(jobs_router)
+app.include_router(models_router)
+app.include_router(events_router)
 
 
 @app.get("/healthz")
@@ -1,3 +1,4 @@
 from .health_checker import HealthChecker
+from .status_store import StatusStore, status_store
 
-__all__ = ["HealthChecker"]
+__all__ = ["HealthChecker", "StatusStore", "status_store"]
@@ -0,0 +1,219 @@
+"""Admission control for worker actions: spawn queues, dedup and rate limits."""
+import asyncio
+import ipaddress
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ..core import get_config
+from ..ws import ws_manager
+from . import worker_actions
+from .jobs import job_table
+
+# Rate limit buckets kept before idle clients are dropped
+MAX_TRACKED_CLIENTS = 1024
+
+
+class RateLimitExceeded(Exception):
+    """A client has used up its action budget."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many worker actions, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Classic token bucket: ``burst`` actions at once, refilled at ``rate`` per second."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def take(self, cost: int = 1) -> float:
+        """Take ``cost`` tokens; return 0 on success or seconds until they are available."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            self.tokens -= cost
+            return 0.0
+        if self.rate <= 0 or cost > self.burst:
+            # Waiting would never help
+            return float("inf")
+        return (cost - self.tokens) / self.rate
+
+    def is_full(self) -> bool:
+        elapsed = time.monotonic() - self.updated
+        return self.tokens + elapsed * self.rate >= self.burst
+
+
+class ManagerQueue:
+    """Spawn slots of one worker manager, with who is running and who is waiting."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.running: list[dict[str, Any]] = []
+        self.queued: list[dict[str, Any]] = []
+
+
+class AdmissionController:
+    """Gatekeeper in front of worker actions.
+
+    Spawns load a model into memory, so each worker manager runs at most
+    ``max_concurrent_spawns`` of them at a time and queues the rest.
+    Identical actions already in flight (same service, worker and action,
+    e.g. a double click) return the existing job instead of starting a
+    second one, and every client gets a token bucket of ``burst`` actions
+    refilled at ``rate_per_minute``. Queue changes are published as
+    ``admission_update`` on the workers channel.
+
+    State is per process: with several dashboard processes each one
+    admits the requests it receives.
+    """
+
+    def __init__(self):
+        self.queues: dict[str, ManagerQueue] = {}
+        self.buckets: dict[str, TokenBucket] = {}
+        # (service_id, alias, action) -> job ID of the unfinished job
+        self.in_flight: dict[tuple[str, str, str], str] = {}
+        self._trusted: tuple[tuple[str, ...], list] = ((), [])
+
+    @property
+    def config(self):
+        return get_config().admission
+
+    def client_address(
+        self, peer: str, forwarded_for: str | None, real_ip: str | None
+    ) -> str:
+        """The client a request comes from, looking through trusted proxies.
+
+        Headers from untrusted peers are ignored. ``X-Forwarded-For`` is
+        read right to left, skipping trusted proxies: entries further left
+        were supplied by the client and could be anything.
+        """
+        if not self._is_trusted_proxy(peer):
+            return peer
+        hops = [hop.strip() for hop in (forwarded_for or "").split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not self._is_trusted_proxy(hop):
+                return hop
+        if hops:
+            return hops[0]
+        return real_ip.strip() if real_ip and real_ip.strip() else peer
+
+    def _is_trusted_proxy(self, host: str) -> bool:
+        proxies = tuple(self.config.trusted_proxies)
+        if proxies != self._trusted[0]:
+            # Validated when the config was loaded
+            self._trusted = (proxies, [ipaddress.ip_network(p, strict=False) for p in proxies])
+        try:
+            address = ipaddress.ip_address(host)
+        except ValueError:
+            return False
+        return any(address in network for network in self._trusted[1])
+
+    def check_rate(self, client: str, cost: int = 1):
+        """Charge a client for ``cost`` actions or raise RateLimitExceeded."""
+        if not self.config.enabled:
+            return
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            if len(self.buckets) >= MAX_TRACKED_CLIENTS:
+                # Full buckets carry no state, so idle clients can be forgotten
+                self.buckets = {k: b for k, b in self.buckets.items() if not b.is_full()}
+            bucket = TokenBucket(self.config.rate_per_minute / 60, self.config.burst)
+            self.buckets[client] = bucket
+        retry_after = bucket.take(cost)
+        if retry_after:
+            raise RateLimitExceeded(retry_after)
+
+    def submit(
+        self,
+        service_cfg,
+        alias: str,
+        action: str,
+        run: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+    ) -> tuple[dict[str, Any], bool]:
+        """Start an action as a job, or return the identical job already in flight.
+
+        Returns the job and whether it was deduplicated.
+        """
+        key = (service_cfg.id, alias, action)
+        job_id = self.in_flight.get(key)
+        if job_id is not None:
+            job = job_table.get(job_id)
+            if job is not None and job["finished_at"] is None:
+                return job, True
+
+        async def admitted():
+            try:
+                return await self.run(service_cfg, alias, action, run)
+            finally:
+                self.in_flight.pop(key, None)
+
+        job = job_table.submit(action, service_cfg.id, alias, admitted)
+        self.in_flight[key] = job["job_id"]
+        return job, False
+
+    async def run(
+        self,
+        service_cfg,
+        alias: str,
+        action: str,
+        run: Callable[[], Awaitable[dict[str, Any]]] | None = None,
+    ) -> dict[str, Any]:
+        """Run an action, waiting for a spawn slot on its worker manager first."""
+        run = run or (lambda: worker_actions.run_action(service_cfg, alias, action))
+        if action != "spawn" or not self.config.enabled:
+            return await run()
+
+        wm_url = service_cfg.worker_manager.url
+        queue = self.queues.get(wm_url)
+        limit = self.config.max_concurrent_spawns
+        # A changed limit takes effect once the manager's queue has drained
+        if queue is None or (queue.limit != limit and not (queue.running or queue.queued)):
+            queue = ManagerQueue(limit)
+            self.queues[wm_url] = queue
+
+        entry = {"service_id": service_cfg.id, "alias": alias, "queued_at": time.time()}
+        queue.queued.append(entry)
+        await self._publish(wm_url, queue)
+        try:
+            async with queue.semaphore:
+                queue.queued.remove(entry)
+                entry["started_at"] = time.time()
+                queue.running.append(entry)
+                await self._publish(wm_url, queue)
+                try:
+                    return await run()
+                finally:
+                    queue.running.remove(entry)
+        finally:
+            if entry in queue.queued:
+                queue.queued.remove(entry)
+            await self._publish(wm_url, queue)
+
+    def status(self) -> list[dict[str, Any]]:
+        """Spawn queue of every worker manager."""
+        return [self._queue_status(url, queue) for url, queue in self.queues.items()]
+
+    def _queue_status(self, wm_url: str, queue: ManagerQueue) -> dict[str, Any]:
+        return {
+            "worker_manager": wm_url,
+            "limit": queue.limit,
+            "running": list(queue.running),
+            "queued": list(queue.queued),
+        }
+
+    async def _publish(self, wm_url: str, queue: ManagerQueue):
+        """Push a worker manager's spawn queue to the 'workers' channel."""
+        await ws_manager.broadcast(
+            "workers", self._queue_status(wm_url, queue), message_type="admission_update"
+        )
+
+
+# Global admission controller instance
+admission_controller = AdmissionController()
@@ -0,0 +1,390 @@
+"""Streaming alert rules evaluated over health checker samples."""
+import bisect
+import math
+import operator
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from ..core import get_config
+from ..ws import ws_manager
+from .status_store import status_store
+from .upstream import upstream
+
+# Upper bounds (ms) of the latency histogram buckets; p95 is reported as one
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+# Time slots per latency window; a slot's counts are subtracted as it expires
+WINDOW_SLOTS = 10
+# Samples needed in a window before p95 is trusted
+MIN_LATENCY_SAMPLES = 5
+
+
+class Window(ABC):
+    """Rolling per-key measurement that every rule of one kind and window shares.
+
+    ``source`` selects the samples it receives: ``service`` (gateway
+    reachability and latency), ``worker`` (worker status) or ``memory``
+    (worker manager memory). ``observe`` updates the key's state in O(1)
+    and returns the current value with a message, or None while there is
+    not enough data. ``fires`` compares a value against a rule threshold.
+    """
+
+    source = ""
+    fires: Callable[[float, float], bool] = operator.gt
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+
+    @abstractmethod
+    def observe(self, key: str, sample: dict[str, Any], now: float) -> tuple[float, str] | None:
+        """Record a sample and return the key's current value and message."""
+
+    def forget(self, key: str):
+        """Drop state for a key that no longer reports."""
+
+
+class LatencyP95Window(Window):
+    """Gateway p95 latency from a bucketed histogram over time slots."""
+
+    source = "service"
+
+    def __init__(self, window_seconds):
+        super().__init__(window_seconds)
+        self.slot_seconds = max(window_seconds / WINDOW_SLOTS, 1.0)
+        # Per key: [current slot, per-slot bucket counts, window totals, sample count]
+        self._state: dict[str, list[Any]] = {}
+
+    def observe(self, key, sample, now):
+        buckets = len(LATENCY_BUCKETS_MS) + 1
+        slot = int(now // self.slot_seconds)
+        state = self._state.get(key)
+        if state is None:
+            state = [slot, [[0] * buckets for _ in range(WINDOW_SLOTS)], [0] * buckets, 0]
+            self._state[key] = state
+        slots, totals = state[1], state[2]
+
+        # Expire the slots the clock moved past (at most WINDOW_SLOTS of them)
+        for expired in range(state[0] + 1, min(slot, state[0] + WINDOW_SLOTS) + 1):
+            counts = slots[expired % WINDOW_SLOTS]
+            for bucket, n in enumerate(counts):
+                if n:
+                    totals[bucket] -= n
+                    state[3] -= n
+                    counts[bucket] = 0
+        state[0] = max(state[0], slot)
+
+        latency = sample.get("latency_ms")
+        if latency is not None:
+            bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, latency)
+            slots[slot % WINDOW_SLOTS][bucket] += 1
+            totals[bucket] += 1
+            state[3] += 1
+
+        count = state[3]
+        if count < MIN_LATENCY_SAMPLES:
+            return None
+        rank = math.ceil(count * 0.95)
+        seen = 0
+        for bucket, n in enumerate(totals):
+            seen += n
+            if seen >= rank:
+                break
+        p95 = LATENCY_BUCKETS_MS[min(bucket, len(LATENCY_BUCKETS_MS) - 1)]
+        return p95, f"p95 gateway latency <= {p95}ms over {count} samples"
+
+    def forget(self, key):
+        self._state.pop(key, None)
+
+
+class FlappingWindow(Window):
+    """Gateway reachability changes within the window."""
+
+    source = "service"
+    fires = operator.ge
+
+    def __init__(self, window_seconds):
+        super().__init__(window_seconds)
+        self._last: dict[str, bool] = {}
+        self._transitions: dict[str, deque[float]] = {}
+
+    def observe(self, key, sample, now):
+        reachable = sample["reachable"]
+        transitions = self._transitions.setdefault(key, deque())
+        if key in self._last and self._last[key] != reachable:
+            transitions.append(now)
+        self._last[key] = reachable
+        while transitions and transitions[0] < now - self.window_seconds:
+            transitions.popleft()
+        count = len(transitions)
+        return count, f"{count} reachability changes in {self.window_seconds}s"
+
+    def forget(self, key):
+        self._last.pop(key, None)
+        self._transitions.pop(key, None)
+
+
+class MemoryTrendWindow(Window):
+    """Projected seconds until a worker manager runs out of memory.
+
+    The growth rate is an exponentially weighted slope with the window as
+    its time constant; rules fire when the projection drops below them.
+    """
+
+    source = "memory"
+    fires = operator.lt
+
+    def __init__(self, window_seconds):
+        super().__init__(window_seconds)
+        # Per key: (last timestamp, last used GB, smoothed slope in GB/s)
+        self._state: dict[str, tuple[float, float, float]] = {}
+
+    def observe(self, key, sample, now):
+        used, total = sample["used_gb"], sample["total_gb"]
+        previous = self._state.get(key)
+        slope = 0.0
+        if previous is not None:
+            last_at, last_used, slope = previous
+            dt = now - last_at
+            if dt > 0:
+                alpha = 1 - math.exp(-dt / self.window_seconds)
+                slope += alpha * ((used - last_used) / dt - slope)
+        self._state[key] = (now, used, slope)
+
+        if slope <= 0:
+            return None
+        eta = max(total - used, 0.0) / slope
+        return (
+            round(eta, 1),
+            f"memory exhausted in ~{eta / 60:.0f} min at {slope * 3600:.2f} GB/h",
+        )
+
+    def forget(self, key):
+        self._state.pop(key, None)
+
+
+class UnknownDurationWindow(Window):
+    """Seconds a worker's status has been unknown."""
+
+    source = "worker"
+    fires = operator.ge
+
+    def __init__(self, window_seconds):
+        super().__init__(window_seconds)
+        self._since: dict[str, float] = {}
+
+    def observe(self, key, sample, now):
+        if sample["status"] != "unknown":
+            self._since.pop(key, None)
+            return None
+        stuck = now - self._since.setdefault(key, now)
+        return round(stuck, 1), f"worker unknown for {stuck:.0f}s"
+
+    def forget(self, key):
+        self._since.pop(key, None)
+
+
+RULE_KINDS: dict[str, type[Window]] = {
+    "latency_p95": LatencyP95Window,
+    "flapping": FlappingWindow,
+    "memory_trend": MemoryTrendWindow,
+    "stuck_unknown": UnknownDurationWindow,
+}
+
+
+class Notifier(ABC):
+    """Delivers alert transitions (firing/resolved) somewhere outside the dashboard."""
+
+    @abstractmethod
+    async def send(self, alert: dict[str, Any]):
+        """Deliver one alert transition."""
+
+
+class LogNotifier(Notifier):
+    """Prints alerts to the server log."""
+
+    async def send(self, alert):
+        print(
+            f"Alert {alert['state']}: [{alert['severity']}] {alert['rule']} "
+            f"{alert['key']}: {alert['message']}"
+        )
+
+
+class WebhookNotifier(Notifier):
+    """POSTs each alert as JSON to a URL."""
+
+    def __init__(self, url: str):
+        self.url = url
+
+    async def send(self, alert):
+        await upstream.post(self.url, json=alert, timeout=5.0)
+
+
+NOTIFIER_KINDS: dict[str, type[Notifier]] = {
+    "log": LogNotifier,
+    "webhook": WebhookNotifier,
+}
+
+
+class AlertEngine:
+    """Evaluates alert rules after every health check poll.
+
+    Samples come from the statuses the health checker just collected and
+    from the status store, so nothing is polled twice. Rules of the same kind
+    and window share one Window, so each sample updates it once in O(1) and
+    every rule only compares the value against its threshold.
+    An alert is published on the ``alerts`` WebSocket channel when it starts
+    firing and when it resolves; notifiers get the same transitions, at most
+    once per ``cooldown_seconds`` for the same rule and key.
+    """
+
+    def __init__(self, history_size: int = 200):
+        self.active: dict[tuple[str, str], dict[str, Any]] = {}
+        self.history: deque[dict[str, Any]] = deque(maxlen=history_size)
+        self.notifiers: list[Notifier] = []
+        self._windows: dict[str, list[tuple[Window, list[Any]]]] | None = None
+        self._configured_notifiers = False
+        self._last_notified: dict[tuple[str, str], float] = {}
+        self._keys: dict[str, set[str]] = {"service": set(), "worker": set(), "memory": set()}
+
+    @property
+    def config(self):
+        return get_config().alerts
+
+    @property
+    def windows(self) -> dict[str, list[tuple[Window, list[Any]]]]:
+        """Shared windows with their rules, grouped by sample source."""
+        if self._windows is None:
+            grouped: dict[tuple[str, float], tuple[Window, list[Any]]] = {}
+            for rule_cfg in self.config.rules:
+                window_type = RULE_KINDS.get(rule_cfg.kind)
+                if window_type is None:
+                    print(f"Unknown alert rule kind '{rule_cfg.kind}' in rule {rule_cfg.name}")
+                    continue
+                key = (rule_cfg.kind, rule_cfg.window_seconds)
+                if key not in grouped:
+                    grouped[key] = (window_type(rule_cfg.window_seconds), [])
+                grouped[key][1].append(rule_cfg)
+            self._windows = {"service": [], "worker": [], "memory": []}
+            for window, rules in grouped.values():
+                self._windows[window.source].append((window, rules))
+        return self._windows
+
+    def add_notifier(self, notifier: Notifier):
+        """Register an extra notifier (e.g. from a plugin)."""
+        self.notifiers.append(notifier)
+
+    async def evaluate(self, statuses: list[dict[str, Any]]):
+        """Health checker listener: feed the latest samples to every rule."""
+        if not self.config.enabled:
+            return
+        self._configure_notifiers()
+
+        now = time.time()
+        samples: dict[str, dict[str, tuple[str, dict[str, Any]]]] = {
+            "service": {},
+            "worker": {},
+            "memory": {},
+        }
+        for status in statuses:
+            service_id = status["service_id"]
+            samples["service"][service_id] = (service_id, status["gateway"])
+            for worker in status.get("workers", []):
+                samples["worker"][f"{service_id}/{worker['alias']}"] = (service_id, worker)
+        for wm in status_store.worker_managers.values():
+            if wm.get("reachable") and wm.get("memory"):
+                samples["memory"][wm["service_id"]] = (wm["service_id"], wm["memory"])
+
+        transitions: list[tuple[dict[str, Any], bool]] = []
+        for source, windows in self.windows.items():
+            current = samples[source]
+            gone = self._keys[source] - current.keys()
+            self._keys[source] = set(current)
+            for window, rules in windows:
+                for key in gone:
+                    window.forget(key)
+                    for rule in rules:
+                        self._update(rule, key, "", None, now, transitions)
+                for key, (service_id, sample) in current.items():
+                    result = window.observe(key, sample, now)
+                    for rule in rules:
+                        if rule.services and service_id not in rule.services:
+                            continue
+                        if result is not None and window.fires(result[0], rule.threshold):
+                            self._update(rule, key, service_id, result, now, transitions)
+                        elif (rule.name, key) in self.active:
+                            self._update(rule, key, service_id, None, now, transitions)
+
+        for alert, notify in transitions:
+            await ws_manager.broadcast("alerts", alert, message_type="alert_update")
+            if notify:
+                await self._notify(alert)
+
+    def record(self, alert: dict[str, Any]):
+        """Track an alert transition published by another process."""
+        key = (alert["rule"], alert["key"])
+        if alert["state"] == "firing":
+            self.active[key] = alert
+        else:
+            self.active.pop(key, None)
+            self.history.append(alert)
+
+    def _update(self, rule, key, service_id, result, now, transitions):
+        """Apply one rule's verdict for a key; ``result`` is None when not firing."""
+        alert_key = (rule.name, key)
+        active = self.active.get(alert_key)
+        if result is not None and active is None:
+            last = self._last_notified.get(alert_key)
+            notify = last is None or now - last >= self.config.cooldown_seconds
+            if notify:
+                self._last_notified[alert_key] = now
+            alert = {
+                "id": f"{rule.name}:{key}",
+                "rule": rule.name,
+                "kind": rule.kind,
+                "severity": rule.severity,
+                "key": key,
+                "service_id": service_id,
+                "state": "firing",
+                "value": result[0],
+                "threshold": rule.threshold,
+                "message": result[1],
+                "started_at": now,
+                "resolved_at": None,
+                "notified": notify,
+            }
+            self.active[alert_key] = alert
+            transitions.append((alert, notify))
+        elif result is not None:
+            # Already firing: update in place, no new notification
+            active["value"], active["message"] = result
+        elif active is not None:
+            del self.active[alert_key]
+            resolved = {**active, "state": "resolved", "resolved_at": now}
+            self.history.append(resolved)
+            transitions.append((resolved, active["notified"]))
+
+    def _configure_notifiers(self):
+        if self._configured_notifiers:
+            return
+        self._configured_notifiers = True
+        for notifier_cfg in self.config.notifiers:
+            options = dict(notifier_cfg)
+            kind = options.pop("kind", "log")
+            notifier_type = NOTIFIER_KINDS.get(kind)
+            if notifier_type is None:
+                print(f"Unknown alert notifier kind '{kind}'")
+                continue
+            self.notifiers.append(notifier_type(**options))
+
+    async def _notify(self, alert: dict[str, Any]):
+        for notifier in self.notifiers:
+            try:
+                await notifier.send(alert)
+            except Exception as e:
+                print(f"Error sending alert via {type(notifier).__name__}: {e}")
+
+
+# Global alert engine instance
+alert_engine = AlertEngine()
@@ -0,0 +1,141 @@
+"""Worker discovery: grow each service's worker list from its upstreams."""
+import asyncio
+import time
+from typing import Any
+
+from ..core import ServiceRegistry, get_config
+from ..core.config import WorkerConfig
+from .model_catalog import model_catalog
+
+
+class WorkerDiscovery:
+    """Adds workers that a worker manager runs or a gateway serves to the registry.
+
+    Static workers from YAML keep their metadata and are never removed.
+    Discovered workers are added as soon as they show up in a worker
+    manager's /status (observed on every health poll) or in the gateway's
+    models list (rescanned every ``models_interval_seconds``), and are
+    forgotten after ``forget_after_seconds`` without being seen.
+
+    Several services may share a worker manager, so a /status entry only
+    counts for the service being polled if it belongs to it: tagged with
+    its ``service``/``service_id``, listed by its gateway's models
+    endpoint, or on a manager no other service uses. Followers mirror the
+    leader's additions and removals from the statuses it publishes.
+    """
+
+    def __init__(self):
+        self.last_seen: dict[tuple[str, str], float] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def config(self):
+        return get_config().discovery
+
+    async def start(self):
+        """Start rescanning gateway model lists."""
+        if self.config.enabled and self._task is None:
+            self._task = asyncio.create_task(self._scan_loop())
+
+    async def stop(self):
+        """Stop rescanning."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def observe_workers(self, service_cfg, active_workers: dict[str, dict[str, Any]]):
+        """Record the workers a worker manager's /status reports as running."""
+        if not self.config.enabled:
+            return
+        for alias, info in active_workers.items():
+            if self._belongs_to(service_cfg, alias, info):
+                self._see(service_cfg, alias, info.get("name"), info.get("type"))
+        self._forget_stale(service_cfg)
+
+    def observe_models(self, service_cfg, models: list[dict[str, Any]]):
+        """Record the workers behind a gateway's model catalog entries."""
+        for model in models:
+            if model["alias"]:
+                self._see(service_cfg, model["alias"], model["model"], model["type"])
+        self._forget_stale(service_cfg)
+
+    def observe_status(self, status: dict[str, Any]):
+        """Mirror discovered workers from a status published by the leader."""
+        registry = ServiceRegistry()
+        service_id = status["service_id"]
+        service_cfg = registry.get_service(service_id)
+        if service_cfg is None:
+            return
+        # The leader lists every worker it knows, so a missing one was forgotten
+        published = {worker["alias"] for worker in status.get("workers", [])}
+        for worker_cfg in service_cfg.workers:
+            if worker_cfg.discovered and worker_cfg.alias not in published:
+                registry.remove_worker(service_id, worker_cfg.alias)
+        for worker in status.get("workers", []):
+            if worker.get("discovered") and not registry.get_worker(service_id, worker["alias"]):
+                registry.add_worker(
+                    service_id,
+                    WorkerConfig(
+                        alias=worker["alias"],
+                        name=worker["name"],
+                        type=worker["type"],
+                        discovered=True,
+                    ),
+                )
+
+    def _belongs_to(self, service_cfg, alias: str, info: dict[str, Any]) -> bool:
+        """Whether a worker on the service's worker manager is the service's own."""
+        tag = info.get("service") or info.get("service_id")
+        if tag:
+            return tag == service_cfg.id
+        if any(m["alias"] == alias for m in model_catalog.search(service_id=service_cfg.id)):
+            return True
+        # Without a tag or a model listing, only an unshared manager is unambiguous
+        wm_url = service_cfg.worker_manager.url
+        return not any(
+            other.id != service_cfg.id and other.worker_manager.url == wm_url
+            for other in ServiceRegistry().list_services()
+        )
+
+    def _see(self, service_cfg, alias: str, name: str | None, worker_type: str | None):
+        self.last_seen[(service_cfg.id, alias)] = time.time()
+        registry = ServiceRegistry()
+        if registry.get_worker(service_cfg.id, alias) is None:
+            print(f"Discovered worker '{alias}' on {service_cfg.id}")
+            registry.add_worker(
+                service_cfg.id,
+                WorkerConfig(
+                    alias=alias, name=name or alias, type=worker_type or "", discovered=True
+                ),
+            )
+
+    def _forget_stale(self, service_cfg):
+        cutoff = time.time() - self.config.forget_after_seconds
+        registry = ServiceRegistry()
+        for worker_cfg in service_cfg.workers:
+            key = (service_cfg.id, worker_cfg.alias)
+            if worker_cfg.discovered and self.last_seen.get(key, 0.0) < cutoff:
+                print(f"Forgetting worker '{worker_cfg.alias}' on {service_cfg.id}")
+                registry.remove_worker(service_cfg.id, worker_cfg.alias)
+                self.last_seen.pop(key, None)
+
+    async def _scan_loop(self):
+        while True:
+            try:
+                await model_catalog.refresh()
+                for service_cfg in ServiceRegistry().list_services():
+                    if model_catalog.sources.get(service_cfg.id, {}).get("error") is None:
+                        self.observe_models(
+                            service_cfg, model_catalog.search(service_id=service_cfg.id)
+                        )
+            except Exception as e:
+                print(f"Error in worker discovery: {e}")
+            await asyncio.sleep(self.config.models_interval_seconds)
+
+
+# Global worker discovery instance
+worker_discovery = WorkerDiscovery()
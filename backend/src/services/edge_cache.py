@@ -0,0 +1,183 @@
+"""Cache metadata and precompressed bodies for an HTTP cache in front of the API."""
+import gzip
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from ..core import get_config
+from .proxy import accepted_encodings
+from .status_store import _state_key, status_store
+from .upstream import upstream
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def _brotli():
+    """The optional ``brotli`` module, or None when it isn't installed."""
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _cache_key(request: Request) -> str:
+    return f"{request.url.path}?{request.url.query}"
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Weak comparison: W/"x" and "x" match
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+def _negotiate(accept_encoding: str) -> str:
+    """Pick the best encoding we can produce: br, gzip or identity."""
+    accepted = accepted_encodings(accept_encoding)
+    if "br" in accepted and _brotli() is not None:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return "identity"
+
+
+class EdgeCache:
+    """Serializes snapshot-backed responses once and labels them for caching.
+
+    Responses served from the status store only change when the store does,
+    so each URL's JSON body is built once per store revision (by default
+    ``status_store.content_revision``, which moves with every poll and every
+    write between polls) and compressed at most once per encoding.
+    Responses carry:
+
+    - ``ETag`` (a hash of the body, so it survives restarts of the
+      per-process revision counters) so clients and caches can revalidate
+      with a 304;
+    - ``X-Accel-Expires`` and ``s-maxage`` of one poll interval so nginx (or
+      any shared cache) can microcache them;
+    - ``Surrogate-Key`` naming the services in the body, and
+      ``X-Status-Version`` with the store's state version.
+
+    When a service changes state the leader sends a purge for its keys to
+    ``purge_url`` (Varnish xkey, Fastly and nginx cache-purge modules
+    understand surrogate keys); without one, entries simply expire.
+    """
+
+    def __init__(self):
+        # URL -> revision, surrogate keys and the body in each encoding
+        self.entries: dict[str, dict[str, Any]] = {}
+        self._states: dict[str, tuple] = {}
+
+    @property
+    def config(self):
+        return get_config().edge_cache
+
+    @property
+    def ttl_seconds(self) -> float:
+        ttl = self.config.ttl_seconds
+        return ttl if ttl is not None else get_config().polling.status_interval_seconds
+
+    def cached(self, request: Request, revision: str | None = None) -> Response | None:
+        """Serve a request from the body built for the current revision, if any."""
+        if not self.config.enabled:
+            return None
+        revision = revision or status_store.content_revision
+        entry = self.entries.get(_cache_key(request))
+        if entry is None or entry["revision"] != revision:
+            return None
+        return self._response(request, entry)
+
+    def respond(
+        self,
+        request: Request,
+        content: Any,
+        surrogate_keys: list[str],
+        revision: str | None = None,
+    ) -> Response:
+        """Serve ``content`` and keep its body for the rest of the revision."""
+        if not self.config.enabled:
+            return JSONResponse(content)
+
+        if len(self.entries) >= self.config.max_entries:
+            # Entries of past revisions are dead weight; drop them first
+            current = revision or status_store.content_revision
+            self.entries = {k: e for k, e in self.entries.items() if e["revision"] == current}
+            if len(self.entries) >= self.config.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+
+        body = json.dumps(content, separators=(",", ":")).encode()
+        entry = {
+            "revision": revision or status_store.content_revision,
+            "etag": f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"',
+            "keys": " ".join(surrogate_keys),
+            "bodies": {"identity": body},
+        }
+        self.entries[_cache_key(request)] = entry
+        return self._response(request, entry)
+
+    async def purge_changed(self, statuses: list[dict[str, Any]]):
+        """Health checker listener: purge the keys of services that changed state."""
+        changed = []
+        for status in statuses:
+            state = _state_key(status)
+            if self._states.get(status["service_id"]) != state:
+                self._states[status["service_id"]] = state
+                changed.append(status["service_id"])
+        if changed and self.config.enabled and self.config.purge_url:
+            await self.purge(["services", "overview", *(f"service/{sid}" for sid in changed)])
+
+    async def purge(self, keys: list[str]):
+        """Ask the edge cache to drop every response tagged with one of ``keys``."""
+        config = self.config
+        try:
+            response = await upstream.request(
+                config.purge_method,
+                config.purge_url,
+                timeout=5.0,
+                headers={config.purge_header: " ".join(keys)},
+            )
+            if response.status_code >= 400:
+                print(f"Edge cache purge failed: HTTP {response.status_code}")
+        except Exception as e:
+            print(f"Edge cache purge failed: {e}")
+
+    def _response(self, request: Request, entry: dict[str, Any]) -> Response:
+        ttl = int(self.ttl_seconds)
+        headers = {
+            "ETag": entry["etag"],
+            "Cache-Control": f"public, max-age=0, s-maxage={ttl}",
+            "X-Accel-Expires": str(ttl),
+            "Surrogate-Key": entry["keys"],
+            "X-Status-Version": str(status_store.version),
+            "Vary": "Accept-Encoding",
+        }
+        if _etag_matches(request.headers.get("if-none-match"), entry["etag"]):
+            return Response(status_code=304, headers=headers)
+
+        encoding = "identity"
+        if len(entry["bodies"]["identity"]) >= COMPRESS_MIN_BYTES:
+            encoding = _negotiate(request.headers.get("accept-encoding", ""))
+        body = entry["bodies"].get(encoding)
+        if body is None:
+            body = self._compress(entry["bodies"]["identity"], encoding)
+            entry["bodies"][encoding] = body
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return _brotli().compress(body, quality=BROTLI_QUALITY)
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+# Global edge cache instance
+edge_cache = EdgeCache()
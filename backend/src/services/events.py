@@ -0,0 +1,422 @@
+"""Event journal: append-only, segmented log of state changes and control actions."""
+import asyncio
+import bisect
+import gzip
+import json
+import os
+import shutil
+import struct
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from ..core import get_config
+from ..ws import ws_manager
+
+# Sparse time index record: event timestamp and byte offset of its line
+INDEX_RECORD = struct.Struct("<dQ")
+# One index record is written per this many events
+INDEX_EVERY = 64
+# How often retention and compaction run
+MAINTENANCE_INTERVAL_SECONDS = 3600
+
+
+def status_transitions(
+    previous: dict[str, Any] | None, current: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Service and worker status changes between two polls of a service."""
+    if previous is None:
+        return []
+
+    service_id = current["service_id"]
+    events = []
+    if previous.get("status") != current.get("status"):
+        events.append(
+            {
+                "kind": "service_status",
+                "service_id": service_id,
+                "from": previous.get("status"),
+                "to": current.get("status"),
+                "error": current.get("gateway", {}).get("error"),
+            }
+        )
+
+    before = {w["alias"]: w.get("status") for w in previous.get("workers", [])}
+    for worker in current.get("workers", []):
+        if before.get(worker["alias"]) != worker.get("status"):
+            events.append(
+                {
+                    "kind": "worker_status",
+                    "service_id": service_id,
+                    "alias": worker["alias"],
+                    "from": before.get(worker["alias"]),
+                    "to": worker.get("status"),
+                }
+            )
+    return events
+
+
+class Segment:
+    """One journal file, named after its first event: ``<first_ts_ms>.jsonl``.
+
+    Sealed segments have a ``.meta.json`` sidecar with their time range,
+    event count and services, so queries can skip them without opening
+    them. Compacted segments are gzipped (``.jsonl.gz``) and lose their
+    ``.idx`` time index.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.stem = path.name.split(".", 1)[0]
+        self.first_ts = int(self.stem) / 1000
+
+    @property
+    def compressed(self) -> bool:
+        return self.path.suffix == ".gz"
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(f"{self.stem}.idx")
+
+    @property
+    def meta_path(self) -> Path:
+        return self.path.with_name(f"{self.stem}.meta.json")
+
+    def load_meta(self) -> dict[str, Any] | None:
+        """Metadata of a sealed segment, None while it is still being written."""
+        try:
+            with open(self.meta_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def seek_offset(self, since: float) -> int:
+        """Byte offset of an indexed event at or before ``since``."""
+        if self.compressed:
+            return 0
+        try:
+            data = self.index_path.read_bytes()
+        except OSError:
+            return 0
+        # A crash may leave a partial record at the end
+        data = data[: len(data) - len(data) % INDEX_RECORD.size]
+        records = list(INDEX_RECORD.iter_unpack(data))
+        position = bisect.bisect_right([ts for ts, _ in records], since) - 1
+        return records[position][1] if position >= 0 else 0
+
+    def remove(self):
+        for path in (self.path, self.index_path, self.meta_path):
+            path.unlink(missing_ok=True)
+
+
+class EventJournal:
+    """Durable history of status transitions and worker control actions.
+
+    Events are JSON lines appended to the active segment, which is sealed
+    and replaced once it reaches ``segment_max_bytes`` or
+    ``segment_max_seconds``. A sparse time index per segment lets a query
+    seek straight to ``since``; sealed segments list their services so
+    per-service queries skip the rest. Sealed segments are gzipped after
+    ``compact_after_days`` and deleted after ``retention_days``.
+
+    Only the leader process writes. Other processes publish their events
+    on the events channel and the leader appends them; any process can
+    query the files. ``record`` only queues an event: a writer task
+    appends the queue in a worker thread, so a slow disk never stalls
+    the event loop.
+    """
+
+    def __init__(self):
+        self._segment: Segment | None = None
+        self._file = None
+        self._index = None
+        self._size = 0
+        self._count = 0
+        self._services: set[str] = set()
+        self._last_ts = 0.0
+        # Timestamp of the last queued event, ahead of _last_ts until it is written
+        self._queued_ts = 0.0
+        self._writer = False
+        self._pending: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue()
+        self._write_task: asyncio.Task | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def config(self):
+        return get_config().events
+
+    @property
+    def directory(self) -> Path:
+        return Path(self.config.path)
+
+    async def start(self):
+        """Take ownership of the journal files (leader only)."""
+        if not self.config.enabled or self._writer:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(self._recover)
+        self._queued_ts = self._last_ts
+        self._pending = asyncio.Queue()
+        self._writer = True
+        self._write_task = asyncio.create_task(self._write_loop())
+        self._task = asyncio.create_task(self._maintenance_loop())
+
+    async def stop(self):
+        """Stop writing; the active segment stays unsealed for the next leader.
+
+        Events queued before the call are written first.
+        """
+        self._writer = False
+        if self._write_task:
+            self._pending.put_nowait(None)
+            await self._write_task
+            self._write_task = None
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._close_active()
+
+    async def emit(self, kind: str, service_id: str | None = None, **fields: Any):
+        """Record an event and publish it on the events channel."""
+        if not self.config.enabled:
+            return
+        event = {"ts": time.time(), "kind": kind, "service_id": service_id, **fields}
+        self.record(event)
+        await ws_manager.broadcast("events", event, message_type="event")
+
+    def record(self, event: dict[str, Any]):
+        """Queue an event for appending if this process writes the journal."""
+        if not self._writer:
+            return
+        # Fix the timestamp now so the journal and the broadcast agree
+        event["ts"] = max(event["ts"], self._queued_ts + 1e-6)
+        self._queued_ts = event["ts"]
+        self._pending.put_nowait(event)
+
+    async def _write_loop(self):
+        """Append queued events in a worker thread until ``stop`` queues None."""
+        while True:
+            batch = [await self._pending.get()]
+            # Whatever piled up during the last write goes in one thread hop
+            while not self._pending.empty():
+                batch.append(self._pending.get_nowait())
+            events = [event for event in batch if event is not None]
+            if events:
+                await asyncio.to_thread(self._write, events)
+            if None in batch:
+                return
+
+    def _write(self, events: list[dict[str, Any]]):
+        for event in events:
+            try:
+                self._append(event)
+            except Exception as e:
+                print(f"Error writing event journal: {e}")
+
+    def query(
+        self,
+        since: float,
+        until: float | None = None,
+        service_id: str | None = None,
+        kind: str | None = None,
+        limit: int = 100,
+    ) -> tuple[list[dict[str, Any]], float | None]:
+        """Events after ``since``, oldest first.
+
+        Returns up to ``limit`` events and the ``since`` of the next page,
+        or None when there are no more events.
+        """
+        segments = self._segments()
+        start = max(bisect.bisect_right([s.first_ts for s in segments], since) - 1, 0)
+        events: list[dict[str, Any]] = []
+        for segment in segments[start:]:
+            if until is not None and segment.first_ts > until:
+                break
+            meta = segment.load_meta()
+            if meta is not None:
+                if meta["last_ts"] <= since:
+                    continue
+                if service_id is not None and service_id not in meta["services"]:
+                    continue
+            for event in self._scan(segment, since, service_id, kind):
+                if until is not None and event["ts"] > until:
+                    return events, None
+                events.append(event)
+                if len(events) >= limit:
+                    return events, event["ts"]
+        return events, None
+
+    def _scan(
+        self, segment: Segment, since: float, service_id: str | None, kind: str | None
+    ) -> Iterator[dict[str, Any]]:
+        # Cheap byte match before parsing; lines are written with compact separators
+        needle = None
+        if service_id is not None:
+            needle = b'"service_id":' + json.dumps(service_id).encode()
+        opener = gzip.open if segment.compressed else open
+        try:
+            with opener(segment.path, "rb") as f:
+                f.seek(segment.seek_offset(since))
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Still being written
+                    if needle is not None and needle not in line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        continue
+                    if event["ts"] <= since or (kind is not None and event["kind"] != kind):
+                        continue
+                    if service_id is not None and event.get("service_id") != service_id:
+                        continue
+                    yield event
+        except FileNotFoundError:
+            # Compacted or expired while we were looking
+            return
+
+    def _segments(self) -> list[Segment]:
+        segments: dict[str, Segment] = {}
+        # Mid-compaction both files exist; the uncompressed one is complete
+        for path in [*self.directory.glob("*.jsonl.gz"), *self.directory.glob("*.jsonl")]:
+            segment = Segment(path)
+            segments[segment.stem] = segment
+        return sorted(segments.values(), key=lambda s: s.first_ts)
+
+    def _append(self, event: dict[str, Any]):
+        # Keep timestamps strictly increasing so ``since`` works as a cursor
+        event["ts"] = max(event["ts"], self._last_ts + 1e-6)
+        line = (json.dumps(event, separators=(",", ":")) + "\n").encode()
+
+        config = self.config
+        if self._segment is not None and (
+            self._size + len(line) > config.segment_max_bytes
+            or event["ts"] - self._segment.first_ts >= config.segment_max_seconds
+        ):
+            self._seal()
+        if self._segment is None:
+            self._open_segment(event["ts"])
+
+        if self._count % INDEX_EVERY == 0:
+            # Index the line before writing it so the offset is exact
+            self._index.write(INDEX_RECORD.pack(event["ts"], self._size))
+            self._index.flush()
+        self._file.write(line)
+        self._file.flush()
+
+        self._size += len(line)
+        self._count += 1
+        self._last_ts = event["ts"]
+        if event.get("service_id"):
+            self._services.add(event["service_id"])
+
+    def _open_segment(self, first_ts: float):
+        stem = int(first_ts * 1000)
+        self._segment = Segment(self.directory / f"{stem}.jsonl")
+        self._file = open(self._segment.path, "ab")
+        self._index = open(self._segment.index_path, "ab")
+        self._size = 0
+        self._count = 0
+        self._services = set()
+
+    def _seal(self):
+        """Write the active segment's metadata and close it."""
+        meta = {
+            "first_ts": self._segment.first_ts,
+            "last_ts": self._last_ts,
+            "count": self._count,
+            "services": sorted(self._services),
+        }
+        tmp_path = self._segment.meta_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, self._segment.meta_path)
+        self._close_active()
+
+    def _close_active(self):
+        for f in (self._file, self._index):
+            if f is not None:
+                f.close()
+        self._segment = None
+        self._file = None
+        self._index = None
+
+    def _recover(self):
+        """Reopen the unsealed segment left by the previous writer, if any."""
+        active = []
+        for segment in self._segments():
+            meta = segment.load_meta()
+            if meta is not None:
+                self._last_ts = max(self._last_ts, meta["last_ts"])
+            elif not segment.compressed:
+                active.append(segment)
+        if not active:
+            return
+
+        # Older unsealed segments can only come from a crash mid-roll
+        for segment in active[:-1]:
+            self._segment = segment
+            self._rescan(segment)
+            self._seal()
+        segment = active[-1]
+        self._rescan(segment)
+        self._segment = segment
+        self._file = open(segment.path, "ab")
+        self._index = open(segment.index_path, "ab")
+
+    def _rescan(self, segment: Segment):
+        """Rebuild the counters of an unsealed segment, dropping a torn last line."""
+        with open(segment.path, "rb+") as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end != len(data):
+                f.truncate(end)
+        self._size = end
+        self._count = 0
+        self._services = set()
+        for line in data[:end].splitlines():
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            self._count += 1
+            self._last_ts = max(self._last_ts, event["ts"])
+            if event.get("service_id"):
+                self._services.add(event["service_id"])
+
+    def _maintain(self):
+        """Gzip old sealed segments and delete expired ones."""
+        now = time.time()
+        compact_before = now - self.config.compact_after_days * 86400
+        expire_before = now - self.config.retention_days * 86400
+        for segment in self._segments():
+            meta = segment.load_meta()
+            if meta is None:
+                continue
+            if meta["last_ts"] < expire_before:
+                segment.remove()
+            elif not segment.compressed and meta["last_ts"] < compact_before:
+                compressed = segment.path.with_name(f"{segment.stem}.jsonl.gz")
+                tmp_path = compressed.with_suffix(".tmp")
+                with open(segment.path, "rb") as src, gzip.open(tmp_path, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, compressed)
+                segment.path.unlink()
+                segment.index_path.unlink(missing_ok=True)
+
+    async def _maintenance_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._maintain)
+            except Exception as e:
+                print(f"Error in event journal maintenance: {e}")
+            await asyncio.sleep(MAINTENANCE_INTERVAL_SECONDS)
+
+
+# Global event journal instance
+event_journal = EventJournal()
@@ -0,0 +1,198 @@
+"""Policy engine that evicts idle workers automatically."""
+import json
+import time
+from collections import deque
+from typing import Any
+
+from ..core import ServiceRegistry, get_config
+from ..ws import ws_manager
+from . import worker_actions
+from .admission import admission_controller
+from .events import event_journal
+from .status_store import status_store
+
+
+class EvictionPolicy:
+    """Evicts idle workers based on the latest health check results.
+
+    Runs after every poll of the health checker. A running worker is evicted
+    when it has been idle longer than its TTL (per worker, per type, or the
+    default), or, when a worker manager is above the memory pressure
+    threshold, least recently used idle workers are evicted until the
+    projected usage drops below it. Evictions are rate limited and every
+    decision is recorded in an audit log.
+
+    Evictions run as background jobs through the admission controller, so
+    the listener returns at once and never holds up the next poll.
+    """
+
+    def __init__(self, audit_size: int = 500):
+        self.audit: deque[dict[str, Any]] = deque(maxlen=audit_size)
+        self._recent: deque[float] = deque()
+        self._in_flight: set[tuple[str, str]] = set()
+
+    @property
+    def config(self):
+        return get_config().eviction
+
+    async def evaluate(self, statuses: list[dict[str, Any]]):
+        """Health checker listener: evict workers that violate the policy."""
+        if not self.config.enabled:
+            return
+
+        registry = ServiceRegistry()
+        for service_cfg, worker, reason in self._select(registry):
+            if not self._allow():
+                break
+            self._submit(service_cfg, worker, reason)
+
+    def ttl_for(self, service_cfg, alias: str) -> int | None:
+        """Get the idle TTL for a worker, most specific setting first."""
+        for worker_cfg in service_cfg.workers:
+            if worker_cfg.alias == alias:
+                if worker_cfg.idle_ttl_seconds is not None:
+                    return worker_cfg.idle_ttl_seconds
+                if worker_cfg.type in self.config.type_idle_ttl_seconds:
+                    return self.config.type_idle_ttl_seconds[worker_cfg.type]
+        return self.config.default_idle_ttl_seconds
+
+    def _select(self, registry: ServiceRegistry) -> list[tuple[Any, dict[str, Any], str]]:
+        """Pick workers to evict, in order, with the reason for each."""
+        selected: list[tuple[Any, dict[str, Any], str]] = []
+        picked: set[tuple[str, str]] = set()
+        # Running workers grouped by worker manager URL
+        by_manager: dict[str, list[tuple[Any, dict[str, Any]]]] = {}
+
+        for service_cfg in registry.list_services():
+            status = status_store.get_service(service_cfg.id) or {}
+            for worker in status.get("workers", []):
+                key = (service_cfg.id, worker["alias"])
+                if worker.get("status") != "running" or key in self._in_flight:
+                    continue
+                by_manager.setdefault(service_cfg.worker_manager.url, []).append(
+                    (service_cfg, worker)
+                )
+
+                ttl = self.ttl_for(service_cfg, worker["alias"])
+                idle = worker.get("idle_seconds") or 0
+                if ttl is not None and idle >= ttl:
+                    selected.append((service_cfg, worker, f"Idle {idle:.0f}s >= TTL {ttl}s"))
+                    picked.add(key)
+
+        threshold = self.config.memory_pressure_percent
+        if threshold is None:
+            return selected
+
+        for wm_url, workers in by_manager.items():
+            memory = (status_store.worker_managers.get(wm_url) or {}).get("memory")
+            if not memory or not memory.get("total_gb"):
+                continue
+            used_gb = memory["used_gb"]
+            # Workers already selected for TTL eviction free their memory too
+            used_gb -= sum(
+                w.get("memory_gb") or 0 for cfg, w in workers if (cfg.id, w["alias"]) in picked
+            )
+            lru = sorted(
+                (
+                    (cfg, w)
+                    for cfg, w in workers
+                    if (cfg.id, w["alias"]) not in picked
+                    and (w.get("idle_seconds") or 0) >= self.config.pressure_min_idle_seconds
+                ),
+                key=lambda item: -(item[1].get("idle_seconds") or 0),
+            )
+            for service_cfg, worker in lru:
+                used_percent = used_gb / memory["total_gb"] * 100
+                if used_percent < threshold:
+                    break
+                selected.append(
+                    (service_cfg, worker, f"Memory pressure {used_percent:.0f}% >= {threshold}%")
+                )
+                used_gb -= worker.get("memory_gb") or 0
+
+        return selected
+
+    def _allow(self) -> bool:
+        """Sliding-window rate limit on evictions."""
+        now = time.time()
+        while self._recent and self._recent[0] < now - self.config.rate_window_seconds:
+            self._recent.popleft()
+        if len(self._recent) >= self.config.max_evictions:
+            return False
+        self._recent.append(now)
+        return True
+
+    def _submit(self, service_cfg, worker: dict[str, Any], reason: str):
+        """Start an eviction job; the worker is skipped until it finishes."""
+        key = (service_cfg.id, worker["alias"])
+        action = "stop" if self.config.action == "stop" else "evict"
+        self._in_flight.add(key)
+
+        async def run() -> dict[str, Any]:
+            try:
+                result = await worker_actions.run_action(service_cfg, worker["alias"], action)
+                await self._record(
+                    service_cfg.id,
+                    worker,
+                    action,
+                    reason,
+                    success=result["success"],
+                    message=result["message"],
+                )
+                return result
+            except worker_actions.WorkerActionError as e:
+                await self._record(service_cfg.id, worker, action, reason, message=e.detail)
+                raise
+            finally:
+                self._in_flight.discard(key)
+
+        _, deduplicated = admission_controller.submit(service_cfg, worker["alias"], action, run)
+        if deduplicated:
+            # The same action is already running for someone else; ours never starts
+            self._in_flight.discard(key)
+
+    async def _record(
+        self,
+        service_id: str,
+        worker: dict[str, Any],
+        action: str,
+        reason: str,
+        success: bool = False,
+        message: str | None = None,
+    ):
+        """Append a decision to the audit log and publish it."""
+        entry = {
+            "timestamp": time.time(),
+            "service_id": service_id,
+            "alias": worker["alias"],
+            "action": action,
+            "reason": reason,
+            "idle_seconds": worker.get("idle_seconds"),
+            "memory_gb": worker.get("memory_gb"),
+            "success": success,
+            "message": message,
+        }
+        self.audit.append(entry)
+        print(f"Eviction policy: {action} {service_id}/{worker['alias']} ({reason}): {message}")
+
+        if self.config.audit_log_path:
+            try:
+                with open(self.config.audit_log_path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError as e:
+                print(f"Error writing eviction audit log: {e}")
+
+        await ws_manager.broadcast("workers", entry, message_type="eviction_update")
+        await event_journal.emit(
+            "eviction",
+            service_id,
+            alias=worker["alias"],
+            action=action,
+            reason=reason,
+            success=success,
+            message=message,
+        )
+
+
+# Global eviction policy instance
+eviction_policy = EvictionPolicy()
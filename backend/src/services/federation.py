@@ -0,0 +1,171 @@
+"""Federation: merge peer dashboards' live status into the local view."""
+import asyncio
+import json
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ..core import get_config
+from ..ws import ws_manager
+from .status_store import status_store
+from .upstream import upstream
+
+
+class PeerLink:
+    """Subscription to one peer dashboard's /ws stream.
+
+    The peer's services are bootstrapped with a single REST call, then kept
+    current from its services_update/overview_update messages. They are
+    stored under ``<peer>/<service_id>`` with a ``peer`` field, so local and
+    federated services share one status view.
+    """
+
+    def __init__(self, name: str, url: str, stale_after_seconds: int):
+        self.name = name
+        self.url = url.rstrip("/")
+        self.stale_after_seconds = stale_after_seconds
+        self.connected = False
+        self.last_message_at: float | None = None
+        self.lag_ms: float | None = None
+        self.messages = 0
+        self.reconnects = 0
+        self.error: str | None = None
+        self.service_ids: set[str] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ws_url(self) -> str:
+        return self.url.replace("http://", "ws://", 1).replace("https://", "wss://", 1) + "/ws"
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    def status(self) -> dict[str, Any]:
+        """Health and lag of the link."""
+        age = time.time() - self.last_message_at if self.last_message_at else None
+        return {
+            "name": self.name,
+            "url": self.url,
+            "connected": self.connected,
+            "stale": age is None or age > self.stale_after_seconds,
+            "last_message_age_seconds": round(age, 2) if age is not None else None,
+            "lag_ms": self.lag_ms,
+            "messages": self.messages,
+            "reconnects": self.reconnects,
+            "services": sorted(self.service_ids),
+            "error": self.error,
+        }
+
+    async def _run(self):
+        # Only needed once a peer is configured
+        import websockets
+
+        while True:
+            try:
+                await self._bootstrap()
+                async with websockets.connect(self.ws_url) as ws:
+                    self.connected = True
+                    self.error = None
+                    await ws.send(json.dumps({"type": "subscribe", "channel": "all"}))
+                    while True:
+                        raw = await asyncio.wait_for(ws.recv(), self.stale_after_seconds)
+                        await self._handle(json.loads(raw), ws.send)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                self.error = f"No updates for {self.stale_after_seconds}s"
+            except Exception as e:
+                self.error = str(e) or type(e).__name__
+
+            self.connected = False
+            self.reconnects += 1
+            await self._mark_stale()
+            await asyncio.sleep(5)
+
+    async def _bootstrap(self):
+        response = await upstream.get(f"{self.url}/api/v1/services", timeout=10.0)
+        response.raise_for_status()
+        for service in response.json().get("services", []):
+            if not service.get("peer"):
+                await self._apply_service(service)
+
+    async def _handle(self, message: dict[str, Any], send: Callable[[str], Awaitable[None]]):
+        self.messages += 1
+        self.last_message_at = time.time()
+        if "timestamp" in message:
+            self.lag_ms = round((self.last_message_at - message["timestamp"]) * 1000, 2)
+
+        if message.get("type") == "heartbeat":
+            # Answer like the frontend does, or the peer reaps this link as dead
+            await send(json.dumps({"type": "heartbeat_ack", "seq": message["data"]["seq"]}))
+        elif message.get("type") == "services_update":
+            # Only the peer's own services; federating its peers could loop
+            if not message["data"].get("peer"):
+                await self._apply_service(message["data"])
+        elif message.get("type") == "overview_update":
+            for wm in message["data"].get("worker_managers", []):
+                if "/" in wm["service_id"]:
+                    continue
+                status_store.update_worker_manager(
+                    f"{self.name}/{wm['service_id']}",
+                    {**wm, "service_id": f"{self.name}/{wm['service_id']}"},
+                )
+
+    async def _apply_service(self, service: dict[str, Any]):
+        service_id = f"{self.name}/{service['service_id']}"
+        status = {**service, "service_id": service_id, "peer": self.name}
+        self.service_ids.add(service_id)
+        status_store.update_service(status)
+        await ws_manager.broadcast("services", status)
+
+    async def _mark_stale(self):
+        """Show the peer's services as unknown while the link is down."""
+        for service_id in self.service_ids:
+            status = status_store.get_service(service_id)
+            if status and status["status"] != "unknown":
+                stale = {
+                    **status,
+                    "status": "unknown",
+                    "workers": [{**w, "status": "unknown"} for w in status.get("workers", [])],
+                }
+                status_store.update_service(stale)
+                await ws_manager.broadcast("services", stale)
+
+
+class Federation:
+    """Manages links to all configured peer dashboards."""
+
+    def __init__(self):
+        self.peers: dict[str, PeerLink] = {}
+
+    async def start(self):
+        """Connect to every configured peer."""
+        config = get_config().federation
+        for peer in config.peers:
+            link = PeerLink(peer.name, peer.url, config.stale_after_seconds)
+            self.peers[peer.name] = link
+            link.start()
+
+    async def stop(self):
+        """Disconnect from all peers."""
+        for link in self.peers.values():
+            await link.stop()
+        self.peers.clear()
+
+    def status(self) -> list[dict[str, Any]]:
+        """Health and lag of every peer link."""
+        return [link.status() for link in self.peers.values()]
+
+
+# Global federation instance
+federation = Federation()
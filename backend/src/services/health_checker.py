@@ -1,12 +1,17 @@
 """Background health checker that polls services and broadcasts updates."""
 import asyncio
 import time
+from collections.abc import Awaitable, Callable
 from typing import Any
 
-import httpx
-
 from ..core import ServiceRegistry, get_config
 from ..ws import ws_manager
+from .discovery import worker_discovery
+from .events import event_journal, status_transitions
+from .probes import gateway_prober
+from .status_store import status_store
+from .synthetic_probes import synthetic_prober
+from .upstream import CircuitOpenError, upstream
 
 
 class HealthChecker:
@@ -15,14 +20,27 @@ class HealthChecker:
     def __init__(self):
         self._running = False
         self._task: asyncio.Task | None = None
-        self.registry = ServiceRegistry()
-        self.config = get_config()
+        self._listeners: list[Callable[[list[dict[str, Any]]], Awaitable[None]]] = []
+
+    @property
+    def config(self):
+        # Read on use so importing this module does no config I/O
+        return get_config()
+
+    @property
+    def registry(self) -> ServiceRegistry:
+        return ServiceRegistry()
+
+    def add_listener(self, listener: Callable[[list[dict[str, Any]]], Awaitable[None]]):
+        """Register a coroutine called with all service statuses after each poll."""
+        self._listeners.append(listener)
 
     async def start(self):
         """Start the background polling task."""
         if self._running:
             return
         self._running = True
+        status_store.seed(self.registry.list_services())
         self._task = asyncio.create_task(self._poll_loop())
 
     async def stop(self):
@@ -46,17 +64,49 @@ class HealthChecker:
             await asyncio.sleep(self.config.polling.status_interval_seconds)
 
     async def _poll_all_services(self):
-        """Poll all services and broadcast updates."""
-        for service_cfg in self.registry.list_services():
+        """Poll all services concurrently and broadcast updates."""
+        version = status_store.version
+        # Large fleets would otherwise exhaust the upstream pool and time out in it
+        limit = asyncio.Semaphore(self.config.polling.max_concurrent_services)
+
+        async def poll(service_cfg):
+            async with limit:
+                return await self._poll_service(service_cfg)
+
+        results = await asyncio.gather(
+            *(poll(service_cfg) for service_cfg in self.registry.list_services())
+        )
+        status_store.mark_snapshot()
+
+        if status_store.version != version:
+            await ws_manager.broadcast(
+                "memory", status_store.overview(), message_type="overview_update"
+            )
+
+        statuses = [status for status in results if status is not None]
+        for listener in self._listeners:
             try:
-                status = await self._check_service(service_cfg)
-                await ws_manager.broadcast("services", status)
+                await listener(statuses)
             except Exception as e:
-                print(f"Error checking service {service_cfg.id}: {e}")
+                print(f"Error in health check listener: {e}")
+
+    async def _poll_service(self, service_cfg) -> dict[str, Any] | None:
+        """Poll a single service, record it and broadcast its status."""
+        try:
+            previous = status_store.get_service(service_cfg.id)
+            status = await self._check_service(service_cfg)
+            status_store.update_service(status)
+            for event in status_transitions(previous, status):
+                await event_journal.emit(**event)
+            await ws_manager.broadcast("services", status)
+            return status
+        except Exception as e:
+            print(f"Error checking service {service_cfg.id}: {e}")
+            return None
 
     async def _check_service(self, service_cfg) -> dict[str, Any]:
         """Check a single service's health and worker status."""
-        gateway_status = await self._check_gateway(service_cfg)
+        gateway_status = await gateway_prober.check(service_cfg)
         workers = await self._get_workers(service_cfg)
 
         overall_status = "healthy" if gateway_status["reachable"] else "unhealthy"
@@ -64,79 +114,103 @@ class HealthChecker:
         return {
             "service_id": service_cfg.id,
             "name": service_cfg.name,
+            "description": service_cfg.description,
+            "icon": service_cfg.icon,
             "status": overall_status,
             "gateway": gateway_status,
             "workers": workers,
             "timestamp": time.time(),
         }
 
-    async def _check_gateway(self, service_cfg) -> dict[str, Any]:
-        """Check gateway health."""
-        try:
-            start = time.time()
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"{service_cfg.gateway.url}{service_cfg.endpoints.health}"
-                )
-                latency = (time.time() - start) * 1000
-                if response.status_code == 200:
-                    return {"reachable": True, "latency_ms": round(latency, 2)}
-                return {
-                    "reachable": False,
-                    "latency_ms": round(latency, 2),
-                    "error": f"HTTP {response.status_code}",
-                }
-        except httpx.TimeoutException:
-            return {"reachable": False, "error": "Timeout"}
-        except httpx.ConnectError:
-            return {"reachable": False, "error": "Connection refused"}
-        except Exception as e:
-            return {"reachable": False, "error": str(e)}
-
     async def _get_workers(self, service_cfg) -> list[dict[str, Any]]:
         """Get worker status from worker manager."""
         workers = []
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(
-                    f"{service_cfg.worker_manager.url}/status"
+            response = await upstream.get(
+                f"{service_cfg.worker_manager.url}/status", timeout=5.0, probe=True
+            )
+            if response.status_code == 200:
+                data = response.json()
+                active_workers = data.get("workers", {})
+                self._record_worker_manager(service_cfg, data)
+                worker_discovery.observe_workers(service_cfg, active_workers)
+
+                for worker_cfg in service_cfg.workers:
+                    alias = worker_cfg.alias
+                    if alias in active_workers:
+                        w = active_workers[alias]
+                        workers.append(
+                            {
+                                "alias": alias,
+                                "name": worker_cfg.name,
+                                "type": worker_cfg.type,
+                                "status": "running",
+                                "port": w.get("port"),
+                                "memory_gb": w.get("memory_gb"),
+                                "uptime_seconds": w.get("uptime_seconds"),
+                                "idle_seconds": synthetic_prober.effective_idle(
+                                    service_cfg.id, alias, w.get("idle_seconds")
+                                ),
+                                "discovered": worker_cfg.discovered,
+                            }
+                        )
+                    else:
+                        workers.append(
+                            {
+                                "alias": alias,
+                                "name": worker_cfg.name,
+                                "type": worker_cfg.type,
+                                "status": "stopped",
+                                "discovered": worker_cfg.discovered,
+                            }
+                        )
+            else:
+                self._record_worker_manager(
+                    service_cfg, error=f"HTTP {response.status_code}"
                 )
-                if response.status_code == 200:
-                    data = response.json()
-                    active_workers = data.get("workers", {})
-
-                    for worker_cfg in service_cfg.workers:
-                        alias = worker_cfg.alias
-                        if alias in active_workers:
-                            w = active_workers[alias]
-                            workers.append(
-                                {
-                                    "alias": alias,
-                                    "name": worker_cfg.name,
-                                    "type": worker_cfg.type,
-                                    "status": "running",
-                                    "port": w.get("port"),
-                                    "memory_gb": w.get("memory_gb"),
-                                    "uptime_seconds": w.get("uptime_seconds"),
-                                    "idle_seconds": w.get("idle_seconds"),
-                                }
-                            )
-                        else:
-                            workers.append(
-                                {
-                                    "alias": alias,
-                                    "name": worker_cfg.name,
-                                    "type": worker_cfg.type,
-                                    "status": "stopped",
-                                }
-                            )
-                else:
-                    workers = self._unknown_workers(service_cfg)
-        except Exception:
+                workers = self._unknown_workers(service_cfg)
+        except CircuitOpenError as e:
+            # Fail fast with the last known workers while the breaker is open
+            self._record_worker_manager(service_cfg, error=str(e))
+            cached = status_store.get_service(service_cfg.id)
+            workers = cached["workers"] if cached else self._unknown_workers(service_cfg)
+        except Exception as e:
+            self._record_worker_manager(service_cfg, error=str(e))
             workers = self._unknown_workers(service_cfg)
 
         return workers
 
+    def _record_worker_manager(
+        self, service_cfg, data: dict[str, Any] | None = None, error: str | None = None
+    ):
+        """Record a worker manager's /status result in the status store."""
+        if data is None:
+            status = {
+                "service_id": service_cfg.id,
+                "reachable": False,
+                "workers_count": 0,
+                "memory": None,
+                "error": error,
+            }
+        else:
+            memory = None
+            if "memory" in data:
+                mem = data["memory"]
+                memory = {
+                    "total_gb": mem.get("total_gb", 0),
+                    "available_gb": mem.get("available_gb", 0),
+                    "used_gb": mem.get("used_gb", 0),
+                    "used_percent": mem.get("used_percent", 0),
+                }
+            status = {
+                "service_id": service_cfg.id,
+                "reachable": True,
+                "workers_count": len(data.get("workers", {})),
+                "memory": memory,
+                "error": None,
+            }
+        status_store.update_worker_manager(service_cfg.worker_manager.url, status)
+
     def _unknown_workers(self, service_cfg) -> list[dict[str, Any]]:
         """Return workers with unknown status."""
         return [
@@ -145,6 +219,7 @@ class HealthChecker:
                 "name": w.name,
                 "type": w.type,
                 "status": "unknown",
+                "discovered": w.discovered,
             }
             for w in service_cfg.workers
         ]
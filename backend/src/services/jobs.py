@@ -0,0 +1,124 @@
+"""In-memory job table for long-running worker actions."""
+import asyncio
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from ..ws import ws_manager
+from .events import event_journal
+from .worker_actions import WorkerActionError
+
+
+class JobTable:
+    """Runs worker actions in the background and tracks their state.
+
+    Finished jobs are kept for ``ttl_seconds`` so clients can collect the
+    result after a dropped connection, then evicted lazily.
+    """
+
+    def __init__(self, ttl_seconds: float = 600.0):
+        self.ttl_seconds = ttl_seconds
+        self.jobs: dict[str, dict[str, Any]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def submit(
+        self,
+        action: str,
+        service_id: str,
+        alias: str,
+        run: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> dict[str, Any]:
+        """Create a job for a worker action and start it."""
+        self._evict_expired()
+
+        job_id = uuid.uuid4().hex[:12]
+        job = {
+            "job_id": job_id,
+            "action": action,
+            "service_id": service_id,
+            "worker_alias": alias,
+            "state": "pending",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "status_code": None,
+        }
+        self.jobs[job_id] = job
+        self._tasks[job_id] = asyncio.create_task(self._run(job, run))
+        return job
+
+    def get(self, job_id: str) -> dict[str, Any] | None:
+        """Get a job by ID."""
+        self._evict_expired()
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> list[dict[str, Any]]:
+        """List all tracked jobs, newest first."""
+        self._evict_expired()
+        return sorted(self.jobs.values(), key=lambda j: j["created_at"], reverse=True)
+
+    def record(self, job: dict[str, Any]):
+        """Track a job reported by another dashboard process."""
+        if job["job_id"] not in self._tasks:
+            self.jobs[job["job_id"]] = job
+
+    async def wait(self, job_id: str) -> dict[str, Any]:
+        """Wait for a job to finish without cancelling it if the caller goes away."""
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+        return self.jobs[job_id]
+
+    async def _run(self, job: dict[str, Any], run: Callable[[], Awaitable[dict[str, Any]]]):
+        job["state"] = "running"
+        job["started_at"] = time.time()
+        await self._publish(job)
+
+        try:
+            result = await run()
+            job["result"] = result
+            job["state"] = "succeeded" if result.get("success") else "failed"
+            if not result.get("success"):
+                job["error"] = result.get("message")
+        except WorkerActionError as e:
+            job["state"] = "failed"
+            job["error"] = e.detail
+            job["status_code"] = e.status_code
+        except Exception as e:
+            job["state"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = time.time()
+            self._tasks.pop(job["job_id"], None)
+
+        await self._publish(job)
+        await event_journal.emit(
+            "action_finished",
+            job["service_id"],
+            alias=job["worker_alias"],
+            action=job["action"],
+            job_id=job["job_id"],
+            success=job["state"] == "succeeded",
+            error=job["error"],
+        )
+
+    async def _publish(self, job: dict[str, Any]):
+        """Push job progress to the 'workers' channel."""
+        await ws_manager.broadcast("workers", job, message_type="job_update")
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.ttl_seconds
+        expired = [
+            job_id
+            for job_id, job in self.jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self.jobs[job_id]
+
+
+# Global job table instance
+job_table = JobTable()
@@ -0,0 +1,159 @@
+"""Model catalog aggregated from every gateway's models endpoint."""
+import asyncio
+import time
+from typing import Any
+
+from ..core import ServiceRegistry, get_config
+from .upstream import upstream
+
+
+def _parse_models(payload: Any) -> list[dict[str, Any]]:
+    """Accept OpenAI-style ``{"data": [...]}``, ``{"models": [...]}`` or a bare list."""
+    if isinstance(payload, dict):
+        payload = payload.get("data", payload.get("models", []))
+    if not isinstance(payload, list):
+        return []
+    return [m if isinstance(m, dict) else {"id": str(m)} for m in payload]
+
+
+class ModelCatalog:
+    """Cached, indexed view of the models hosted by every service.
+
+    Each gateway's models endpoint is cached for ``cache_ttl_seconds`` and
+    revalidated with its ETag (If-None-Match), so unchanged catalogs cost a
+    304. Stale gateways are refreshed in parallel on demand, one fetch per
+    gateway at a time; while a gateway is being refetched, readers get its
+    last catalog instead of waiting on it. Each finished fetch swaps in new
+    indexes in one synchronous step, so readers never see a partial index.
+    """
+
+    def __init__(self):
+        # Per service: etag, fetched_at, error and normalized model records
+        self.sources: dict[str, dict[str, Any]] = {}
+        self.models: list[dict[str, Any]] = []
+        self.by_model: dict[str, list[dict[str, Any]]] = {}
+        self.by_alias: dict[str, list[dict[str, Any]]] = {}
+        self.by_type: dict[str, list[dict[str, Any]]] = {}
+        self._fetches: dict[str, asyncio.Task] = {}
+
+    async def refresh(self, force: bool = False):
+        """Refetch every service whose cached catalog is older than the TTL."""
+        ttl = get_config().models.cache_ttl_seconds
+        now = time.time()
+        waiting = []
+        for service_cfg in ServiceRegistry().list_services():
+            source = self.sources.get(service_cfg.id)
+            task = self._fetches.get(service_cfg.id)
+            if task is not None:
+                # Someone else is fetching it: wait only if there is nothing to serve yet
+                if force or source is None or not source["fetched_at"]:
+                    waiting.append(task)
+            elif force or source is None or source["fetched_at"] + ttl < now:
+                task = asyncio.ensure_future(self._refetch(service_cfg))
+                self._fetches[service_cfg.id] = task
+                waiting.append(task)
+        if waiting:
+            # A cancelled reader must not cancel a fetch others may be waiting on
+            await asyncio.gather(*(asyncio.shield(task) for task in waiting))
+
+    def search(
+        self,
+        query: str | None = None,
+        model_type: str | None = None,
+        service_id: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """Find models by substring of model ID/alias, type and service."""
+        if model_type is not None:
+            results = self.by_type.get(model_type.lower(), [])
+        else:
+            results = self.models
+        if service_id is not None:
+            results = [m for m in results if m["service_id"] == service_id]
+        if query:
+            needle = query.lower()
+            results = [
+                m
+                for m in results
+                if needle in m["model"].lower() or needle in (m["alias"] or "").lower()
+            ]
+        return results
+
+    def lookup(self, name: str) -> list[dict[str, Any]]:
+        """Find every service hosting a model, by exact model ID or alias."""
+        key = name.lower()
+        return self.by_model.get(key, []) or self.by_alias.get(key, [])
+
+    async def _refetch(self, service_cfg):
+        try:
+            await self._fetch(service_cfg)
+        finally:
+            self._fetches.pop(service_cfg.id, None)
+            self._rebuild_index()
+
+    async def _fetch(self, service_cfg):
+        source = self.sources.setdefault(
+            service_cfg.id, {"etag": None, "fetched_at": 0.0, "error": None, "models": []}
+        )
+        headers = {"If-None-Match": source["etag"]} if source["etag"] else {}
+        try:
+            response = await upstream.get(
+                f"{service_cfg.gateway.url}{service_cfg.endpoints.models}",
+                timeout=10.0,
+                headers=headers,
+            )
+            if response.status_code == 304:
+                source["fetched_at"] = time.time()
+                source["error"] = None
+                return
+            if response.status_code != 200:
+                source["error"] = f"HTTP {response.status_code}"
+                source["fetched_at"] = time.time()
+                return
+
+            worker_types = {w.alias: w.type for w in service_cfg.workers}
+            source["models"] = [
+                self._normalize(service_cfg, raw, worker_types)
+                for raw in _parse_models(response.json())
+            ]
+            source["etag"] = response.headers.get("etag")
+            source["fetched_at"] = time.time()
+            source["error"] = None
+        except Exception as e:
+            # Keep serving the last good catalog; retry after the TTL
+            source["error"] = str(e)
+            source["fetched_at"] = time.time()
+
+    def _normalize(
+        self, service_cfg, raw: dict[str, Any], worker_types: dict[str, str]
+    ) -> dict[str, Any]:
+        model_id = str(raw.get("id") or raw.get("name") or "")
+        # Gateways are not ours to trust: anything but a string is dropped
+        alias = raw.get("alias") if isinstance(raw.get("alias"), str) else None
+        model_type = raw.get("type") if isinstance(raw.get("type"), str) else None
+        return {
+            "model": model_id,
+            "alias": alias,
+            "type": model_type or worker_types.get(alias) or worker_types.get(model_id),
+            "service_id": service_cfg.id,
+            "service_name": service_cfg.name,
+            "owned_by": raw.get("owned_by"),
+        }
+
+    def _rebuild_index(self):
+        registered = set(ServiceRegistry().get_service_ids())
+        for service_id in list(self.sources):
+            if service_id not in registered:
+                del self.sources[service_id]
+
+        self.models = [m for source in self.sources.values() for m in source["models"]]
+        self.by_model, self.by_alias, self.by_type = {}, {}, {}
+        for model in self.models:
+            self.by_model.setdefault(model["model"].lower(), []).append(model)
+            if model["alias"]:
+                self.by_alias.setdefault(model["alias"].lower(), []).append(model)
+            if model["type"]:
+                self.by_type.setdefault(model["type"].lower(), []).append(model)
+
+
+# Global model catalog instance
+model_catalog = ModelCatalog()
@@ -0,0 +1,139 @@
+"""Memory-aware placement planner for worker spawns."""
+from typing import Any
+
+from ..core import ServiceRegistry, get_config
+from . import worker_actions
+from .status_store import status_store
+
+
+class PlacementPlanner:
+    """Decides which idle workers to evict so that a spawn fits in memory.
+
+    The plan uses the worker manager's last reported available memory, the
+    peak footprint each worker has been seen using (falling back to the
+    ``memory_gb`` estimate from config) and how long candidates have been idle.
+    Least recently used workers are evicted first.
+    """
+
+    def __init__(self):
+        self.registry = ServiceRegistry()
+        self.config = get_config().planner
+
+    def expected_memory(self, service_cfg, alias: str) -> float | None:
+        """Get the expected memory footprint of a worker in GB."""
+        footprint = status_store.get_footprint(service_cfg.id, alias)
+        if footprint is not None:
+            return footprint
+        for worker_cfg in service_cfg.workers:
+            if worker_cfg.alias == alias:
+                return worker_cfg.memory_gb
+        return None
+
+    def plan(self, service_cfg, alias: str) -> dict[str, Any]:
+        """Build an eviction plan for spawning ``alias`` (dry run)."""
+        wm_url = service_cfg.worker_manager.url
+        required_gb = self.expected_memory(service_cfg, alias)
+        wm_status = status_store.worker_managers.get(wm_url) or {}
+        memory = wm_status.get("memory")
+
+        plan: dict[str, Any] = {
+            "service_id": service_cfg.id,
+            "alias": alias,
+            "required_gb": required_gb,
+            "available_gb": memory["available_gb"] if memory else None,
+            "headroom_gb": self.config.headroom_gb,
+            "shortfall_gb": 0.0,
+            "freed_gb": 0.0,
+            "evict": [],
+            "feasible": True,
+            "reason": None,
+        }
+
+        if status_store.is_worker_running(service_cfg.id, alias):
+            plan["reason"] = "Worker already running"
+            return plan
+        if memory is None:
+            plan["reason"] = "No memory information from worker manager; spawning without plan"
+            return plan
+        if required_gb is None:
+            plan["reason"] = "Unknown memory footprint; spawning without plan"
+            return plan
+
+        shortfall = required_gb + self.config.headroom_gb - memory["available_gb"]
+        if shortfall <= 0:
+            plan["reason"] = "Enough memory available"
+            return plan
+        plan["shortfall_gb"] = round(shortfall, 2)
+
+        selected: list[dict[str, Any]] = []
+        freed = 0.0
+        for candidate in self._eviction_candidates(wm_url, exclude=(service_cfg.id, alias)):
+            if freed >= shortfall:
+                break
+            selected.append(candidate)
+            freed += candidate["memory_gb"]
+
+        # Keep LRU order but drop any pick the rest already cover, smallest first
+        for candidate in sorted(selected, key=lambda c: c["memory_gb"]):
+            if freed - candidate["memory_gb"] >= shortfall:
+                selected.remove(candidate)
+                freed -= candidate["memory_gb"]
+
+        plan["evict"] = selected
+        plan["freed_gb"] = round(freed, 2)
+        if freed < shortfall:
+            plan["feasible"] = False
+            plan["reason"] = "Not enough idle workers to free the required memory"
+        else:
+            plan["reason"] = f"Evicting {len(selected)} idle worker(s)"
+        return plan
+
+    async def execute(self, service_cfg, alias: str, plan: dict[str, Any]) -> dict[str, Any]:
+        """Evict the planned workers, then spawn ``alias``."""
+        evicted = []
+        for candidate in plan["evict"]:
+            victim_cfg = self.registry.get_service(candidate["service_id"])
+            result = await worker_actions.evict_worker(victim_cfg, candidate["alias"])
+            if not result["success"]:
+                return {
+                    **result,
+                    "worker_alias": alias,
+                    "action": "spawn",
+                    "data": {"plan": plan, "evicted": evicted},
+                }
+            evicted.append(candidate["alias"])
+
+        result = await worker_actions.spawn_worker(service_cfg, alias)
+        return {**result, "data": {**(result.get("data") or {}), "plan": plan}}
+
+    def _eviction_candidates(
+        self, wm_url: str, exclude: tuple[str, str]
+    ) -> list[dict[str, Any]]:
+        """Idle running workers on a worker manager, least recently used first."""
+        candidates = []
+        for service_cfg in self.registry.list_services():
+            if service_cfg.worker_manager.url != wm_url:
+                continue
+            status = status_store.get_service(service_cfg.id) or {}
+            for worker in status.get("workers", []):
+                if worker.get("status") != "running":
+                    continue
+                if (service_cfg.id, worker["alias"]) == exclude:
+                    continue
+                idle = worker.get("idle_seconds") or 0
+                if idle < self.config.min_idle_seconds:
+                    continue
+                memory_gb = worker.get("memory_gb") or self.expected_memory(
+                    service_cfg, worker["alias"]
+                )
+                if not memory_gb:
+                    continue
+                candidates.append(
+                    {
+                        "service_id": service_cfg.id,
+                        "alias": worker["alias"],
+                        "memory_gb": memory_gb,
+                        "idle_seconds": idle,
+                    }
+                )
+        return sorted(candidates, key=lambda c: (-c["idle_seconds"], -c["memory_gb"]))
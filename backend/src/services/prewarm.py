@@ -0,0 +1,201 @@
+"""Predictive pre-warming of workers from time-of-day usage history."""
+import json
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from ..core import ServiceRegistry, get_config
+from .admission import admission_controller
+from .planner import PlacementPlanner
+from .status_store import status_store
+
+# Slack when telling a pre-warmed worker's first real request from its spawn
+PREWARM_MATCH_SLACK_SECONDS = 2.0
+
+
+class PrewarmScheduler:
+    """Learns when each worker is in demand and spawns it ahead of time.
+
+    The day is split into slots of ``slot_minutes``. A worker counts as in
+    demand during a slot if it served a request in it (running with
+    ``idle_seconds`` shorter than the time elapsed in the slot). Per worker
+    we keep, for every slot, the decayed fraction of observed days with
+    demand; a worker whose fraction for the slot starting ``lead_minutes``
+    from now reaches ``min_probability`` is spawned, within the memory
+    budget. Workers with no known footprint are never pre-warmed, and a
+    worker we pre-warmed only counts as in demand once it has been used.
+    """
+
+    def __init__(self):
+        self._history: dict[str, Any] | None = None
+        self._dirty = False
+        self._warmed: set[tuple[str, str, int]] = set()
+        # Per "<service_id>/<alias>": the spawn job of a worker we pre-warmed, until it's used
+        self._prewarmed: dict[str, dict[str, Any]] = {}
+        self._planned_slot: tuple[str, int] | None = None
+
+    @property
+    def config(self):
+        return get_config().prewarm
+
+    @property
+    def history(self) -> dict[str, Any]:
+        """History loaded from disk on first use."""
+        if self._history is None:
+            self._history = self._load()
+        return self._history
+
+    def slot_of(self, moment: datetime) -> int:
+        """Index of the time-of-day slot a moment falls into."""
+        return (moment.hour * 60 + moment.minute) // self.config.slot_minutes
+
+    async def observe(self, statuses: list[dict[str, Any]]):
+        """Health checker listener: record demand, then pre-warm if due."""
+        if not self.config.enabled:
+            return
+
+        now = datetime.now()
+        self._record(statuses, now)
+        if self._dirty:
+            self._save()
+        await self._prewarm(now)
+
+    def probabilities(self, slot: int) -> dict[str, float]:
+        """Demand probability of every known worker for a slot."""
+        days = self.history["days"]
+        if days < self.config.min_days:
+            return {}
+        return {
+            key: counts[slot] / days
+            for key, counts in self.history["workers"].items()
+            if counts[slot] > 0
+        }
+
+    def _record(self, statuses: list[dict[str, Any]], now: datetime):
+        history = self.history
+        today = now.date().isoformat()
+        slot = self.slot_of(now)
+        slots_per_day = 24 * 60 // self.config.slot_minutes
+
+        if history["last_day"] != today:
+            history["last_day"] = today
+            history["days"] += 1
+            # Decay older days so the histogram follows changing habits
+            if history["days"] > self.config.window_days:
+                factor = (self.config.window_days - 1) / self.config.window_days
+                history["days"] = self.config.window_days
+                for counts in history["workers"].values():
+                    for i, count in enumerate(counts):
+                        counts[i] = count * factor
+            history["marked"] = {}
+            self._dirty = True
+
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        slot_start = midnight + timedelta(minutes=slot * self.config.slot_minutes)
+        elapsed = (now - slot_start).total_seconds()
+        for status in statuses:
+            for worker in status.get("workers", []):
+                key = f"{status['service_id']}/{worker['alias']}"
+                if worker.get("status") != "running":
+                    self._prewarmed.pop(key, None)
+                    continue
+                idle_seconds = worker.get("idle_seconds")
+                if key in self._prewarmed and not self._used_since_prewarm(
+                    key, idle_seconds, now
+                ):
+                    continue
+                # Only requests made since the slot started
+                if (idle_seconds or 0) >= elapsed:
+                    continue
+                if history["marked"].get(key) == slot:
+                    continue
+                counts = history["workers"].setdefault(key, [0.0] * slots_per_day)
+                counts[slot] += 1
+                history["marked"][key] = slot
+                self._dirty = True
+
+    def _used_since_prewarm(self, key: str, idle_seconds: float | None, now: datetime) -> bool:
+        """Whether a worker we pre-warmed has served a request since it was loaded."""
+        finished_at = self._prewarmed[key]["finished_at"]
+        if finished_at is None or idle_seconds is None:
+            return False
+        last_request = now.timestamp() - idle_seconds
+        if last_request <= finished_at + PREWARM_MATCH_SLACK_SECONDS:
+            return False
+        del self._prewarmed[key]
+        return True
+
+    async def _prewarm(self, now: datetime):
+        target = now + timedelta(minutes=self.config.lead_minutes)
+        slot = self.slot_of(target)
+        day = target.date().isoformat()
+        if self._planned_slot == (day, slot):
+            return
+        self._planned_slot = (day, slot)
+
+        registry = ServiceRegistry()
+        planner = PlacementPlanner()
+        budget = self.config.memory_budget_gb
+        available: dict[str, float] = {}
+
+        ranked = sorted(self.probabilities(slot).items(), key=lambda item: -item[1])
+        for key, probability in ranked:
+            if probability < self.config.min_probability:
+                break
+            service_id, alias = key.split("/", 1)
+            service_cfg = registry.get_service(service_id)
+            if service_cfg is None or (service_id, alias, slot) in self._warmed:
+                continue
+            if status_store.is_worker_running(service_id, alias):
+                continue
+
+            memory_gb = planner.expected_memory(service_cfg, alias)
+            if not memory_gb:
+                # Unknown footprint: no way to tell whether it fits
+                continue
+            wm_url = service_cfg.worker_manager.url
+            if wm_url not in available:
+                memory = (status_store.worker_managers.get(wm_url) or {}).get("memory")
+                available[wm_url] = memory["available_gb"] if memory else 0.0
+            if memory_gb > budget or available[wm_url] - memory_gb < self.config.reserve_gb:
+                continue
+
+            budget -= memory_gb
+            available[wm_url] -= memory_gb
+            self._warmed.add((service_id, alias, slot))
+            print(f"Pre-warming {key} (p={probability:.2f}, slot {slot})")
+            job, deduplicated = admission_controller.submit(service_cfg, alias, "spawn")
+            if not deduplicated:
+                self._prewarmed[key] = job
+
+        # Forget pre-warm marks of slots that have passed
+        self._warmed = {entry for entry in self._warmed if entry[2] == slot}
+
+    def _load(self) -> dict[str, Any]:
+        path = Path(self.config.history_path)
+        empty = {"days": 0, "last_day": None, "marked": {}, "workers": {}}
+        if not path.exists():
+            return empty
+        try:
+            with open(path) as f:
+                history = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error loading pre-warm history: {e}")
+            return empty
+        slots_per_day = 24 * 60 // self.config.slot_minutes
+        if any(len(c) != slots_per_day for c in history.get("workers", {}).values()):
+            print("Pre-warm history slot size changed, starting over")
+            return empty
+        return {**empty, **history}
+
+    def _save(self):
+        try:
+            with open(self.config.history_path, "w") as f:
+                json.dump(self.history, f)
+            self._dirty = False
+        except OSError as e:
+            print(f"Error saving pre-warm history: {e}")
+
+
+# Global pre-warm scheduler instance
+prewarm_scheduler = PrewarmScheduler()
@@ -0,0 +1,224 @@
+"""Gateway probe plugins: HTTP, TCP connect, HTTP/2 and batched probes."""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Any
+
+import httpx
+
+from .status_store import status_store
+from .upstream import CircuitOpenError, upstream
+
+
+class Probe(ABC):
+    """Checks whether a service's gateway is up.
+
+    Subclasses implement ``check`` and register in ``PROBE_KINDS``; it
+    returns the gateway status (``reachable``, ``latency_ms``, ``error``)
+    or raises, and ``run`` turns transport errors into an unreachable
+    status the same way for every kind.
+    """
+
+    def __init__(self, prober: "GatewayProber", options: dict[str, Any], timeout: float):
+        self.prober = prober
+        self.options = options
+        self.timeout = timeout
+
+    async def run(self, service_cfg, trial: bool = True) -> dict[str, Any]:
+        try:
+            return await self.check(service_cfg, trial)
+        except CircuitOpenError as e:
+            # Fail fast with the last known state while the breaker is open
+            cached = status_store.get_service(service_cfg.id) or {}
+            return {**cached.get("gateway", {}), "reachable": False, "error": str(e)}
+        except (httpx.TimeoutException, asyncio.TimeoutError):
+            return {"reachable": False, "error": "Timeout"}
+        except (httpx.ConnectError, ConnectionRefusedError):
+            return {"reachable": False, "error": "Connection refused"}
+        except Exception as e:
+            return {"reachable": False, "error": str(e) or type(e).__name__}
+
+    @abstractmethod
+    async def check(self, service_cfg, trial: bool) -> dict[str, Any]:
+        """Probe the gateway once and return its status."""
+
+    def _url(self, service_cfg) -> str:
+        return f"{service_cfg.gateway.url}{self.options.get('path', service_cfg.endpoints.health)}"
+
+
+def _http_status(status_code: int, latency_ms: float) -> dict[str, Any]:
+    if status_code == 200:
+        return {"reachable": True, "latency_ms": latency_ms}
+    return {"reachable": False, "latency_ms": latency_ms, "error": f"HTTP {status_code}"}
+
+
+class HttpProbe(Probe):
+    """GET the gateway's health endpoint (or ``path``) over the shared pool."""
+
+    async def check(self, service_cfg, trial: bool) -> dict[str, Any]:
+        start = time.time()
+        response = await upstream.get(self._url(service_cfg), timeout=self.timeout, probe=trial)
+        return _http_status(response.status_code, round((time.time() - start) * 1000, 2))
+
+
+class TcpProbe(Probe):
+    """Open and close a TCP connection to the gateway; no request is sent."""
+
+    async def check(self, service_cfg, trial: bool) -> dict[str, Any]:
+        gateway = service_cfg.gateway
+        start = time.time()
+        async with upstream.guard(gateway.url, probe=trial):
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(gateway.host, gateway.port), self.timeout
+            )
+            latency_ms = round((time.time() - start) * 1000, 2)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+        return {"reachable": True, "latency_ms": latency_ms}
+
+
+class Http2Probe(Probe):
+    """GET the health endpoint over HTTP/2, multiplexed on one connection per gateway.
+
+    Plain ``http://`` gateways must speak h2c (prior knowledge). Requires
+    the optional ``h2`` package; without it this falls back to HTTP/1.1.
+    """
+
+    async def check(self, service_cfg, trial: bool) -> dict[str, Any]:
+        client = await self.prober.http2_client()
+        if client is None:
+            return await HttpProbe.check(self, service_cfg, trial)
+        url = self._url(service_cfg)
+        start = time.time()
+        async with upstream.guard(url, probe=trial):
+            response = await client.get(url, timeout=self.timeout)
+        return _http_status(response.status_code, round((time.time() - start) * 1000, 2))
+
+
+class BatchProbe(Probe):
+    """One request answers for many services: ``url`` returns a health map.
+
+    Every service pointing at the same ``url`` shares a single request per
+    poll and picks its entry by ``key`` (default: the service ID). The map
+    may be ``{key: status}`` or ``{"targets": {key: status}}``, where a
+    status is a bool, a string such as "ok"/"healthy", or an object with
+    ``healthy``/``reachable``/``status`` and optionally ``latency_ms``.
+    """
+
+    async def check(self, service_cfg, trial: bool) -> dict[str, Any]:
+        url = self.options.get("url")
+        if not url:
+            url = f"{service_cfg.gateway.url}{service_cfg.endpoints.status}"
+        key = self.options.get("key", service_cfg.id)
+        start = time.time()
+        response = await self.prober.fetch_shared(url, self.timeout, trial)
+        latency_ms = round((time.time() - start) * 1000, 2)
+        if response.status_code != 200:
+            return _http_status(response.status_code, latency_ms)
+
+        payload = response.json()
+        targets = payload.get("targets", payload) if isinstance(payload, dict) else {}
+        if key not in targets:
+            return {"reachable": False, "latency_ms": latency_ms, "error": f"No entry for {key}"}
+
+        entry = targets[key]
+        if isinstance(entry, dict):
+            latency_ms = entry.get("latency_ms", latency_ms)
+            entry = entry.get("healthy", entry.get("reachable", entry.get("status")))
+        if isinstance(entry, str):
+            entry = entry.lower() in ("ok", "up", "healthy", "running", "pass")
+        if entry:
+            return {"reachable": True, "latency_ms": latency_ms}
+        return {"reachable": False, "latency_ms": latency_ms, "error": "Reported unhealthy"}
+
+
+PROBE_KINDS: dict[str, type[Probe]] = {
+    "http": HttpProbe,
+    "tcp": TcpProbe,
+    "http2": Http2Probe,
+    "batch": BatchProbe,
+}
+
+
+class GatewayProber:
+    """Runs each service's configured gateway probe for the health checker.
+
+    Probes share the health checker's schedule and ``upstream``'s circuit
+    breakers (HTTP probes also its connection pool; HTTP/2 probes keep
+    their own), and their results land in the status store like any
+    other poll. A probe with ``interval_seconds`` runs at most that often;
+    in between, polls reuse its last result, so a cheap probe can run
+    every poll while a richer one runs every few minutes.
+    """
+
+    def __init__(self):
+        # Per service: when its probe last ran and what it returned
+        self.last: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._shared: dict[str, tuple[int, asyncio.Task]] = {}
+        self._http2: httpx.AsyncClient | None = None
+        self._http2_loop: asyncio.AbstractEventLoop | None = None
+        self._http2_missing = False
+
+    def probe_for(self, service_cfg) -> Probe:
+        # Kinds are validated against PROBE_KIND_NAMES when the config loads
+        probe_cfg = service_cfg.probe
+        return PROBE_KINDS[probe_cfg.kind](self, probe_cfg.options, probe_cfg.timeout_seconds)
+
+    async def check(self, service_cfg, force: bool = False, trial: bool = True) -> dict[str, Any]:
+        """Probe a service's gateway unless its interval hasn't elapsed."""
+        interval = service_cfg.probe.interval_seconds
+        last = self.last.get(service_cfg.id)
+        if not force and interval and last and time.time() - last[0] < interval:
+            return last[1]
+
+        result = await self.probe_for(service_cfg).run(service_cfg, trial)
+        self.last[service_cfg.id] = (time.time(), result)
+        return result
+
+    async def fetch_shared(self, url: str, timeout: float, trial: bool) -> httpx.Response:
+        """GET ``url`` once per poll, however many services ask for it."""
+        poll = status_store.revision
+        shared = self._shared.get(url)
+        if shared is None or shared[0] != poll:
+            task = asyncio.ensure_future(upstream.get(url, timeout=timeout, probe=trial))
+            self._shared[url] = (poll, task)
+            shared = self._shared[url]
+        return await asyncio.shield(shared[1])
+
+    async def http2_client(self) -> httpx.AsyncClient | None:
+        """This prober's HTTP/2 client, or None without the ``h2`` package.
+
+        It is a pool of its own, separate from ``upstream``'s HTTP/1.1 one.
+        """
+        if self._http2_missing:
+            return None
+        loop = asyncio.get_running_loop()
+        if self._http2 is None or self._http2_loop is not loop:
+            if self._http2 is not None:
+                # Bound to a previous event loop; release its sockets
+                try:
+                    await self._http2.aclose()
+                except Exception:
+                    pass
+                self._http2 = None
+            try:
+                self._http2 = httpx.AsyncClient(http1=False, http2=True)
+            except ImportError:
+                print("HTTP/2 probes need the 'h2' package; falling back to HTTP/1.1")
+                self._http2_missing = True
+                return None
+            self._http2_loop = loop
+        return self._http2
+
+    async def aclose(self):
+        """Close the HTTP/2 connection pool."""
+        if self._http2 is not None:
+            await self._http2.aclose()
+            self._http2 = None
+
+
+# Global gateway prober instance
+gateway_prober = GatewayProber()
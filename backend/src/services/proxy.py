@@ -0,0 +1,145 @@
+"""Streaming reverse proxy for gateway endpoints, with a short TTL cache."""
+import time
+from collections.abc import AsyncIterator
+
+from fastapi.responses import Response, StreamingResponse
+
+from ..core import get_config
+from .upstream import upstream
+
+# Headers that describe a single connection and must not be forwarded
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def accepted_encodings(accept_encoding: str) -> set[str]:
+    """Codings an Accept-Encoding header allows; ``q=0`` rules one out."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, *params = (param.strip() for param in part.split(";"))
+        quality = next((param[2:] for param in params if param.startswith("q=")), "1")
+        try:
+            if float(quality) > 0:
+                accepted.add(coding)
+        except ValueError:
+            pass
+    return accepted
+
+
+def normalize_encoding(accept_encoding: str) -> str:
+    """Reduce an Accept-Encoding header to the one coding we ask upstream for.
+
+    Cache entries are keyed by it, so arbitrary client headers map onto at
+    most three variants per URL: br, gzip or identity.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    for coding in ("br", "gzip"):
+        if coding in accepted:
+            return coding
+    return "identity"
+
+
+class ProxyCache:
+    """Raw upstream responses kept for a few seconds.
+
+    Bodies are stored exactly as the upstream sent them (still compressed if
+    it compressed them), so a hit is served without decoding or re-encoding.
+    The cache holds at most ``max_cache_entries`` responses and
+    ``max_cache_total_bytes`` of bodies. Expired entries are swept before
+    the oldest live ones are evicted to make room.
+    """
+
+    def __init__(self):
+        self.entries: dict[tuple[str, str], tuple[float, int, dict[str, str], bytes]] = {}
+        self.total_bytes = 0
+
+    def get(self, key: tuple[str, str]) -> tuple[int, dict[str, str], bytes] | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, status_code, headers, body = entry
+        if expires_at < time.time():
+            self._drop(key)
+            return None
+        return status_code, headers, body
+
+    def put(self, key: tuple[str, str], status_code: int, headers: dict[str, str], body: bytes):
+        config = get_config().proxy
+        if config.cache_ttl_seconds <= 0 or len(body) > config.max_cache_total_bytes:
+            return
+        self._drop(key)
+        if (
+            len(self.entries) >= config.max_cache_entries
+            or self.total_bytes + len(body) > config.max_cache_total_bytes
+        ):
+            now = time.time()
+            for expired in [k for k, e in self.entries.items() if e[0] < now]:
+                self._drop(expired)
+        # Entries are in insertion order, so the first ones expire soonest
+        while self.entries and (
+            len(self.entries) >= config.max_cache_entries
+            or self.total_bytes + len(body) > config.max_cache_total_bytes
+        ):
+            self._drop(next(iter(self.entries)))
+        self.entries[key] = (time.time() + config.cache_ttl_seconds, status_code, headers, body)
+        self.total_bytes += len(body)
+
+    def _drop(self, key: tuple[str, str]):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= len(entry[3])
+
+
+proxy_cache = ProxyCache()
+
+
+async def proxy_get(url: str, accept_encoding: str = "identity") -> Response:
+    """Proxy a GET to an upstream URL, streaming the body through unparsed.
+
+    Upstream transport errors propagate (httpx.ConnectError and friends).
+    """
+    accept_encoding = normalize_encoding(accept_encoding)
+    key = (url, accept_encoding)
+    cached = proxy_cache.get(key)
+    if cached is not None:
+        status_code, headers, body = cached
+        return Response(body, status_code=status_code, headers={**headers, "X-Cache": "HIT"})
+
+    response = await upstream.open_stream(
+        "GET", url, timeout=10.0, headers={"Accept-Encoding": accept_encoding}
+    )
+    headers = {
+        name: value
+        for name, value in response.headers.items()
+        if name.lower() not in HOP_BY_HOP_HEADERS
+    }
+
+    async def body() -> AsyncIterator[bytes]:
+        max_bytes = get_config().proxy.max_cache_bytes
+        chunks: list[bytes] | None = [] if response.status_code == 200 else None
+        size = 0
+        try:
+            async for chunk in response.aiter_raw():
+                if chunks is not None:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        chunks = None
+                    else:
+                        chunks.append(chunk)
+                yield chunk
+        finally:
+            await response.aclose()
+        if chunks is not None:
+            proxy_cache.put(key, response.status_code, headers, b"".join(chunks))
+
+    return StreamingResponse(
+        body(), status_code=response.status_code, headers={**headers, "X-Cache": "MISS"}
+    )
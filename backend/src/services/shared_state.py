@@ -0,0 +1,408 @@
+"""Shared state between dashboard processes (uvicorn --workers N).
+
+Exactly one process, the leader, holds a file lock and runs the health
+checker. It publishes status snapshots and every WebSocket broadcast through
+a state backend; all other processes apply the snapshots to their own status
+store and relay broadcasts to their own WebSocket clients. Broadcasts from
+any process (job progress, batch progress) reach every other process too.
+
+Backends:
+    local  single process, nothing is shared (default)
+    unix   the leader hosts a pub/sub hub on a Unix socket
+    redis  Redis pub/sub (requires the ``redis`` package)
+"""
+import asyncio
+import fcntl
+import json
+import os
+import uuid
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+from ..core import get_config
+from ..ws import ws_manager
+from .alerts import alert_engine
+from .discovery import worker_discovery
+from .events import event_journal
+from .health_checker import health_checker
+from .jobs import job_table
+from .status_store import status_store
+from .synthetic_probes import synthetic_prober
+
+MessageHandler = Callable[[dict[str, Any]], Awaitable[None]]
+LifecycleHook = Callable[[], Awaitable[None]]
+
+# Longest message line on the Unix socket; a full snapshot of a large fleet is one line
+UNIX_STREAM_LIMIT = 256 * 1024 * 1024
+# Messages queued for one follower before it is dropped (it resyncs on reconnect)
+UNIX_PEER_QUEUE_SIZE = 1024
+
+
+class LeaderLock:
+    """Non-blocking exclusive file lock; released when the process exits."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: int | None = None
+
+    def try_acquire(self) -> bool:
+        """Try to become leader. Returns True if the lock is held."""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        """Release the lock if held."""
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class StateBackend:
+    """Transport carrying JSON messages between dashboard processes."""
+
+    def __init__(self, on_message: MessageHandler):
+        self.on_message = on_message
+
+    async def start(self, leader: bool):
+        """Start as the leader or as a follower."""
+
+    async def stop(self):
+        """Stop the transport."""
+
+    async def publish(self, message: dict[str, Any]):
+        """Send a message to every other process."""
+
+    async def store_snapshot(self, snapshot: dict[str, Any]):
+        """Keep the latest snapshot for processes that join later."""
+
+
+class UnixSocketBackend(StateBackend):
+    """Pub/sub hub hosted by the leader on a Unix socket.
+
+    Messages are newline-delimited JSON. The leader relays what a follower
+    sends to every other follower, and sends the latest snapshot to each
+    follower as it connects. Each follower has its own bounded send queue
+    and writer task, so a slow follower never holds up the leader; one
+    that falls ``UNIX_PEER_QUEUE_SIZE`` messages behind is disconnected and
+    catches up from the snapshot when it reconnects.
+    """
+
+    def __init__(self, on_message: MessageHandler, socket_path: str):
+        super().__init__(on_message)
+        self.socket_path = socket_path
+        self._leader = False
+        self._server: asyncio.AbstractServer | None = None
+        self._peers: dict[asyncio.StreamWriter, asyncio.Queue[bytes]] = {}
+        self._upstream: asyncio.StreamWriter | None = None
+        self._task: asyncio.Task | None = None
+        self._snapshot: bytes | None = None
+
+    async def start(self, leader: bool):
+        self._leader = leader
+        if leader:
+            # The leader lock guarantees nobody else is serving on this path
+            Path(self.socket_path).unlink(missing_ok=True)
+            self._server = await asyncio.start_unix_server(
+                self._serve_peer, self.socket_path, limit=UNIX_STREAM_LIMIT
+            )
+        else:
+            self._task = asyncio.create_task(self._follow())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._upstream:
+            self._upstream.close()
+            self._upstream = None
+        if self._server:
+            self._server.close()
+            for writer in list(self._peers):
+                self._drop_peer(writer)
+            self._server = None
+
+    async def publish(self, message: dict[str, Any]):
+        line = json.dumps(message).encode() + b"\n"
+        if self._leader:
+            self._fan_out(line)
+        elif self._upstream is not None:
+            try:
+                self._upstream.write(line)
+                await self._upstream.drain()
+            except (ConnectionError, OSError):
+                self._upstream = None
+
+    async def store_snapshot(self, snapshot: dict[str, Any]):
+        self._snapshot = json.dumps(snapshot).encode() + b"\n"
+
+    async def _serve_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        queue: asyncio.Queue[bytes] = asyncio.Queue(UNIX_PEER_QUEUE_SIZE)
+        if self._snapshot:
+            queue.put_nowait(self._snapshot)
+        self._peers[writer] = queue
+        sender = asyncio.create_task(self._send_to_peer(writer, queue))
+        try:
+            while line := await reader.readline():
+                self._fan_out(line, exclude=writer)
+                await self.on_message(json.loads(line))
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            sender.cancel()
+            self._drop_peer(writer)
+
+    async def _send_to_peer(self, writer: asyncio.StreamWriter, queue: asyncio.Queue[bytes]):
+        try:
+            while True:
+                writer.write(await queue.get())
+                await writer.drain()
+        except (ConnectionError, OSError):
+            self._drop_peer(writer)
+
+    def _fan_out(self, line: bytes, exclude: asyncio.StreamWriter | None = None):
+        for writer, queue in list(self._peers.items()):
+            if writer is exclude:
+                continue
+            try:
+                queue.put_nowait(line)
+            except asyncio.QueueFull:
+                print("Follower too slow, disconnecting it; it resyncs when it reconnects")
+                self._drop_peer(writer)
+
+    def _drop_peer(self, writer: asyncio.StreamWriter):
+        if self._peers.pop(writer, None) is not None:
+            writer.close()
+
+    async def _follow(self):
+        """Stay connected to the leader's hub, reconnecting as needed."""
+        while True:
+            try:
+                reader, self._upstream = await asyncio.open_unix_connection(
+                    self.socket_path, limit=UNIX_STREAM_LIMIT
+                )
+                while line := await reader.readline():
+                    await self.on_message(json.loads(line))
+            except (ConnectionError, OSError, ValueError):
+                pass
+            self._upstream = None
+            await asyncio.sleep(1)
+
+
+class RedisBackend(StateBackend):
+    """Redis (or Redis-compatible) pub/sub backend."""
+
+    def __init__(self, on_message: MessageHandler, url: str, channel: str):
+        super().__init__(on_message)
+        self.url = url
+        self.channel = channel
+        self._redis = None
+        self._task: asyncio.Task | None = None
+
+    async def start(self, leader: bool):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("state.backend 'redis' requires the 'redis' package")
+
+        self._redis = redis.from_url(self.url)
+        if not leader:
+            snapshot = await self._redis.get(f"{self.channel}:snapshot")
+            if snapshot:
+                await self.on_message(json.loads(snapshot))
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, message: dict[str, Any]):
+        await self._redis.publish(self.channel, json.dumps(message))
+
+    async def store_snapshot(self, snapshot: dict[str, Any]):
+        await self._redis.set(f"{self.channel}:snapshot", json.dumps(snapshot))
+
+    async def _listen(self):
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(self.channel)
+        async for item in pubsub.listen():
+            if item.get("type") == "message":
+                try:
+                    await self.on_message(json.loads(item["data"]))
+                except ValueError:
+                    pass
+
+
+class SharedState:
+    """Coordinates leader election, snapshots and broadcast relaying."""
+
+    def __init__(self):
+        self.origin = uuid.uuid4().hex[:8]
+        self.is_leader = False
+        self.backend: StateBackend | None = None
+        self._lock: LeaderLock | None = None
+        self._task: asyncio.Task | None = None
+        self._listening = False
+        self._leader_services: list[tuple[LifecycleHook, LifecycleHook]] = []
+
+    def add_leader_service(self, start: LifecycleHook, stop: LifecycleHook):
+        """Register a background service that only the leader process runs."""
+        self._leader_services.append((start, stop))
+
+    @property
+    def config(self):
+        return get_config().state
+
+    async def start(self):
+        """Start polling (leader) or following the leader."""
+        config = self.config
+        if config.backend == "local":
+            self.is_leader = True
+            await health_checker.start()
+            await self._start_leader_services()
+            return
+
+        if config.backend == "unix":
+            self.backend = UnixSocketBackend(self._on_message, config.socket_path)
+        elif config.backend == "redis":
+            self.backend = RedisBackend(self._on_message, config.redis_url, config.channel)
+        else:
+            raise ValueError(f"Unknown state backend: {config.backend}")
+
+        ws_manager.publisher = self._publish_broadcast
+        self._lock = LeaderLock(config.lock_path)
+        if self._lock.try_acquire():
+            await self._become_leader()
+        else:
+            print(f"Following leader via {config.backend} state backend")
+            await self.backend.start(leader=False)
+            self._task = asyncio.create_task(self._watch_leader())
+
+    async def stop(self):
+        """Stop polling/following and give up leadership."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        await health_checker.stop()
+        if self.is_leader:
+            for _, stop in self._leader_services:
+                await stop()
+        if self.backend:
+            await self.backend.stop()
+        if self._lock:
+            self._lock.release()
+        ws_manager.publisher = None
+
+    async def _become_leader(self):
+        print(f"Elected leader (pid {os.getpid()}), polling services")
+        self.is_leader = True
+        await self.backend.start(leader=True)
+        if not self._listening:
+            health_checker.add_listener(self._publish_snapshot)
+            self._listening = True
+        await health_checker.start()
+        await self._start_leader_services()
+
+    async def _start_leader_services(self):
+        for start, _ in self._leader_services:
+            try:
+                await start()
+            except Exception as e:
+                print(f"Error starting leader service: {e}")
+
+    async def _watch_leader(self):
+        """Take over polling if the leader process goes away."""
+        while True:
+            await asyncio.sleep(self.config.failover_interval_seconds)
+            if self._lock.try_acquire():
+                await self.backend.stop()
+                await self._become_leader()
+                return
+
+    async def _publish_broadcast(
+        self, channel: str, data: dict[str, Any], message_type: str | None
+    ):
+        await self.backend.publish(
+            {
+                "origin": self.origin,
+                "kind": "broadcast",
+                "channel": channel,
+                "message_type": message_type,
+                "data": data,
+            }
+        )
+
+    async def _publish_snapshot(self, statuses: list[dict[str, Any]]):
+        """Health checker listener: share the status store with followers."""
+        snapshot = {
+            "origin": self.origin,
+            "kind": "snapshot",
+            "services": status_store.services,
+            "worker_managers": status_store.worker_managers,
+            "footprints": [[*key, value] for key, value in status_store.footprints.items()],
+            "revision": status_store.revision,
+        }
+        await self.backend.store_snapshot(snapshot)
+        await self.backend.publish(snapshot)
+
+    async def _on_message(self, message: dict[str, Any]):
+        if message.get("origin") == self.origin:
+            return
+
+        if message.get("kind") == "snapshot":
+            # A snapshot is the leader's whole store: what it no longer has is gone
+            for service_id in set(status_store.services) - set(message["services"]):
+                status_store.remove_service(service_id)
+            for url in set(status_store.worker_managers) - set(message["worker_managers"]):
+                status_store.remove_worker_manager(url)
+            for status in message["services"].values():
+                worker_discovery.observe_status(status)
+                status_store.update_service(status)
+            for url, status in message["worker_managers"].items():
+                status_store.update_worker_manager(url, status)
+            for service_id, alias, value in message["footprints"]:
+                key = (service_id, alias)
+                status_store.footprints[key] = max(status_store.footprints.get(key, 0.0), value)
+            # Same revision as the leader, so ETags agree across processes
+            status_store.mark_snapshot(message.get("revision"))
+
+        elif message.get("kind") == "broadcast":
+            if message["message_type"] == "job_update":
+                job_table.record(message["data"])
+            elif message["message_type"] == "alert_update":
+                alert_engine.record(message["data"])
+            elif message["message_type"] == "probe_update":
+                synthetic_prober.record(message["data"])
+            elif message["message_type"] == "event":
+                event_journal.record(message["data"])
+            await ws_manager.deliver(message["channel"], message["data"], message["message_type"])
+
+
+# Global shared state coordinator
+shared_state = SharedState()
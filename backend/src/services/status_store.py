@@ -0,0 +1,234 @@
+"""In-memory status store with incrementally maintained aggregates."""
+import bisect
+import time
+from typing import Any
+
+
+def _state_key(status: dict[str, Any]) -> tuple:
+    """Return the part of a service status that the aggregates depend on."""
+    return (
+        status.get("status"),
+        tuple((w.get("alias"), w.get("status")) for w in status.get("workers", [])),
+    )
+
+
+def _index_keys(status: dict[str, Any]) -> set[tuple]:
+    """Return the filter index entries a service status belongs to."""
+    keys: set[tuple] = {("status", status.get("status", "unknown"))}
+    for worker in status.get("workers", []):
+        worker_type = worker.get("type") or ""
+        worker_status = worker.get("status", "unknown")
+        keys.add(("type", worker_type))
+        keys.add(("worker_status", worker_status))
+        keys.add(("type_worker_status", worker_type, worker_status))
+    return keys
+
+
+class StatusStore:
+    """Latest known status of every service and worker manager.
+
+    Service/worker counters are adjusted whenever a service changes state, so
+    the system overview can be served without walking the registry or calling
+    any upstream.
+    """
+
+    def __init__(self):
+        self.services: dict[str, dict[str, Any]] = {}
+        # Keyed by worker manager URL, since several services may share one
+        self.worker_managers: dict[str, dict[str, Any]] = {}
+        self._service_counts: dict[str, int] = {}
+        self._worker_counts: dict[str, int] = {}
+        self._total_workers = 0
+        # Peak memory seen per (service_id, alias), used for placement planning
+        self.footprints: dict[tuple[str, str], float] = {}
+        self._overview: dict[str, Any] | None = None
+        # Filter index: ("status", s) / ("type", t) / ... -> service IDs
+        self._index: dict[tuple, set[str]] = {}
+        self._index_keys: dict[str, set[tuple]] = {}
+        self.sorted_ids: list[str] = []
+        self.version = 0
+        # Bumped once per complete poll (snapshot), unlike ``version``
+        self.revision = 0
+        # Service writes since that snapshot (live checks, federation, the poll itself)
+        self.edits = 0
+        self.updated_at = time.time()
+
+    def seed(self, service_configs: list) -> None:
+        """Register services with unknown status until their first poll."""
+        for service_cfg in service_configs:
+            if service_cfg.id in self.services:
+                continue
+            self.update_service(
+                {
+                    "service_id": service_cfg.id,
+                    "name": service_cfg.name,
+                    "description": service_cfg.description,
+                    "icon": service_cfg.icon,
+                    "status": "unknown",
+                    "gateway": {"reachable": False},
+                    "workers": [
+                        {"alias": w.alias, "name": w.name, "type": w.type, "status": "unknown"}
+                        for w in service_cfg.workers
+                    ],
+                }
+            )
+
+    def update_service(self, status: dict[str, Any]) -> bool:
+        """Store a service status. Returns True if its state changed."""
+        service_id = status["service_id"]
+        previous = self.services.get(service_id)
+        self.services[service_id] = status
+        self._record_footprints(status)
+        if previous != status:
+            self.edits += 1
+
+        if previous is not None and _state_key(previous) == _state_key(status):
+            return False
+
+        if previous is not None:
+            self._count(previous, -1)
+        else:
+            bisect.insort(self.sorted_ids, service_id)
+        self._count(status, 1)
+        self._reindex(service_id, _index_keys(status))
+        self._changed()
+        return True
+
+    def remove_service(self, service_id: str) -> bool:
+        """Drop a service from the store. Returns True if it was present."""
+        previous = self.services.pop(service_id, None)
+        if previous is None:
+            return False
+        self.edits += 1
+        self._count(previous, -1)
+        self.sorted_ids.pop(bisect.bisect_left(self.sorted_ids, service_id))
+        self._reindex(service_id, set())
+        self._changed()
+        return True
+
+    def update_worker_manager(self, url: str, status: dict[str, Any]) -> bool:
+        """Store a worker manager status. Returns True if its state changed."""
+        previous = self.worker_managers.get(url)
+        if previous is not None:
+            # Keep the first service that registered this worker manager
+            status = {**status, "service_id": previous["service_id"]}
+        self.worker_managers[url] = status
+
+        if previous == status:
+            return False
+        self._changed()
+        return True
+
+    def remove_worker_manager(self, url: str) -> bool:
+        """Drop a worker manager from the store. Returns True if it was present."""
+        if self.worker_managers.pop(url, None) is None:
+            return False
+        self._changed()
+        return True
+
+    def get_service(self, service_id: str) -> dict[str, Any] | None:
+        """Get the last known status of a service."""
+        return self.services.get(service_id)
+
+    def is_worker_running(self, service_id: str, alias: str) -> bool:
+        """Check whether a worker was running at the last poll."""
+        status = self.services.get(service_id) or {}
+        return any(
+            w["alias"] == alias and w.get("status") == "running"
+            for w in status.get("workers", [])
+        )
+
+    def query(
+        self,
+        status: str | None = None,
+        worker_type: str | None = None,
+        worker_status: str | None = None,
+    ) -> set[str] | None:
+        """Get the IDs of services matching every given filter.
+
+        ``worker_type`` and ``worker_status`` together match services with a
+        worker of that type in that status. Returns None if no filter is set.
+        """
+        keys = []
+        if status is not None:
+            keys.append(("status", status))
+        if worker_type is not None and worker_status is not None:
+            keys.append(("type_worker_status", worker_type, worker_status))
+        elif worker_type is not None:
+            keys.append(("type", worker_type))
+        elif worker_status is not None:
+            keys.append(("worker_status", worker_status))
+        if not keys:
+            return None
+
+        matches = sorted((self._index.get(key, set()) for key in keys), key=len)
+        return matches[0].intersection(*matches[1:])
+
+    def get_footprint(self, service_id: str, alias: str) -> float | None:
+        """Get the peak memory a worker has been seen using, in GB."""
+        return self.footprints.get((service_id, alias))
+
+    def overview(self) -> dict[str, Any]:
+        """Get the system overview built from the current aggregates."""
+        if self._overview is None:
+            self._overview = {
+                "timestamp": self.updated_at,
+                "services_count": len(self.services),
+                "healthy_services": self._service_counts.get("healthy", 0),
+                "unhealthy_services": self._service_counts.get("unhealthy", 0),
+                "total_workers": self._total_workers,
+                "running_workers": self._worker_counts.get("running", 0),
+                "worker_managers": list(self.worker_managers.values()),
+            }
+        return self._overview
+
+    def _record_footprints(self, status: dict[str, Any]) -> None:
+        for worker in status.get("workers", []):
+            memory_gb = worker.get("memory_gb")
+            if worker.get("status") == "running" and memory_gb:
+                key = (status["service_id"], worker["alias"])
+                self.footprints[key] = max(self.footprints.get(key, 0.0), memory_gb)
+
+    def _count(self, status: dict[str, Any], delta: int) -> None:
+        state = status.get("status", "unknown")
+        self._service_counts[state] = self._service_counts.get(state, 0) + delta
+        for worker in status.get("workers", []):
+            worker_state = worker.get("status", "unknown")
+            self._worker_counts[worker_state] = self._worker_counts.get(worker_state, 0) + delta
+            self._total_workers += delta
+
+    def _reindex(self, service_id: str, keys: set[tuple]) -> None:
+        previous = self._index_keys.pop(service_id, set())
+        for key in previous - keys:
+            ids = self._index[key]
+            ids.discard(service_id)
+            if not ids:
+                del self._index[key]
+        for key in keys - previous:
+            self._index.setdefault(key, set()).add(service_id)
+        if keys:
+            self._index_keys[service_id] = keys
+
+    def mark_snapshot(self, revision: int | None = None) -> None:
+        """Record that a complete poll of every service has been stored."""
+        self.revision = revision if revision is not None else self.revision + 1
+        self.edits = 0
+
+    @property
+    def content_revision(self) -> str:
+        """Label of the current service statuses, for ETags and response caching.
+
+        It changes with every service write, including live checks and
+        federated peers between polls. Right after a snapshot it is the same
+        in every process.
+        """
+        return f"{self.revision}.{self.edits}"
+
+    def _changed(self) -> None:
+        self.version += 1
+        self.updated_at = time.time()
+        self._overview = None
+
+
+# Global status store instance
+status_store = StatusStore()
@@ -0,0 +1,258 @@
+"""Synthetic inference probes: time a tiny real request per worker type."""
+import asyncio
+import io
+import time
+import wave
+from collections import deque
+from typing import Any
+
+from ..core import ServiceRegistry, get_config
+from ..ws import ws_manager
+from .status_store import status_store
+from .upstream import upstream
+
+# 1x1 white PNG
+TINY_PNG_BASE64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8/x8AAwMCAO+ip1sAAAAASUVORK5CYII="
+)
+
+# Sent with every probe so gateways that support it can leave probes out of idle tracking
+PROBE_HEADERS = {"X-Synthetic-Probe": "1"}
+# Tolerance when matching a worker's last request time against a probe's
+PROBE_MATCH_SLACK_SECONDS = 2.0
+
+# Built-in probes for OpenAI-compatible gateways, by worker type
+DEFAULT_PROBES: dict[str, dict[str, Any]] = {
+    "llm": {"path": "/v1/chat/completions", "request": "chat"},
+    "vlm": {"path": "/v1/chat/completions", "request": "chat_image"},
+    "tts": {"path": "/v1/audio/speech", "request": "speech"},
+    "stt": {"path": "/v1/audio/transcriptions", "request": "transcription"},
+}
+
+
+def _silent_wav(seconds: float = 0.5, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\0\0" * int(seconds * rate))
+    return buffer.getvalue()
+
+
+class SyntheticProber:
+    """Sends a minimal inference request to idle running workers at low frequency.
+
+    A gateway answering /healthz says nothing about how long a VLM or STT
+    worker takes to answer, so every ``interval_seconds`` each running
+    worker of a probed type that has been idle for ``min_idle_seconds``
+    gets one tiny request (one token, a 1x1 image, half a second of
+    silence). Probes never start workers, at most ``max_concurrent`` run at
+    once, and payloads are built once per type. Latencies are kept per
+    worker and published as ``probe_update`` on the workers channel.
+
+    A probe is a real request, so the worker manager resets the worker's
+    ``idle_seconds``. That would keep probed workers from ever reaching
+    their idle TTL (eviction) and count them as in demand (pre-warming).
+    ``effective_idle`` undoes this: when the last request a worker saw
+    is our probe, idle time keeps counting from the last real request.
+    The poller applies it to everything it records. Probes also carry
+    ``X-Synthetic-Probe: 1`` for gateways that can ignore them directly.
+    """
+
+    def __init__(self, history_size: int = 100):
+        self.history: dict[tuple[str, str], deque[dict[str, Any]]] = {}
+        self.history_size = history_size
+        self._payloads: dict[str, dict[str, Any]] = {}
+        # Per worker: last probe's start and end, and when its last real request was
+        self._probed: dict[tuple[str, str], tuple[float, float, float | None]] = {}
+        self._task: asyncio.Task | None = None
+
+    @property
+    def config(self):
+        return get_config().synthetic_probes
+
+    async def start(self):
+        """Start the probe loop."""
+        if self.config.enabled and self._task is None:
+            self._task = asyncio.create_task(self._probe_loop())
+
+    async def stop(self):
+        """Stop the probe loop."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def probe_for(self, worker_type: str) -> dict[str, Any] | None:
+        """Get the probe definition for a worker type (config overrides built-ins)."""
+        probe = self.config.types.get(worker_type, DEFAULT_PROBES.get(worker_type))
+        if probe is None or probe.get("enabled") is False:
+            return None
+        return probe
+
+    def effective_idle(
+        self, service_id: str | None, alias: str, reported: float | None
+    ) -> float | None:
+        """A worker's idle time as reported, not counting our own probes."""
+        key = (service_id, alias)
+        probed = self._probed.get(key)
+        if reported is None or probed is None:
+            return reported
+        started, finished, last_real = probed
+        now = time.time()
+        if now - reported > finished + PROBE_MATCH_SLACK_SECONDS:
+            # Real traffic since the probe; the manager's figure is right again
+            del self._probed[key]
+            return reported
+        if last_real is None:
+            return reported
+        return max(reported, round(now - last_real, 1))
+
+    def record(self, result: dict[str, Any]):
+        """Keep a probe result in the worker's latency history."""
+        key = (result["service_id"], result["alias"])
+        if key not in self.history:
+            self.history[key] = deque(maxlen=self.history_size)
+        self.history[key].append(result)
+
+    def summary(self) -> list[dict[str, Any]]:
+        """Last result and median latency of every probed worker."""
+        rows = []
+        for (service_id, alias), results in self.history.items():
+            latencies = sorted(r["latency_ms"] for r in results if r["ok"])
+            rows.append(
+                {
+                    "service_id": service_id,
+                    "alias": alias,
+                    "last": results[-1],
+                    "samples": len(results),
+                    "p50_latency_ms": latencies[len(latencies) // 2] if latencies else None,
+                    "history": list(results),
+                }
+            )
+        return rows
+
+    async def probe(self, service_cfg, worker_cfg) -> dict[str, Any]:
+        """Send one synthetic request to a worker through its gateway."""
+        probe = self.probe_for(worker_cfg.type)
+        last_real = self._last_real_request(service_cfg.id, worker_cfg.alias)
+        start = time.time()
+        result = {
+            "timestamp": start,
+            "service_id": service_cfg.id,
+            "alias": worker_cfg.alias,
+            "type": worker_cfg.type,
+            "ok": False,
+            "latency_ms": None,
+            "error": None,
+        }
+        try:
+            response = await upstream.post(
+                f"{service_cfg.gateway.url}{probe['path']}",
+                timeout=self.config.timeout_seconds,
+                headers=PROBE_HEADERS,
+                # Slow inference must not open the gateway's breaker for the health checker
+                passive=True,
+                **self._request_kwargs(worker_cfg, probe),
+            )
+            result["latency_ms"] = round((time.time() - start) * 1000, 2)
+            result["ok"] = response.status_code == 200
+            if not result["ok"]:
+                result["error"] = f"HTTP {response.status_code}"
+        except Exception as e:
+            result["error"] = str(e) or type(e).__name__
+
+        self._probed[(service_cfg.id, worker_cfg.alias)] = (start, time.time(), last_real)
+        self.record(result)
+        await ws_manager.broadcast("workers", result, message_type="probe_update")
+        return result
+
+    def _last_real_request(self, service_id: str, alias: str) -> float | None:
+        """When a worker last served real traffic, from the (corrected) status store."""
+        status = status_store.get_service(service_id) or {}
+        for worker in status.get("workers", []):
+            if worker["alias"] == alias and worker.get("idle_seconds") is not None:
+                return status.get("timestamp", time.time()) - worker["idle_seconds"]
+        return None
+
+    def _request_kwargs(self, worker_cfg, probe: dict[str, Any]) -> dict[str, Any]:
+        """Build the request for a probe; the payload is built once per type."""
+        payload = self._payloads.get(worker_cfg.type)
+        if payload is None:
+            payload = self._build_payload(probe)
+            self._payloads[worker_cfg.type] = payload
+
+        if "files" in payload:
+            data = {**payload["data"], "model": worker_cfg.alias}
+            return {"files": payload["files"], "data": data}
+        return {"json": {**payload["json"], "model": worker_cfg.alias}}
+
+    def _build_payload(self, probe: dict[str, Any]) -> dict[str, Any]:
+        if "payload" in probe:
+            return {"json": probe["payload"]}
+
+        request = probe.get("request")
+        if request == "chat":
+            return {"json": {"max_tokens": 1, "messages": [{"role": "user", "content": "ok"}]}}
+        if request == "chat_image":
+            image_url = f"data:image/png;base64,{TINY_PNG_BASE64}"
+            return {
+                "json": {
+                    "max_tokens": 1,
+                    "messages": [
+                        {
+                            "role": "user",
+                            "content": [
+                                {"type": "text", "text": "ok"},
+                                {"type": "image_url", "image_url": {"url": image_url}},
+                            ],
+                        }
+                    ],
+                }
+            }
+        if request == "speech":
+            return {"json": {"input": "ok"}}
+        if request == "transcription":
+            return {"files": {"file": ("probe.wav", _silent_wav(), "audio/wav")}, "data": {}}
+        raise ValueError(f"Unknown synthetic probe request: {request}")
+
+    def _due(self) -> list[tuple[Any, Any]]:
+        """Running, idle workers of a probed type."""
+        due = []
+        for service_cfg in ServiceRegistry().list_services():
+            status = status_store.get_service(service_cfg.id) or {}
+            idle = {
+                w["alias"]: w.get("idle_seconds")
+                for w in status.get("workers", [])
+                if w.get("status") == "running"
+            }
+            for worker_cfg in service_cfg.workers:
+                if worker_cfg.alias not in idle or self.probe_for(worker_cfg.type) is None:
+                    continue
+                idle_seconds = idle[worker_cfg.alias]
+                # Unknown idle time: the manager doesn't report it, so probe anyway
+                if idle_seconds is None or idle_seconds >= self.config.min_idle_seconds:
+                    due.append((service_cfg, worker_cfg))
+        return due
+
+    async def _probe_loop(self):
+        while True:
+            try:
+                semaphore = asyncio.Semaphore(self.config.max_concurrent)
+
+                async def run(service_cfg, worker_cfg):
+                    async with semaphore:
+                        await self.probe(service_cfg, worker_cfg)
+
+                await asyncio.gather(*(run(*item) for item in self._due()))
+            except Exception as e:
+                print(f"Error in synthetic probes: {e}")
+            await asyncio.sleep(self.config.interval_seconds)
+
+
+# Global synthetic prober instance
+synthetic_prober = SyntheticProber()
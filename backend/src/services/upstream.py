@@ -0,0 +1,205 @@
+"""Shared HTTP client for gateways and worker managers, with circuit breakers."""
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..core import get_config
+
+# The only errors that mean a target is down; once connected, it is up however slow
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+
+class CircuitOpenError(httpx.ConnectError):
+    """Raised instead of calling a target whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one upstream target.
+
+    After ``failure_threshold`` consecutive connection failures the breaker
+    opens and calls fail fast. Once ``recovery_timeout_seconds`` have passed,
+    a single probe call (from the health checker) is let through as a trial;
+    its outcome closes the breaker or opens it again. Hosts no probe reaches
+    (gateways behind a batch probe, federation peers) would stay open for
+    good, so after twice the timeout any call may be the trial.
+    """
+
+    def __init__(self, target: str, failure_threshold: int, recovery_timeout_seconds: float):
+        self.target = target
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_seconds = recovery_timeout_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    def allow(self, probe: bool = False) -> bool:
+        """Check whether a call may go through."""
+        if self.state == "closed":
+            return True
+        # Probes get first claim on the trial
+        wait = self.recovery_timeout_seconds * (1 if probe else 2)
+        if time.time() - self.opened_at < wait or self._trial_in_flight:
+            return False
+        self.state = "half_open"
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                print(f"Circuit opened for {self.target} after {self.failures} failure(s)")
+            self.state = "open"
+            self.opened_at = time.time()
+
+    def abort_trial(self):
+        """Forget a trial call that ended without a result (e.g. cancelled)."""
+        self._trial_in_flight = False
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "target": self.target,
+            "state": self.state,
+            "failures": self.failures,
+            "opened_at": self.opened_at,
+        }
+
+
+class UpstreamClient:
+    """Pooled client used for every call to gateways and worker managers.
+
+    Any HTTP response counts as success for the breaker (the host is up);
+    only failing to connect (refused, unreachable, connect timeout) counts
+    as a failure. A slow or cut-off response is not a dead host: a spawn
+    can take minutes. Neither is waiting for a free pooled connection
+    (``PoolTimeout``), which is our own congestion.
+    """
+
+    def __init__(self):
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+            self._loop = loop
+        return self._client
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Get the breaker for the host:port a URL points at."""
+        parts = urlsplit(url)
+        target = f"{parts.hostname}:{parts.port or (443 if parts.scheme == 'https' else 80)}"
+        breaker = self.breakers.get(target)
+        if breaker is None:
+            config = get_config().circuit_breaker
+            breaker = CircuitBreaker(
+                target, config.failure_threshold, config.recovery_timeout_seconds
+            )
+            self.breakers[target] = breaker
+        return breaker
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float,
+        probe: bool = False,
+        passive: bool = False,
+        **kwargs,
+    ) -> httpx.Response:
+        """Send a request through the target's circuit breaker.
+
+        A ``passive`` request is refused while the breaker isn't closed but
+        never affects it: how long an inference takes says nothing about
+        whether the host is up.
+        """
+        breaker = self.breaker(url)
+        if passive:
+            if breaker.state != "closed":
+                raise CircuitOpenError(f"Circuit open for {breaker.target}")
+            return await self.client.request(method, url, timeout=timeout, **kwargs)
+        if not breaker.allow(probe):
+            raise CircuitOpenError(f"Circuit open for {breaker.target}")
+        try:
+            response = await self.client.request(method, url, timeout=timeout, **kwargs)
+        except CONNECT_ERRORS:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abort_trial()
+            raise
+        breaker.record_success()
+        return response
+
+    @asynccontextmanager
+    async def guard(self, url: str, probe: bool = False) -> AsyncIterator[None]:
+        """Run a non-httpx call (TCP connect, HTTP/2 client) through a URL's breaker."""
+        breaker = self.breaker(url)
+        if not breaker.allow(probe):
+            raise CircuitOpenError(f"Circuit open for {breaker.target}")
+        try:
+            yield
+        except (*CONNECT_ERRORS, OSError, asyncio.TimeoutError):
+            # Raw sockets only time out or fail while connecting
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abort_trial()
+            raise
+        breaker.record_success()
+
+    async def open_stream(
+        self, method: str, url: str, *, timeout: float, **kwargs
+    ) -> httpx.Response:
+        """Send a request and return the response with its body unread.
+
+        The caller must ``aclose()`` the response.
+        """
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {breaker.target}")
+        request = self.client.build_request(method, url, timeout=timeout, **kwargs)
+        try:
+            response = await self.client.send(request, stream=True)
+        except CONNECT_ERRORS:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abort_trial()
+            raise
+        breaker.record_success()
+        return response
+
+    async def get(self, url: str, *, timeout: float, probe: bool = False, **kwargs):
+        return await self.request("GET", url, timeout=timeout, probe=probe, **kwargs)
+
+    async def post(self, url: str, *, timeout: float, **kwargs):
+        return await self.request("POST", url, timeout=timeout, **kwargs)
+
+    async def aclose(self):
+        """Close pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+# Global upstream client instance
+upstream = UpstreamClient()
@@ -0,0 +1,137 @@
+"""Worker control actions forwarded to worker managers and gateways."""
+from typing import Any
+
+import httpx
+
+from .upstream import upstream
+
+ACTIONS = ("spawn", "stop", "evict")
+# Alias recorded for actions on every worker of a service
+ALL_WORKERS = "*"
+
+
+class WorkerActionError(Exception):
+    """Raised when the upstream handling a worker action cannot be reached."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+async def spawn_worker(service_cfg, alias: str) -> dict[str, Any]:
+    """Start/spawn a worker through the worker manager."""
+    try:
+        response = await upstream.post(
+            f"{service_cfg.worker_manager.url}/spawn/{alias}", timeout=120.0
+        )
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "message": f"Worker '{alias}' spawned successfully",
+                "worker_alias": alias,
+                "action": "spawn",
+                "data": response.json(),
+            }
+        return {
+            "success": False,
+            "message": f"Failed to spawn worker: HTTP {response.status_code}",
+            "worker_alias": alias,
+            "action": "spawn",
+            "data": response.json() if response.content else None,
+        }
+    except httpx.TimeoutException:
+        raise WorkerActionError(504, "Worker spawn timeout")
+    except httpx.ConnectError:
+        raise WorkerActionError(503, "Worker manager not reachable")
+
+
+async def stop_worker(service_cfg, alias: str) -> dict[str, Any]:
+    """Stop a worker through the worker manager."""
+    try:
+        response = await upstream.post(
+            f"{service_cfg.worker_manager.url}/stop/{alias}", timeout=30.0
+        )
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "message": f"Worker '{alias}' stopped successfully",
+                "worker_alias": alias,
+                "action": "stop",
+            }
+        return {
+            "success": False,
+            "message": f"Failed to stop worker: HTTP {response.status_code}",
+            "worker_alias": alias,
+            "action": "stop",
+        }
+    except httpx.TimeoutException:
+        raise WorkerActionError(504, "Worker stop timeout")
+    except httpx.ConnectError:
+        raise WorkerActionError(503, "Worker manager not reachable")
+
+
+async def evict_worker(service_cfg, alias: str) -> dict[str, Any]:
+    """Force evict a worker through the gateway."""
+    evict_url = service_cfg.endpoints.evict.replace("{alias}", alias)
+
+    try:
+        response = await upstream.post(f"{service_cfg.gateway.url}{evict_url}", timeout=30.0)
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "message": f"Worker '{alias}' evicted successfully",
+                "worker_alias": alias,
+                "action": "evict",
+            }
+        return {
+            "success": False,
+            "message": f"Failed to evict worker: HTTP {response.status_code}",
+            "worker_alias": alias,
+            "action": "evict",
+        }
+    except httpx.TimeoutException:
+        raise WorkerActionError(504, "Worker evict timeout")
+    except httpx.ConnectError:
+        raise WorkerActionError(503, "Gateway not reachable")
+
+
+async def stop_all_workers(service_cfg, alias: str = ALL_WORKERS) -> dict[str, Any]:
+    """Stop every worker of a service through the worker manager."""
+    try:
+        response = await upstream.post(
+            f"{service_cfg.worker_manager.url}/stop-all", timeout=30.0
+        )
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "message": "All workers stopped",
+                "worker_alias": alias,
+                "action": "stop-all",
+            }
+        return {
+            "success": False,
+            "message": f"Failed: HTTP {response.status_code}",
+            "worker_alias": alias,
+            "action": "stop-all",
+        }
+    except httpx.TimeoutException:
+        raise WorkerActionError(504, "Worker stop-all timeout")
+    except httpx.ConnectError:
+        raise WorkerActionError(503, "Worker manager not reachable")
+
+
+_HANDLERS = {
+    "spawn": spawn_worker,
+    "stop": stop_worker,
+    "evict": evict_worker,
+    "stop-all": stop_all_workers,
+}
+
+
+async def run_action(service_cfg, alias: str, action: str) -> dict[str, Any]:
+    """Run a worker action by name."""
+    handler = _HANDLERS.get(action)
+    if handler is None:
+        raise ValueError(f"Unknown worker action: {action}")
+    return await handler(service_cfg, alias)
@@ -3,13 +3,25 @@ import asyncio
 import json
 import time
 import uuid
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from fastapi import WebSocket, WebSocketDisconnect
 
+# Slots of the heartbeat timer wheel; one slot is visited per interval / slots
+HEARTBEAT_WHEEL_SLOTS = 16
+
 
 class WebSocketManager:
-    """Manages WebSocket connections and broadcasts."""
+    """Manages WebSocket connections and broadcasts.
+
+    A single heartbeat task walks a timer wheel: each connection sits in
+    the slot visited one heartbeat interval after it connected, so pings
+    are spread over the interval instead of sent in one burst. Clients
+    answer ``heartbeat`` with ``heartbeat_ack``, which gives the
+    round-trip time; any message counts as a sign of life. Connections
+    silent for ``max_missed`` heartbeats in a row are closed and dropped.
+    """
 
     def __init__(self):
         self.connections: dict[str, WebSocket] = {}
@@ -17,14 +29,37 @@ class WebSocketManager:
             "services": set(),
             "workers": set(),
             "memory": set(),
+            "alerts": set(),
+            "events": set(),
             "all": set(),
         }
+        # Forwards broadcasts to other dashboard processes when state is shared
+        self.publisher: Callable[[str, dict[str, Any], str | None], Awaitable[None]] | None = None
+        # Per connection: connected_at, last_seen, heartbeat seq/sent time, missed, rtt_ms
+        self.peers: dict[str, dict[str, Any]] = {}
+        self._wheel: list[set[str]] = [set() for _ in range(HEARTBEAT_WHEEL_SLOTS)]
+        self._wheel_position = 0
+        self._heartbeat_task: asyncio.Task | None = None
+        self._heartbeat_sends: set[asyncio.Task] = set()
 
     async def connect(self, websocket: WebSocket) -> str:
         """Accept a new WebSocket connection and return its ID."""
         await websocket.accept()
         connection_id = str(uuid.uuid4())[:8]
         self.connections[connection_id] = websocket
+        # Due one full turn of the wheel from now
+        slot = (self._wheel_position - 1) % HEARTBEAT_WHEEL_SLOTS
+        self._wheel[slot].add(connection_id)
+        self.peers[connection_id] = {
+            "connected_at": time.time(),
+            "last_seen": time.monotonic(),
+            "slot": slot,
+            "seq": 0,
+            "sent_at": None,
+            "missed": 0,
+            "rtt_ms": None,
+            "sending": None,
+        }
         # Auto-subscribe to 'all' by default
         self.subscriptions["all"].add(connection_id)
         return connection_id
@@ -34,6 +69,10 @@ class WebSocketManager:
         if connection_id in self.connections:
             del self.connections[connection_id]
 
+        peer = self.peers.pop(connection_id, None)
+        if peer is not None:
+            self._wheel[peer["slot"]].discard(connection_id)
+
         # Remove from all subscriptions
         for channel_subs in self.subscriptions.values():
             channel_subs.discard(connection_id)
@@ -60,10 +99,23 @@ class WebSocketManager:
             except Exception:
                 await self.disconnect(connection_id)
 
-    async def broadcast(self, channel: str, data: dict[str, Any]):
-        """Broadcast a message to all subscribers of a channel."""
+    async def broadcast(
+        self, channel: str, data: dict[str, Any], message_type: str | None = None
+    ):
+        """Broadcast a message to all subscribers of a channel, in every process."""
+        if self.publisher is not None:
+            try:
+                await self.publisher(channel, data, message_type)
+            except Exception as e:
+                print(f"Error publishing broadcast: {e}")
+        await self.deliver(channel, data, message_type)
+
+    async def deliver(
+        self, channel: str, data: dict[str, Any], message_type: str | None = None
+    ):
+        """Send a message to this process's subscribers of a channel."""
         message = {
-            "type": f"{channel}_update",
+            "type": message_type or f"{channel}_update",
             "timestamp": time.time(),
             "data": data,
         }
@@ -106,8 +158,15 @@ class WebSocketManager:
     async def handle_message(self, connection_id: str, message: dict[str, Any]):
         """Handle incoming WebSocket messages."""
         msg_type = message.get("type")
+        peer = self.peers.get(connection_id)
+        if peer is not None:
+            peer["last_seen"] = time.monotonic()
 
-        if msg_type == "subscribe":
+        if msg_type == "heartbeat_ack":
+            if peer is not None and message.get("seq") == peer["seq"] and peer["sent_at"]:
+                peer["rtt_ms"] = round((peer["last_seen"] - peer["sent_at"]) * 1000, 2)
+
+        elif msg_type == "subscribe":
             channel = message.get("channel", "all")
             self.subscribe(connection_id, channel)
             await self.send_to(
@@ -128,6 +187,118 @@ class WebSocketManager:
                 connection_id, {"type": "pong", "timestamp": time.time()}
             )
 
+    async def start_heartbeat(self, interval_seconds: float, max_missed: int = 2):
+        """Start pinging every connection each ``interval_seconds`` (0 disables)."""
+        if interval_seconds > 0 and self._heartbeat_task is None:
+            self._heartbeat_task = asyncio.create_task(
+                self._heartbeat_loop(interval_seconds, max_missed)
+            )
+
+    async def stop_heartbeat(self):
+        """Stop the heartbeat task."""
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+        for task in list(self._heartbeat_sends):
+            task.cancel()
+
+    def connection_stats(self) -> list[dict[str, Any]]:
+        """Liveness and round-trip time of every connection."""
+        now = time.monotonic()
+        return [
+            {
+                "connection_id": connection_id,
+                "connected_at": peer["connected_at"],
+                "idle_seconds": round(now - peer["last_seen"], 2),
+                "rtt_ms": peer["rtt_ms"],
+                "missed_heartbeats": peer["missed"],
+                "channels": sorted(
+                    channel
+                    for channel, subscribers in self.subscriptions.items()
+                    if connection_id in subscribers
+                ),
+            }
+            for connection_id, peer in self.peers.items()
+        ]
+
+    async def _heartbeat_loop(self, interval_seconds: float, max_missed: int):
+        tick = interval_seconds / HEARTBEAT_WHEEL_SLOTS
+        # Ticks are scheduled against fixed deadlines, so slow steps don't add up
+        deadline = time.monotonic()
+        while True:
+            deadline += tick
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Fell behind (e.g. a blocked loop): resync instead of catching up in a burst
+                deadline = time.monotonic()
+            due = list(self._wheel[self._wheel_position])
+            self._wheel_position = (self._wheel_position + 1) % HEARTBEAT_WHEEL_SLOTS
+            for connection_id in due:
+                self._heartbeat(connection_id, interval_seconds, max_missed)
+
+    def _heartbeat(self, connection_id: str, timeout: float, max_missed: int):
+        """Ping one connection, or drop it after ``max_missed`` silent intervals.
+
+        Sends and reaps run as tasks so a stalled peer never holds up the wheel.
+        """
+        peer = self.peers.get(connection_id)
+        websocket = self.connections.get(connection_id)
+        if peer is None or websocket is None:
+            return
+
+        if peer["sent_at"] is not None and peer["last_seen"] < peer["sent_at"]:
+            peer["missed"] += 1
+        else:
+            peer["missed"] = 0
+        if peer["missed"] >= max_missed:
+            self._spawn(self._reap(connection_id, websocket))
+            return
+        if peer["sending"] is not None and not peer["sending"].done():
+            # Still stuck on the last heartbeat; it counts as missed next time
+            return
+
+        peer["seq"] += 1
+        peer["sent_at"] = time.monotonic()
+        message = {
+            "type": "heartbeat",
+            "timestamp": time.time(),
+            "data": {"seq": peer["seq"], "rtt_ms": peer["rtt_ms"]},
+        }
+        peer["sending"] = self._spawn(
+            self._send_heartbeat(connection_id, websocket, message, timeout)
+        )
+
+    async def _send_heartbeat(
+        self, connection_id: str, websocket: WebSocket, message: dict[str, Any], timeout: float
+    ):
+        try:
+            # A stalled peer can block a send once its buffers fill up
+            await asyncio.wait_for(websocket.send_json(message), timeout)
+        except Exception:
+            await self._reap(connection_id, websocket)
+
+    def _spawn(self, coro: Awaitable[None]) -> asyncio.Task:
+        task = asyncio.ensure_future(coro)
+        self._heartbeat_sends.add(task)
+        task.add_done_callback(self._heartbeat_sends.discard)
+        return task
+
+    async def _reap(self, connection_id: str, websocket: WebSocket):
+        if connection_id not in self.connections:
+            return
+        print(f"WebSocket unresponsive, closing: {connection_id}")
+        await self.disconnect(connection_id)
+        try:
+            await asyncio.wait_for(websocket.close(code=1001), 1.0)
+        except Exception:
+            pass
+
     @property
     def connection_count(self) -> int:
         """Get the number of active connections."""
@@ -0,0 +1,123 @@
+"""Shared fixtures: every test runs against its own default configuration."""
+import asyncio
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from src.api import (
+    events_router,
+    jobs_router,
+    models_router,
+    services_router,
+    system_router,
+    workers_batch_router,
+    workers_router,
+)
+from src.core import config as config_module
+from src.core.config import (
+    DashboardConfig,
+    DashboardSettings,
+    EndpointsConfig,
+    EventsConfig,
+    GatewayConfig,
+    PollingConfig,
+    ServiceConfig,
+    WebSocketConfig,
+    WorkerConfig,
+    WorkerManagerConfig,
+)
+from src.services.admission import admission_controller
+from src.services.edge_cache import edge_cache
+from src.services.jobs import job_table
+from src.services.proxy import proxy_cache
+from src.services.status_store import status_store
+from src.services.upstream import upstream
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch) -> DashboardConfig:
+    """Default configuration with no services and the event journal under tmp_path."""
+    cfg = DashboardConfig(
+        dashboard=DashboardSettings(),
+        services={},
+        polling=PollingConfig(),
+        websocket=WebSocketConfig(),
+        events=EventsConfig(path=str(tmp_path / "events")),
+    )
+    monkeypatch.setattr(config_module, "_config", cfg)
+    return cfg
+
+
+@pytest.fixture(autouse=True)
+def fresh_singletons():
+    """Process-wide state (store, jobs, admission, caches); start every test empty."""
+    singletons = (status_store, job_table, admission_controller, edge_cache, proxy_cache)
+    for singleton in singletons:
+        singleton.__init__()
+    yield
+    for singleton in singletons:
+        singleton.__init__()
+
+
+@pytest.fixture
+def api(config):
+    """An ASGI client for the API routers, without the lifespan (no poller, no leader)."""
+    app = FastAPI()
+    for router in (
+        services_router,
+        workers_router,
+        workers_batch_router,
+        system_router,
+        jobs_router,
+        models_router,
+        events_router,
+    ):
+        app.include_router(router)
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://dashboard")
+
+
+@pytest.fixture
+def add_service(config):
+    """Register a service in the test config: ``add_service(id, workers={alias: type})``."""
+
+    def add(
+        service_id: str = "svc",
+        workers: dict[str, str] | None = None,
+        gateway_port: int = 8000,
+        manager_port: int = 8100,
+    ) -> ServiceConfig:
+        service_cfg = ServiceConfig(
+            id=service_id,
+            name=service_id,
+            description="",
+            icon="",
+            gateway=GatewayConfig(host=f"{service_id}-gw", port=gateway_port),
+            worker_manager=WorkerManagerConfig(host=f"{service_id}-wm", port=manager_port),
+            endpoints=EndpointsConfig(),
+            workers=[
+                WorkerConfig(alias=alias, name=alias, type=worker_type)
+                for alias, worker_type in (workers or {}).items()
+            ],
+        )
+        config.services[service_id] = service_cfg
+        return service_cfg
+
+    return add
+
+
+@pytest.fixture
+def mock_upstream(config, monkeypatch):
+    """Route the shared upstream client through an ``httpx.MockTransport`` handler.
+
+    Call the returned function inside the event loop that sends the requests.
+    """
+    monkeypatch.setattr(upstream, "breakers", {})
+
+    def install(handler):
+        upstream._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        upstream._loop = asyncio.get_running_loop()
+
+    yield install
+    upstream._client = None
+    upstream._loop = None
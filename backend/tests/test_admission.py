@@ -0,0 +1,172 @@
+"""Admission control: token buckets, per-client rate limits and client addresses."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.services.admission import (
+    MAX_TRACKED_CLIENTS,
+    AdmissionController,
+    RateLimitExceeded,
+    TokenBucket,
+)
+from src.services.jobs import job_table
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_burst_then_refills(clock):
+    bucket = TokenBucket(rate=0.5, burst=3)
+    assert [bucket.take() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.take() == pytest.approx(2.0)
+
+    clock[0] += 2
+    assert bucket.take() == 0.0
+    clock[0] += 3600
+    assert bucket.is_full()
+    assert bucket.take(3) == 0.0
+
+
+def test_bucket_reports_charges_that_can_never_pass(clock):
+    assert TokenBucket(rate=1, burst=3).take(4) == float("inf")
+    bucket = TokenBucket(rate=0, burst=1)
+    assert bucket.take() == 0.0
+    assert bucket.take() == float("inf")
+
+
+def test_check_rate_limits_each_client(config, clock):
+    config.admission.rate_per_minute = 60
+    config.admission.burst = 2
+    controller = AdmissionController()
+
+    controller.check_rate("10.0.0.1")
+    controller.check_rate("10.0.0.1")
+    with pytest.raises(RateLimitExceeded) as exc_info:
+        controller.check_rate("10.0.0.1")
+    assert exc_info.value.retry_after == pytest.approx(1.0)
+    # Other clients have their own budget
+    controller.check_rate("10.0.0.2", cost=2)
+
+    clock[0] += 1
+    controller.check_rate("10.0.0.1")
+
+
+def test_check_rate_charges_cost(config, clock):
+    config.admission.burst = 5
+    controller = AdmissionController()
+    controller.check_rate("client", cost=4)
+    with pytest.raises(RateLimitExceeded):
+        controller.check_rate("client", cost=2)
+    controller.check_rate("client", cost=1)
+
+
+def test_check_rate_disabled(config, clock):
+    config.admission.enabled = False
+    config.admission.burst = 1
+    controller = AdmissionController()
+    for _ in range(10):
+        controller.check_rate("client")
+    assert controller.buckets == {}
+
+
+def test_idle_clients_are_forgotten(config, clock):
+    controller = AdmissionController()
+    for i in range(MAX_TRACKED_CLIENTS):
+        controller.check_rate(f"client-{i}")
+    clock[0] += 3600
+    controller.check_rate("newcomer")
+    assert set(controller.buckets) == {"newcomer"}
+
+
+@pytest.mark.parametrize(
+    "peer, forwarded_for, real_ip, expected",
+    [
+        # Headers from untrusted peers are ignored
+        ("203.0.113.5", "198.51.100.1", "198.51.100.2", "203.0.113.5"),
+        ("172.28.0.10", None, None, "172.28.0.10"),
+        ("172.28.0.10", None, "198.51.100.2", "198.51.100.2"),
+        ("172.28.0.10", "198.51.100.1", "198.51.100.2", "198.51.100.1"),
+        # A client-supplied entry left of the real hop does not win
+        ("172.28.0.10", "1.2.3.4, 198.51.100.1", None, "198.51.100.1"),
+        ("172.28.0.10", "198.51.100.1, 10.1.2.3", None, "198.51.100.1"),
+        ("172.28.0.10", "10.1.2.3, 10.4.5.6", None, "10.1.2.3"),
+    ],
+)
+def test_client_address(config, peer, forwarded_for, real_ip, expected):
+    config.admission.trusted_proxies = ["172.28.0.10", "10.0.0.0/8"]
+    controller = AdmissionController()
+    assert controller.client_address(peer, forwarded_for, real_ip) == expected
+
+
+def _wm_handler(release: asyncio.Event, calls: list):
+    async def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    return handler
+
+
+def test_oversized_batch_is_rejected_outright(api, config, add_service):
+    config.admission.burst = 3
+    add_service(workers={"chat": "llm"})
+    items = [{"service_id": "svc", "alias": "chat", "action": "stop"}] * 4
+
+    async def run():
+        async with api:
+            return await api.post("/api/v1/workers/batch", json={"items": items})
+
+    response = asyncio.run(run())
+    assert response.status_code == 413
+    assert "burst of 3" in response.json()["detail"]
+    assert "retry-after" not in response.headers
+
+
+def test_concurrent_stop_alls_share_one_job(api, add_service, mock_upstream):
+    add_service(workers={"chat": "llm"})
+    release, calls = asyncio.Event(), []
+
+    async def run():
+        mock_upstream(_wm_handler(release, calls))
+        async with api:
+            url = "/api/v1/system/worker-manager/svc/stop-all"
+            first = asyncio.create_task(api.post(url))
+            second = asyncio.create_task(api.post(url))
+            await asyncio.sleep(0.05)
+            release.set()
+            return await first, await second
+
+    first, second = asyncio.run(run())
+    assert calls == ["/stop-all"]
+    assert first.json() == second.json()
+    assert first.json()["success"] is True
+
+
+def test_spawns_wait_for_their_managers_slot(config, add_service, mock_upstream):
+    config.admission.max_concurrent_spawns = 1
+    service_cfg = add_service(workers={"a": "llm", "b": "llm"})
+    release, calls = asyncio.Event(), []
+
+    async def run():
+        mock_upstream(_wm_handler(release, calls))
+        controller = AdmissionController()
+        first, _ = controller.submit(service_cfg, "a", "spawn")
+        second, _ = controller.submit(service_cfg, "b", "spawn")
+        again, deduplicated = controller.submit(service_cfg, "a", "spawn")
+        await asyncio.sleep(0.05)
+        (queue,) = controller.status()
+        release.set()
+        await job_table.wait(second["job_id"])
+        return calls, queue, again["job_id"] == first["job_id"] and deduplicated
+
+    calls, queue, deduplicated = asyncio.run(run())
+    assert [e["alias"] for e in queue["running"]] == ["a"]
+    assert [e["alias"] for e in queue["queued"]] == ["b"]
+    assert calls == ["/spawn/a", "/spawn/b"]
+    assert deduplicated
@@ -0,0 +1,245 @@
+"""Alert rules: the shared windows and the firing/resolved lifecycle."""
+import asyncio
+import json
+import math
+import random
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from src.core.config import AlertRuleConfig
+from src.services import alerts as alerts_module
+from src.services.alerts import (
+    LATENCY_BUCKETS_MS,
+    AlertEngine,
+    FlappingWindow,
+    LatencyP95Window,
+    MemoryTrendWindow,
+    Notifier,
+    UnknownDurationWindow,
+)
+from src.services.status_store import status_store
+
+
+def test_p95_needs_enough_samples():
+    window = LatencyP95Window(60)
+    results = [window.observe("svc", {"latency_ms": 10}, 1000.0 + i) for i in range(5)]
+    assert results[:4] == [None] * 4
+    assert results[4][0] == 10
+
+
+def test_p95_matches_brute_force_over_the_window():
+    rng = random.Random(11)
+    window = LatencyP95Window(100)
+    samples: list[tuple[float, float]] = []
+    now = 10_000.0
+    for _ in range(2000):
+        now += rng.choice([0.5, 1, 3, 8])
+        latency = rng.choice([rng.uniform(1, 40), rng.uniform(100, 3000)])
+        samples.append((now, latency))
+        result = window.observe("svc", {"latency_ms": latency}, now)
+
+        # The window covers whole slots, so compare against the same slots
+        first_slot = int(now // window.slot_seconds) - 9
+        live = sorted(lat for ts, lat in samples if int(ts // window.slot_seconds) >= first_slot)
+        if len(live) < 5:
+            assert result is None
+            continue
+        true_p95 = live[math.ceil(len(live) * 0.95) - 1]
+        bucket = next(b for b in LATENCY_BUCKETS_MS if true_p95 <= b)
+        assert result[0] == bucket
+
+
+def test_p95_forgets_everything_after_a_long_gap():
+    window = LatencyP95Window(60)
+    for i in range(10):
+        window.observe("svc", {"latency_ms": 5000}, 1000.0 + i)
+    assert window.observe("svc", {"latency_ms": None}, 5000.0) is None
+
+
+def test_flapping_counts_changes_within_the_window():
+    window = FlappingWindow(60)
+    values = [
+        window.observe("svc", {"reachable": reachable}, ts)
+        for ts, reachable in [(0, True), (10, False), (20, True), (30, True), (40, False)]
+    ]
+    assert [v[0] for v in values] == [0, 1, 2, 2, 3]
+    assert window.observe("svc", {"reachable": False}, 75)[0] == 2
+
+
+def test_memory_trend_projects_exhaustion():
+    window = MemoryTrendWindow(60)
+    assert window.observe("wm", {"used_gb": 10, "total_gb": 64}, 0) is None
+    for t in range(10, 610, 10):
+        result = window.observe("wm", {"used_gb": 10 + t * 0.01, "total_gb": 64}, t)
+    # 0.01 GB/s with 48 GB left
+    assert result[0] == pytest.approx(4800, rel=0.01)
+
+    flat = MemoryTrendWindow(60)
+    for t in range(0, 600, 10):
+        assert flat.observe("wm", {"used_gb": 10, "total_gb": 64}, t) is None
+
+
+def test_unknown_duration_resets_on_any_known_status():
+    window = UnknownDurationWindow(60)
+    assert window.observe("w", {"status": "unknown"}, 100)[0] == 0
+    assert window.observe("w", {"status": "unknown"}, 150)[0] == 50
+    assert window.observe("w", {"status": "stopped"}, 160) is None
+    assert window.observe("w", {"status": "unknown"}, 170)[0] == 0
+
+
+class RecordingNotifier(Notifier):
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, alert):
+        self.sent.append((alert["state"], alert["key"]))
+
+
+@pytest.fixture
+def alerts(config, monkeypatch):
+    """An engine with one stuck-worker rule, a fake clock and recorded transitions."""
+    config.alerts.enabled = True
+    config.alerts.cooldown_seconds = 300
+    config.alerts.rules = [
+        AlertRuleConfig(name="stuck", kind="stuck_unknown", threshold=60, severity="critical"),
+        AlertRuleConfig(name="mystery", kind="nonsense", threshold=1),
+    ]
+    clock = [1000.0]
+    monkeypatch.setattr(alerts_module.time, "time", lambda: clock[0])
+    broadcasts = []
+
+    async def broadcast(channel, data, message_type=None):
+        broadcasts.append((message_type, data["state"], data["key"]))
+
+    monkeypatch.setattr(alerts_module.ws_manager, "broadcast", broadcast)
+    engine = AlertEngine()
+    notifier = RecordingNotifier()
+    engine.add_notifier(notifier)
+    return SimpleNamespace(engine=engine, notifier=notifier, clock=clock, broadcasts=broadcasts)
+
+
+def _poll(alerts, worker_states: dict[str, str], service_id: str = "svc", seconds: float = 30):
+    alerts.clock[0] += seconds
+    statuses = [
+        {
+            "service_id": service_id,
+            "gateway": {"reachable": True, "latency_ms": 5},
+            "workers": [{"alias": a, "status": s} for a, s in worker_states.items()],
+        }
+    ]
+    asyncio.run(alerts.engine.evaluate(statuses))
+
+
+def test_alert_fires_once_and_resolves(alerts):
+    _poll(alerts, {"chat": "unknown"}, seconds=0)
+    _poll(alerts, {"chat": "unknown"})
+    assert alerts.engine.active == {}
+    _poll(alerts, {"chat": "unknown"})
+    (alert,) = alerts.engine.active.values()
+    assert (alert["key"], alert["severity"], alert["value"]) == ("svc/chat", "critical", 60)
+    _poll(alerts, {"chat": "unknown"})
+    assert alert["value"] == 90
+
+    _poll(alerts, {"chat": "running"})
+    assert alerts.engine.active == {}
+    assert alerts.engine.history[-1]["state"] == "resolved"
+    assert alerts.notifier.sent == [("firing", "svc/chat"), ("resolved", "svc/chat")]
+    assert [b[:2] for b in alerts.broadcasts] == [
+        ("alert_update", "firing"),
+        ("alert_update", "resolved"),
+    ]
+
+
+def test_refiring_within_the_cooldown_is_not_renotified(alerts):
+    for states in ["unknown", "unknown", "unknown", "running"] * 2:
+        _poll(alerts, {"chat": states})
+    assert alerts.notifier.sent == [("firing", "svc/chat"), ("resolved", "svc/chat")]
+    # The dashboard still sees every transition
+    assert len(alerts.broadcasts) == 4
+
+    alerts.clock[0] += 300
+    for states in ["unknown", "unknown", "unknown"]:
+        _poll(alerts, {"chat": states})
+    assert alerts.notifier.sent[-1] == ("firing", "svc/chat")
+
+
+def test_vanished_keys_resolve(alerts):
+    for _ in range(3):
+        _poll(alerts, {"chat": "unknown"})
+    assert alerts.engine.active
+    _poll(alerts, {})
+    assert alerts.engine.active == {}
+
+
+def test_rules_can_be_limited_to_services(alerts, config):
+    config.alerts.rules[0].services = ["other"]
+    for _ in range(4):
+        _poll(alerts, {"chat": "unknown"})
+    assert alerts.engine.active == {}
+
+
+def test_memory_rules_read_the_worker_managers(alerts, config):
+    config.alerts.rules = [AlertRuleConfig(name="oom", kind="memory_trend", threshold=3600)]
+    for i in range(20):
+        status_store.update_worker_manager(
+            "http://wm",
+            {
+                "service_id": "svc",
+                "reachable": True,
+                "memory": {"used_gb": 10 + i * 0.5, "total_gb": 64},
+            },
+        )
+        _poll(alerts, {}, seconds=10)
+    (alert,) = alerts.engine.active.values()
+    assert alert["key"] == "svc" and alert["value"] < 3600
+
+
+def test_disabled_engine_ignores_samples(alerts, config):
+    config.alerts.enabled = False
+    for _ in range(4):
+        _poll(alerts, {"chat": "unknown"})
+    assert alerts.engine.active == {} and alerts.broadcasts == []
+
+
+def test_webhook_notifier_posts_and_errors_are_contained(alerts, config, mock_upstream):
+    config.alerts.notifiers = [{"kind": "webhook", "url": "http://hooks/alerts"}, {"kind": "sms"}]
+    posted = []
+
+    def handler(request: httpx.Request):
+        posted.append(json.loads(request.content)["state"])
+        return httpx.Response(200)
+
+    class Broken(Notifier):
+        async def send(self, alert):
+            raise RuntimeError("down")
+
+    alerts.engine.add_notifier(Broken())
+
+    async def run():
+        mock_upstream(handler)
+        for states in ["unknown", "unknown", "unknown", "running"]:
+            alerts.clock[0] += 30
+            await alerts.engine.evaluate(
+                [
+                    {
+                        "service_id": "svc",
+                        "gateway": {"reachable": True},
+                        "workers": [{"alias": "chat", "status": states}],
+                    }
+                ]
+            )
+
+    asyncio.run(run())
+    assert posted == ["firing", "resolved"]
+    assert alerts.notifier.sent == [("firing", "svc/chat"), ("resolved", "svc/chat")]
+
+
+def test_transitions_from_other_processes_are_recorded(config):
+    engine = AlertEngine()
+    firing = {"rule": "stuck", "key": "svc/chat", "state": "firing"}
+    engine.record(firing)
+    assert engine.active == {("stuck", "svc/chat"): firing}
+    engine.record({**firing, "state": "resolved"})
+    assert engine.active == {} and engine.history[-1]["state"] == "resolved"
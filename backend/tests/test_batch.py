@@ -0,0 +1,135 @@
+"""Worker batches: per-manager parallelism, per-item results and joined duplicates."""
+import asyncio
+from collections import Counter
+
+import httpx
+
+BATCH_URL = "/api/v1/workers/batch"
+
+
+def test_parallelism_is_bounded_per_worker_manager(api, config, add_service, mock_upstream):
+    config.admission.burst = 20
+    add_service("one", workers={f"w{i}": "llm" for i in range(4)}, manager_port=8101)
+    add_service("two", workers={f"w{i}": "llm" for i in range(4)}, manager_port=8102)
+    running, peaks = Counter(), Counter()
+    overall = []
+
+    async def handler(request: httpx.Request):
+        host = request.url.host
+        running[host] += 1
+        peaks[host] = max(peaks[host], running[host])
+        overall.append(sum(running.values()))
+        await asyncio.sleep(0.02)
+        running[host] -= 1
+        return httpx.Response(200, json={})
+
+    items = [
+        {"service_id": service_id, "alias": f"w{i}", "action": "stop"}
+        for service_id in ("one", "two")
+        for i in range(4)
+    ]
+
+    async def run():
+        mock_upstream(handler)
+        async with api:
+            return await api.post(BATCH_URL, json={"items": items, "max_parallel": 2})
+
+    body = asyncio.run(run()).json()
+    assert body["succeeded"] == 8
+    assert peaks == {"one-wm": 2, "two-wm": 2}
+    # Managers don't wait for each other
+    assert max(overall) == 4
+
+
+def test_results_are_per_item_and_in_order(api, config, add_service, mock_upstream):
+    add_service(workers={"chat": "llm", "broken": "llm"})
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/stop/broken":
+            return httpx.Response(500)
+        return httpx.Response(200, json={"port": 9000})
+
+    items = [
+        {"service_id": "svc", "alias": "chat", "action": "spawn"},
+        {"service_id": "missing", "alias": "chat", "action": "stop"},
+        {"service_id": "svc", "alias": "ghost", "action": "spawn"},
+        {"service_id": "svc", "alias": "broken", "action": "stop"},
+    ]
+
+    async def run():
+        mock_upstream(handler)
+        async with api:
+            return await api.post(BATCH_URL, json={"items": items})
+
+    body = asyncio.run(run()).json()
+    assert (body["total"], body["succeeded"], body["failed"]) == (4, 1, 3)
+    results = body["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["success"] and results[0]["data"] == {"port": 9000}
+    assert results[1]["message"] == "Service not found: missing"
+    assert results[1]["job_id"] is None
+    assert results[2]["message"] == "Worker not found: ghost"
+    assert results[3]["message"] == "Failed to stop worker: HTTP 500"
+    assert results[3]["job_id"] is not None
+
+
+def test_unreachable_manager_fails_its_items_only(api, add_service, mock_upstream):
+    add_service("up", workers={"chat": "llm"}, manager_port=8101)
+    add_service("down", workers={"chat": "llm"}, manager_port=8102)
+
+    def handler(request: httpx.Request):
+        if request.url.host == "down-wm":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={})
+
+    items = [
+        {"service_id": "down", "alias": "chat", "action": "stop"},
+        {"service_id": "up", "alias": "chat", "action": "stop"},
+    ]
+
+    async def run():
+        mock_upstream(handler)
+        async with api:
+            return await api.post(BATCH_URL, json={"items": items})
+
+    results = asyncio.run(run()).json()["results"]
+    assert [r["success"] for r in results] == [False, True]
+    assert results[0]["message"] == "Worker manager not reachable"
+
+
+def test_duplicate_items_join_one_job(api, add_service, mock_upstream):
+    add_service(workers={"chat": "llm"})
+    calls = []
+
+    async def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        await asyncio.sleep(0.02)
+        return httpx.Response(200, json={})
+
+    items = [{"service_id": "svc", "alias": "chat", "action": "stop"}] * 2
+
+    async def run():
+        mock_upstream(handler)
+        async with api:
+            return await api.post(BATCH_URL, json={"items": items, "max_parallel": 2})
+
+    results = asyncio.run(run()).json()["results"]
+    assert calls == ["/stop/chat"]
+    assert results[0]["job_id"] == results[1]["job_id"]
+    assert sorted(r["deduplicated"] for r in results) == [False, True]
+    assert all(r["success"] for r in results)
+
+
+def test_invalid_batches_are_rejected(api):
+    item = {"service_id": "svc", "alias": "chat", "action": "stop"}
+    payloads = [
+        {"items": []},
+        {"items": [{**item, "action": "restart"}]},
+        {"items": [item], "max_parallel": 0},
+    ]
+
+    async def run():
+        async with api:
+            return [await api.post(BATCH_URL, json=payload) for payload in payloads]
+
+    assert [r.status_code for r in asyncio.run(run())] == [422, 422, 422]
@@ -0,0 +1,58 @@
+"""Listing cursors: round trips, and anything else is a 400."""
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.services import _decode_cursor, _encode_cursor
+
+
+def _raw_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "sort, key",
+    [
+        ("service_id", ("svc-a", "svc-a")),
+        ("-status", ("healthy", "svc-b")),
+        ("latency_ms", (12.5, "svc-c")),
+        ("-latency_ms", (3, "svc-d")),
+    ],
+)
+def test_round_trip(sort, key):
+    assert _decode_cursor(_encode_cursor(sort, key), sort) == key
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        _raw_cursor({"sort": "service_id"}),
+        _raw_cursor(["service_id", "svc-a"]),
+        _raw_cursor(["service_id", "svc-a", "svc-a", "extra"]),
+        _raw_cursor(["service_id", 1, "svc-a"]),
+        _raw_cursor(["service_id", "svc-a", None]),
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor, "service_id")
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.parametrize("value", ["12", True, None, [1]])
+def test_latency_cursor_needs_a_number(value):
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(_raw_cursor(["latency_ms", value, "svc-a"]), "latency_ms")
+    assert exc_info.value.status_code == 400
+
+
+def test_cursor_from_another_sort_is_rejected():
+    cursor = _encode_cursor("service_id", ("svc-a", "svc-a"))
+    with pytest.raises(HTTPException) as exc_info:
+        _decode_cursor(cursor, "-service_id")
+    assert exc_info.value.status_code == 400
+    assert "sort order" in exc_info.value.detail
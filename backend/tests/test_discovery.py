@@ -0,0 +1,142 @@
+"""Worker discovery: which upstream workers join a service, and when they leave."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.core import ServiceRegistry
+from src.services.discovery import WorkerDiscovery
+from src.services.model_catalog import model_catalog
+
+
+@pytest.fixture
+def discovery(config):
+    config.discovery.enabled = True
+    model_catalog.__init__()
+    yield WorkerDiscovery()
+    model_catalog.__init__()
+
+
+def _workers(service_id: str) -> list[tuple[str, str, str, bool]]:
+    service_cfg = ServiceRegistry().get_service(service_id)
+    return [(w.alias, w.name, w.type, w.discovered) for w in service_cfg.workers]
+
+
+def _serve_models(service_id: str, aliases: list[str]):
+    model_catalog.sources[service_id] = {
+        "etag": None,
+        "fetched_at": time.time(),
+        "error": None,
+        "models": [
+            {"model": f"org/{alias}", "alias": alias, "type": "llm", "service_id": service_id}
+            for alias in aliases
+        ],
+    }
+    model_catalog._rebuild_index()
+
+
+def test_workers_on_an_unshared_manager_are_added(discovery, add_service):
+    service_cfg = add_service(workers={"chat": "llm"})
+    service_cfg.workers[0].name = "Chat (static)"
+    discovery.observe_workers(
+        service_cfg,
+        {"chat": {"name": "renamed", "type": "vlm"}, "tts": {"name": "Speech", "type": "tts"}},
+    )
+    assert _workers("svc") == [
+        ("chat", "Chat (static)", "llm", False),
+        ("tts", "Speech", "tts", True),
+    ]
+
+
+def test_shared_manager_needs_a_tag_or_a_model_listing(discovery, add_service):
+    vision = add_service("vision")
+    voice = add_service("voice")
+    voice.worker_manager.host = vision.worker_manager.host
+    _serve_models("vision", ["listed"])
+    active = {
+        "tagged": {"service": "vision", "type": "vlm"},
+        "theirs": {"service_id": "voice", "type": "tts"},
+        "listed": {"type": "llm"},
+        "anonymous": {"type": "llm"},
+    }
+
+    discovery.observe_workers(vision, active)
+    discovery.observe_workers(voice, active)
+    assert [w[0] for w in _workers("vision")] == ["tagged", "listed"]
+    assert [w[0] for w in _workers("voice")] == ["theirs"]
+
+
+def test_unseen_workers_are_forgotten(config, discovery, add_service, monkeypatch):
+    config.discovery.forget_after_seconds = 60
+    service_cfg = add_service(workers={"chat": "llm"})
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    discovery.observe_workers(service_cfg, {"tts": {}, "asr": {}})
+
+    monkeypatch.setattr(time, "time", lambda: now + 45)
+    discovery.observe_workers(service_cfg, {"asr": {}})
+    monkeypatch.setattr(time, "time", lambda: now + 90)
+    discovery.observe_workers(service_cfg, {})
+    assert [w[0] for w in _workers("svc")] == ["chat", "asr"]
+
+    monkeypatch.setattr(time, "time", lambda: now + 200)
+    discovery.observe_workers(service_cfg, {})
+    # Static workers stay however long they are gone
+    assert [w[0] for w in _workers("svc")] == ["chat"]
+    assert discovery.last_seen == {}
+
+
+def test_disabled_discovery_adds_nothing(config, discovery, add_service):
+    config.discovery.enabled = False
+    service_cfg = add_service()
+    discovery.observe_workers(service_cfg, {"tts": {}})
+    assert _workers("svc") == []
+
+
+def test_models_without_alias_are_not_workers(discovery, add_service):
+    service_cfg = add_service(workers={"chat": "llm"})
+    discovery.observe_models(
+        service_cfg,
+        [
+            {"model": "org/chat", "alias": "chat", "type": "llm"},
+            {"model": "org/eyes", "alias": "eyes", "type": "vlm"},
+            {"model": "org/base", "alias": None, "type": None},
+        ],
+    )
+    assert _workers("svc") == [("chat", "chat", "llm", False), ("eyes", "org/eyes", "vlm", True)]
+
+
+def test_followers_mirror_the_leaders_workers(discovery, add_service):
+    add_service(workers={"chat": "llm"})
+
+    def publish(*workers: tuple[str, bool]):
+        discovery.observe_status(
+            {
+                "service_id": "svc",
+                "workers": [
+                    {"alias": alias, "name": alias.title(), "type": "tts", "discovered": found}
+                    for alias, found in workers
+                ],
+            }
+        )
+
+    publish(("chat", False), ("tts", True))
+    assert _workers("svc") == [("chat", "chat", "llm", False), ("tts", "Tts", "tts", True)]
+    publish(("asr", True))
+    assert [w[0] for w in _workers("svc")] == ["chat", "asr"]
+    discovery.observe_status({"service_id": "unknown", "workers": []})
+
+
+def test_scan_loop_discovers_from_gateway_models(discovery, add_service, mock_upstream):
+    add_service(workers={"chat": "llm"})
+    models = {"data": [{"id": "org/chat", "alias": "chat"}, {"id": "org/eyes", "alias": "eyes"}]}
+
+    async def run():
+        mock_upstream(lambda request: httpx.Response(200, json=models))
+        await discovery.start()
+        await asyncio.sleep(0.05)
+        await discovery.stop()
+
+    asyncio.run(run())
+    assert [w[0] for w in _workers("svc")] == ["chat", "eyes"]
@@ -0,0 +1,155 @@
+"""Edge cache: ETags, revalidation, encoding negotiation and purges."""
+import asyncio
+import gzip
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from src.services import edge_cache as edge_cache_module
+from src.services.edge_cache import COMPRESS_MIN_BYTES, EdgeCache
+
+
+@pytest.fixture
+def served(config):
+    """A client for an app serving ``served.content`` at ``served.revision`` through a cache."""
+
+    class Served:
+        cache = EdgeCache()
+        content = {"services": ["a"]}
+        revision = "1.0"
+        built = 0
+
+    app = FastAPI()
+
+    @app.get("/api/v1/services")
+    async def services(request: Request):
+        cached = Served.cache.cached(request, Served.revision)
+        if cached is not None:
+            return cached
+        Served.built += 1
+        return Served.cache.respond(request, Served.content, ["services"], Served.revision)
+
+    Served.client = TestClient(app)
+    return Served
+
+
+def _get(served, **headers) -> httpx.Response:
+    return served.client.get("/api/v1/services", headers=headers)
+
+
+def test_body_is_built_once_per_revision(served):
+    first = _get(served)
+    assert first.json() == {"services": ["a"]}
+    assert _get(served).headers["etag"] == first.headers["etag"]
+    assert served.built == 1
+
+    served.revision = "2.0"
+    _get(served)
+    assert served.built == 2
+    assert first.headers["surrogate-key"] == "services"
+    assert first.headers["cache-control"].startswith("public, max-age=0, s-maxage=")
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ["{etag}", "{strong}", '"other", {etag}', "*"],
+)
+def test_revalidation(served, if_none_match):
+    etag = _get(served).headers["etag"]
+    header = if_none_match.format(etag=etag, strong=etag.removeprefix("W/"))
+    response = _get(served, **{"If-None-Match": header})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_etags_survive_a_restart_but_not_a_content_change(served):
+    etag = _get(served).headers["etag"]
+
+    # A restarted backend counts revisions from zero again
+    served.cache = EdgeCache()
+    assert _get(served, **{"If-None-Match": etag}).status_code == 304
+
+    served.cache = EdgeCache()
+    served.content = {"services": ["a", "b"]}
+    response = _get(served, **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json() == {"services": ["a", "b"]}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("br;q=0, gzip;q=0.5", "gzip"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_encoding_negotiation(served, monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(edge_cache_module, "_brotli", lambda: None)
+    served.content = {"services": ["x" * COMPRESS_MIN_BYTES]}
+    response = served.client.get(
+        "/api/v1/services", headers={"Accept-Encoding": accept_encoding}
+    )
+    assert response.headers.get("content-encoding") == expected
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == served.content
+
+
+def test_compressed_once_per_encoding(served, monkeypatch):
+    calls = []
+    compress = gzip.compress
+    monkeypatch.setattr(
+        edge_cache_module.gzip, "compress", lambda *a, **k: calls.append(1) or compress(*a, **k)
+    )
+    served.content = {"services": ["x" * COMPRESS_MIN_BYTES]}
+    for _ in range(3):
+        _get(served, **{"Accept-Encoding": "gzip"})
+    assert len(calls) == 1
+
+
+def test_small_bodies_are_not_compressed(served):
+    assert "content-encoding" not in _get(served, **{"Accept-Encoding": "gzip"}).headers
+
+
+def test_entries_are_bounded(config):
+    config.edge_cache.max_entries = 3
+    cache = EdgeCache()
+    app = FastAPI()
+
+    @app.get("/items/{n}")
+    async def item(n: int, request: Request):
+        return cache.respond(request, {"n": n}, [f"item/{n}"], "r")
+
+    client = TestClient(app)
+    for n in range(10):
+        client.get(f"/items/{n}")
+    assert len(cache.entries) <= 3
+
+
+def test_purges_only_services_that_changed(config, mock_upstream):
+    config.edge_cache.purge_url = "http://cache:6081/"
+    cache = EdgeCache()
+    purged = []
+
+    def handler(request: httpx.Request):
+        purged.append((request.method, request.headers["Surrogate-Key"]))
+        return httpx.Response(200)
+
+    def status(service_id: str, state: str) -> dict:
+        return {"service_id": service_id, "status": state, "gateway": {}, "workers": []}
+
+    async def run():
+        mock_upstream(handler)
+        await cache.purge_changed([status("a", "healthy"), status("b", "healthy")])
+        await cache.purge_changed([status("a", "healthy"), status("b", "unhealthy")])
+        await cache.purge_changed([status("a", "healthy"), status("b", "unhealthy")])
+
+    asyncio.run(run())
+    assert purged == [
+        ("PURGE", "services overview service/a service/b"),
+        ("PURGE", "services overview service/b"),
+    ]
@@ -0,0 +1,190 @@
+"""EventJournal: paged queries across segments, recovery after a crash, the writer task."""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from src.services import events as events_module
+from src.services.events import INDEX_EVERY, EventJournal
+
+SERVICES = ["svc-a", "svc-b", "svc-c"]
+KINDS = ["status_changed", "action_requested", "action_finished"]
+
+
+@pytest.fixture
+def journal(config):
+    config.events.segment_max_bytes = 4096
+    journal = EventJournal()
+    journal.directory.mkdir(parents=True)
+    journal._writer = True
+    yield journal
+    journal._close_active()
+
+
+def _fill(journal: EventJournal, count: int, start: float = 1_000_000.0) -> list[dict]:
+    events = []
+    for i in range(count):
+        event = {
+            "ts": start + i * 0.5,
+            "kind": KINDS[i % len(KINDS)],
+            "service_id": SERVICES[(i // 2) % len(SERVICES)],
+            "seq": i,
+        }
+        journal._append(event)
+        events.append(event)
+    return events
+
+
+def _page_all(journal: EventJournal, since: float = 0.0, **filters) -> list[dict]:
+    collected = []
+    while True:
+        page, next_since = journal.query(since, limit=37, **filters)
+        collected.extend(page)
+        if next_since is None:
+            return collected
+        since = next_since
+
+
+def test_paging_matches_brute_force_across_segments(journal):
+    events = _fill(journal, 500)
+    assert len(journal._segments()) > 1
+
+    assert [e["seq"] for e in _page_all(journal)] == list(range(500))
+    for service_id in SERVICES:
+        expected = [e["seq"] for e in events if e["service_id"] == service_id]
+        assert [e["seq"] for e in _page_all(journal, service_id=service_id)] == expected
+    expected = [e["seq"] for e in events if e["kind"] == "action_finished"]
+    assert [e["seq"] for e in _page_all(journal, kind="action_finished")] == expected
+
+
+def test_since_and_until_bound_the_range(journal):
+    events = _fill(journal, 300)
+    since, until = events[99]["ts"], events[199]["ts"]
+    page, next_since = journal.query(since, until=until, limit=1000)
+    assert [e["seq"] for e in page] == list(range(100, 200))
+    assert next_since is None
+
+
+def test_sealed_segments_are_skipped_by_service(journal):
+    journal._append({"ts": 1_000_000.0, "kind": "status_changed", "service_id": "svc-a"})
+    journal._seal()
+    journal._append({"ts": 1_000_001.0, "kind": "status_changed", "service_id": "svc-b"})
+
+    sealed = journal._segments()[0]
+    assert sealed.load_meta()["services"] == ["svc-a"]
+    page, _ = journal.query(0.0, service_id="svc-b")
+    assert [e["service_id"] for e in page] == ["svc-b"]
+
+
+def test_recover_drops_torn_line_and_keeps_appending(journal):
+    journal.config.segment_max_bytes = 1024 * 1024
+    _fill(journal, INDEX_EVERY + 5)
+    segment = journal._segment
+    journal._close_active()
+    # Simulate a crash halfway through writing the next line
+    with open(segment.path, "ab") as f:
+        f.write(b'{"ts":2000000.0,"kind":"status_cha')
+
+    recovered = EventJournal()
+    recovered._recover()
+    recovered._writer = True
+    try:
+        assert recovered._segment.path == segment.path
+        assert recovered._count == INDEX_EVERY + 5
+        assert not segment.path.read_bytes().endswith(b"cha")
+
+        recovered._append({"ts": 0.0, "kind": "status_changed", "service_id": "svc-a"})
+        lines = segment.path.read_bytes().splitlines()
+        assert len(lines) == INDEX_EVERY + 6
+        # Timestamps stay increasing past the last recovered event
+        assert json.loads(lines[-1])["ts"] > json.loads(lines[-2])["ts"]
+
+        assert len(_page_all(recovered)) == INDEX_EVERY + 6
+    finally:
+        recovered._close_active()
+
+
+def test_recover_seals_older_unsealed_segments(journal):
+    _fill(journal, 200)
+    segments = journal._segments()
+    assert len(segments) > 2
+    journal._close_active()
+    # A crash mid-roll leaves the previous segment without its metadata
+    segments[-2].meta_path.unlink()
+
+    recovered = EventJournal()
+    recovered._recover()
+    try:
+        assert segments[-2].load_meta()["last_ts"] < segments[-1].first_ts
+        assert recovered._segment.path == segments[-1].path
+    finally:
+        recovered._close_active()
+
+
+def test_compacted_segments_stay_queryable(journal, monkeypatch):
+    events = _fill(journal, 200)
+    journal._seal()
+    journal.config.compact_after_days = 0
+    journal.config.retention_days = 10**6
+    journal._maintain()
+
+    assert all(s.compressed for s in journal._segments())
+    since = events[49]["ts"]
+    assert [e["seq"] for e in _page_all(journal, since=since)] == list(range(50, 200))
+
+    monkeypatch.setattr(time, "time", lambda: events[-1]["ts"] + 86400 * 2)
+    journal.config.retention_days = 1
+    journal._maintain()
+    assert journal._segments() == []
+
+
+def test_appends_run_off_the_event_loop(config, monkeypatch):
+    """A stalled disk must not block emitters; stop() writes what was queued."""
+    monkeypatch.setattr(events_module.ws_manager, "broadcast", _no_broadcast)
+    journal = EventJournal()
+    disk = threading.Event()
+    append = journal._append
+
+    def slow_append(event):
+        disk.wait(0.5)
+        append(event)
+
+    monkeypatch.setattr(journal, "_append", slow_append)
+
+    async def run():
+        await journal.start()
+        started = time.monotonic()
+        for i in range(20):
+            await journal.emit("status_changed", "svc-a", seq=i)
+        # Emitting returned while the first write is still stuck on the disk
+        assert time.monotonic() - started < 1
+        assert journal.query(0.0)[0] == []
+        disk.set()
+        await journal.stop()
+
+    asyncio.run(run())
+    written, _ = journal.query(0.0, limit=1000)
+    assert [e["seq"] for e in written] == list(range(20))
+    assert all(a["ts"] < b["ts"] for a, b in zip(written, written[1:]))
+
+
+def test_restart_continues_after_the_queued_timestamps(config, monkeypatch):
+    monkeypatch.setattr(events_module.ws_manager, "broadcast", _no_broadcast)
+    future = time.time() + 3600
+
+    async def run(journal, ts):
+        await journal.start()
+        journal.record({"ts": ts, "kind": "status_changed", "service_id": "svc-a"})
+        await journal.stop()
+
+    asyncio.run(run(EventJournal(), future))
+    # A clock that went backwards between leaders still yields a valid cursor
+    asyncio.run(run(EventJournal(), 0.0))
+    written, _ = EventJournal().query(0.0)
+    assert len(written) == 2 and written[1]["ts"] > written[0]["ts"] >= future
+
+
+async def _no_broadcast(*args, **kwargs):
+    pass
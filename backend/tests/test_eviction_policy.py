@@ -0,0 +1,195 @@
+"""Idle-worker eviction: TTLs, memory pressure, rate limits and background jobs."""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from src.services.eviction_policy import EvictionPolicy
+from src.services.jobs import job_table
+from src.services.status_store import status_store
+
+
+@pytest.fixture
+def policy(config):
+    config.eviction.enabled = True
+    config.eviction.default_idle_ttl_seconds = 600
+    return EvictionPolicy()
+
+
+def _report(service_id: str, workers: dict[str, tuple[float, float]]):
+    """Store a poll where every worker runs: alias -> (memory_gb, idle_seconds)."""
+    status = {
+        "service_id": service_id,
+        "status": "healthy",
+        "workers": [
+            {
+                "alias": alias,
+                "type": "llm",
+                "status": "running",
+                "memory_gb": memory_gb,
+                "idle_seconds": idle,
+            }
+            for alias, (memory_gb, idle) in workers.items()
+        ],
+    }
+    status_store.update_service(status)
+    return [status]
+
+
+def _recorder(calls: list, delay: float = 0.0, fail: str | None = None):
+    async def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        await asyncio.sleep(delay)
+        if fail and request.url.path.endswith(fail):
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={})
+
+    return handler
+
+
+async def _drain():
+    for job in list(job_table.jobs.values()):
+        await job_table.wait(job["job_id"])
+
+
+def test_ttl_most_specific_setting_wins(config, policy, add_service):
+    service_cfg = add_service(workers={"own": "llm", "typed": "tts", "plain": "llm"})
+    service_cfg.workers[0].idle_ttl_seconds = 30
+    config.eviction.type_idle_ttl_seconds = {"tts": 120}
+    assert [policy.ttl_for(service_cfg, a) for a in ("own", "typed", "plain", "ghost")] == [
+        30,
+        120,
+        600,
+        600,
+    ]
+
+
+def test_idle_workers_past_their_ttl_are_evicted(policy, add_service, mock_upstream):
+    add_service(workers={"idle": "llm", "busy": "llm"})
+    statuses = _report("svc", {"idle": (4, 900), "busy": (4, 10)})
+    calls = []
+
+    async def run():
+        mock_upstream(_recorder(calls))
+        await policy.evaluate(statuses)
+        await _drain()
+
+    asyncio.run(run())
+    assert calls == ["/v1/system/evict/idle"]
+    (entry,) = policy.audit
+    assert (entry["alias"], entry["action"], entry["success"]) == ("idle", "evict", True)
+    assert entry["reason"] == "Idle 900s >= TTL 600s"
+
+
+def test_stop_action_goes_to_the_worker_manager(config, policy, add_service, mock_upstream):
+    config.eviction.action = "stop"
+    add_service(workers={"idle": "llm"})
+    statuses = _report("svc", {"idle": (4, 900)})
+    calls = []
+
+    async def run():
+        mock_upstream(_recorder(calls))
+        await policy.evaluate(statuses)
+        await _drain()
+
+    asyncio.run(run())
+    assert calls == ["/stop/idle"]
+
+
+def test_evictions_are_rate_limited(config, policy, add_service, mock_upstream):
+    config.eviction.max_evictions = 2
+    add_service(workers={f"w{i}": "llm" for i in range(4)})
+    statuses = _report("svc", {f"w{i}": (4, 900) for i in range(4)})
+    calls = []
+
+    async def run():
+        mock_upstream(_recorder(calls))
+        await policy.evaluate(statuses)
+        await _drain()
+        await policy.evaluate(statuses)
+        await _drain()
+
+    asyncio.run(run())
+    assert calls == ["/v1/system/evict/w0", "/v1/system/evict/w1"]
+
+
+def test_memory_pressure_evicts_least_recently_used(config, policy, add_service, mock_upstream):
+    config.eviction.default_idle_ttl_seconds = None
+    config.eviction.memory_pressure_percent = 80
+    config.eviction.pressure_min_idle_seconds = 120
+    service_cfg = add_service(workers={"a": "llm", "b": "llm", "c": "llm", "hot": "llm"})
+    statuses = _report("svc", {"a": (10, 300), "b": (10, 900), "c": (10, 600), "hot": (40, 5)})
+    status_store.update_worker_manager(
+        service_cfg.worker_manager.url,
+        {"service_id": "svc", "memory": {"total_gb": 100, "used_gb": 95}},
+    )
+    calls = []
+
+    async def run():
+        mock_upstream(_recorder(calls))
+        await policy.evaluate(statuses)
+        await _drain()
+
+    asyncio.run(run())
+    # 95% -> b (85%) -> c (75%); a and the busy worker stay
+    assert calls == ["/v1/system/evict/b", "/v1/system/evict/c"]
+    assert [e["reason"] for e in policy.audit] == [
+        "Memory pressure 95% >= 80%",
+        "Memory pressure 85% >= 80%",
+    ]
+
+
+def test_polls_do_not_wait_for_evictions_or_repeat_them(policy, add_service, mock_upstream):
+    add_service(workers={"idle": "llm"})
+    statuses = _report("svc", {"idle": (4, 900)})
+    calls = []
+
+    async def run():
+        mock_upstream(_recorder(calls, delay=0.1))
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await policy.evaluate(statuses)
+        returned_after = loop.time() - started
+        await asyncio.sleep(0.01)
+        # The next poll still sees the worker running while the job is in flight
+        await policy.evaluate(statuses)
+        await _drain()
+        return returned_after
+
+    assert asyncio.run(run()) < 0.05
+    assert calls == ["/v1/system/evict/idle"]
+    assert len(policy.audit) == 1
+    assert policy._in_flight == set()
+
+
+def test_failures_are_audited(config, policy, add_service, mock_upstream, tmp_path):
+    config.eviction.audit_log_path = str(tmp_path / "audit.jsonl")
+    add_service(workers={"idle": "llm"})
+    statuses = _report("svc", {"idle": (4, 900)})
+
+    async def run():
+        mock_upstream(_recorder([], fail="/evict/idle"))
+        await policy.evaluate(statuses)
+        await _drain()
+
+    asyncio.run(run())
+    (entry,) = policy.audit
+    assert not entry["success"]
+    assert entry["message"] == "Gateway not reachable"
+    lines = (tmp_path / "audit.jsonl").read_text().splitlines()
+    assert [json.loads(line)["alias"] for line in lines] == ["idle"]
+
+
+def test_disabled_policy_does_nothing(config, policy, add_service, mock_upstream):
+    config.eviction.enabled = False
+    add_service(workers={"idle": "llm"})
+    statuses = _report("svc", {"idle": (4, 900)})
+    calls = []
+
+    async def run():
+        mock_upstream(_recorder(calls))
+        await policy.evaluate(statuses)
+
+    asyncio.run(run())
+    assert calls == [] and job_table.jobs == {}
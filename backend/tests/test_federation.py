@@ -0,0 +1,153 @@
+"""Federation: peer services merged into the local store under ``<peer>/<id>``."""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from src.core.config import PeerConfig
+from src.services import federation as federation_module
+from src.services.federation import Federation, PeerLink
+from src.services.status_store import status_store
+
+
+@pytest.fixture
+def broadcasts(monkeypatch):
+    sent = []
+
+    async def broadcast(channel, data, message_type=None):
+        sent.append((channel, data))
+
+    monkeypatch.setattr(federation_module.ws_manager, "broadcast", broadcast)
+    return sent
+
+
+def _service(service_id: str, status: str = "healthy", peer: str | None = None) -> dict:
+    return {
+        "service_id": service_id,
+        "status": status,
+        "peer": peer,
+        "workers": [{"alias": "chat", "type": "llm", "status": "running"}],
+    }
+
+
+async def _no_send(raw: str):
+    raise AssertionError(f"Unexpected reply: {raw}")
+
+
+def test_bootstrap_takes_only_the_peers_own_services(config, mock_upstream, broadcasts):
+    link = PeerLink("lab", "http://lab:4010/", 30)
+    listing = {"services": [_service("vision"), _service("far/voice", peer="far")]}
+
+    def handler(request: httpx.Request):
+        assert str(request.url) == "http://lab:4010/api/v1/services"
+        return httpx.Response(200, json=listing)
+
+    async def run():
+        mock_upstream(handler)
+        await link._bootstrap()
+
+    asyncio.run(run())
+    assert link.service_ids == {"lab/vision"}
+    assert set(status_store.services) == {"lab/vision"}
+    stored = status_store.get_service("lab/vision")
+    assert stored["peer"] == "lab" and stored["status"] == "healthy"
+    assert [channel for channel, _ in broadcasts] == ["services"]
+
+
+def test_bootstrap_surfaces_peer_errors(config, mock_upstream):
+    link = PeerLink("lab", "http://lab:4010", 30)
+
+    async def run():
+        mock_upstream(lambda request: httpx.Response(503))
+        await link._bootstrap()
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(run())
+    assert status_store.services == {}
+
+
+def test_stream_messages_update_the_store(config, broadcasts):
+    link = PeerLink("lab", "http://lab:4010", 30)
+    sent_at = time.time() - 0.25
+    overview = {
+        "worker_managers": [
+            {"service_id": "vision", "reachable": True},
+            {"service_id": "far/voice", "reachable": True},
+        ]
+    }
+
+    async def run():
+        await link._handle(
+            {"type": "services_update", "timestamp": sent_at, "data": _service("vision")},
+            _no_send,
+        )
+        await link._handle(
+            {"type": "services_update", "data": _service("far/voice", peer="far")}, _no_send
+        )
+        await link._handle({"type": "overview_update", "data": overview}, _no_send)
+
+    asyncio.run(run())
+    assert set(status_store.services) == {"lab/vision"}
+    assert list(status_store.worker_managers) == ["lab/vision"]
+    assert status_store.worker_managers["lab/vision"]["service_id"] == "lab/vision"
+    assert link.messages == 3
+    assert link.lag_ms >= 250
+
+
+def test_heartbeats_are_acknowledged(config):
+    link = PeerLink("lab", "http://lab:4010", 30)
+    replies = []
+
+    async def send(raw: str):
+        replies.append(json.loads(raw))
+
+    asyncio.run(link._handle({"type": "heartbeat", "data": {"seq": 7}}, send))
+    assert replies == [{"type": "heartbeat_ack", "seq": 7}]
+
+
+def test_lost_link_marks_services_unknown_once(config, broadcasts):
+    link = PeerLink("lab", "http://lab:4010", 30)
+
+    async def run():
+        await link._apply_service(_service("vision"))
+        await link._mark_stale()
+        await link._mark_stale()
+
+    asyncio.run(run())
+    stale = status_store.get_service("lab/vision")
+    assert stale["status"] == "unknown"
+    assert [w["status"] for w in stale["workers"]] == ["unknown"]
+    # One broadcast for the update, one for going stale, none for the repeat
+    assert len(broadcasts) == 2
+
+
+def test_link_status_reports_staleness(config):
+    link = PeerLink("lab", "https://lab.example/", 30)
+    assert link.ws_url == "wss://lab.example/ws"
+    assert link.status()["stale"] is True
+
+    link.last_message_at = time.time()
+    assert link.status()["stale"] is False
+    link.last_message_at = time.time() - 31
+    assert link.status()["stale"] is True
+
+
+def test_unreachable_peer_is_retried(config, mock_upstream, broadcasts):
+    config.federation.peers = [PeerConfig(name="lab", url="http://lab:4010")]
+    federation = Federation()
+
+    async def run():
+        mock_upstream(lambda request: httpx.Response(503))
+        await federation.start()
+        await asyncio.sleep(0.05)
+        (status,) = federation.status()
+        await federation.stop()
+        return status
+
+    status = asyncio.run(run())
+    assert not status["connected"]
+    assert status["reconnects"] == 1
+    assert "503" in status["error"]
+    assert federation.peers == {}
@@ -0,0 +1,119 @@
+"""WebSocket heartbeats: silent peers are reaped, answering peers (and federation links) stay."""
+import asyncio
+import json
+import socket
+
+import uvicorn
+import websockets
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+
+from src.services.federation import PeerLink
+from src.services.status_store import status_store
+from src.services.upstream import upstream
+from src.ws import WebSocketManager
+
+INTERVAL = 0.2
+MAX_MISSED = 2
+
+
+def _peer_app(manager: WebSocketManager) -> FastAPI:
+    """A dashboard with no services, just its /ws stream and heartbeat."""
+    app = FastAPI()
+
+    @app.get("/api/v1/services")
+    async def services():
+        return {"services": []}
+
+    @app.websocket("/ws")
+    async def stream(websocket: WebSocket):
+        connection_id = await manager.connect(websocket)
+        try:
+            while True:
+                await manager.handle_message(connection_id, await websocket.receive_json())
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await manager.disconnect(connection_id)
+
+    return app
+
+
+async def _with_peer(scenario):
+    """Serve a peer dashboard on a free port and run ``scenario(manager, url)`` against it."""
+    manager = WebSocketManager()
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(_peer_app(manager), log_level="warning"))
+    serving = asyncio.create_task(server.serve(sockets=[sock]))
+    while not server.started:
+        await asyncio.sleep(0.01)
+    await manager.start_heartbeat(INTERVAL, MAX_MISSED)
+    try:
+        return await scenario(manager, f"http://127.0.0.1:{port}")
+    finally:
+        await manager.stop_heartbeat()
+        server.should_exit = True
+        await serving
+        await upstream.aclose()
+
+
+async def _wait_connected(manager: WebSocketManager):
+    while not manager.connections:
+        await asyncio.sleep(0.01)
+
+
+def test_silent_client_is_reaped(config):
+    async def scenario(manager, url):
+        async with websockets.connect(url.replace("http", "ws") + "/ws") as ws:
+            await _wait_connected(manager)
+            # Read heartbeats but never answer them
+            heartbeats = 0
+            try:
+                while True:
+                    message = json.loads(await asyncio.wait_for(ws.recv(), INTERVAL * 6))
+                    heartbeats += message["type"] == "heartbeat"
+            except websockets.ConnectionClosed:
+                pass
+            return heartbeats, manager.connections
+
+    heartbeats, connections = asyncio.run(_with_peer(scenario))
+    assert heartbeats >= MAX_MISSED
+    assert connections == {}
+
+
+def test_answering_client_stays_connected(config):
+    async def scenario(manager, url):
+        async with websockets.connect(url.replace("http", "ws") + "/ws") as ws:
+            await _wait_connected(manager)
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + INTERVAL * (MAX_MISSED + 3)
+            while loop.time() < deadline:
+                message = json.loads(await ws.recv())
+                if message["type"] == "heartbeat":
+                    await ws.send(
+                        json.dumps({"type": "heartbeat_ack", "seq": message["data"]["seq"]})
+                    )
+            return manager.connection_stats()
+
+    (stats,) = asyncio.run(_with_peer(scenario))
+    assert stats["missed_heartbeats"] == 0
+    assert stats["rtt_ms"] is not None
+
+
+def test_federation_link_survives_heartbeats(config):
+    async def scenario(manager, url):
+        link = PeerLink("peer", url, stale_after_seconds=30)
+        link.start()
+        try:
+            await _wait_connected(manager)
+            (connection_id,) = manager.connections
+            await asyncio.sleep(INTERVAL * (MAX_MISSED + 3))
+            return link.status(), list(manager.connections), connection_id
+        finally:
+            await link.stop()
+
+    status, connections, connection_id = asyncio.run(_with_peer(scenario))
+    assert status["connected"] and status["reconnects"] == 0
+    assert connections == [connection_id]
+    assert status_store.services == {}
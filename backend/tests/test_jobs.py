@@ -0,0 +1,156 @@
+"""Worker action jobs: states, errors, expiry and the job API."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.services.jobs import JobTable
+from src.services.worker_actions import WorkerActionError
+
+
+async def _succeed():
+    await asyncio.sleep(0)
+    return {"success": True, "message": "done"}
+
+
+@pytest.mark.parametrize(
+    "outcome, state, error, status_code",
+    [
+        ({"success": True, "message": "ok"}, "succeeded", None, None),
+        ({"success": False, "message": "HTTP 500"}, "failed", "HTTP 500", None),
+        (
+            WorkerActionError(503, "Worker manager not reachable"),
+            "failed",
+            "Worker manager not reachable",
+            503,
+        ),
+        (RuntimeError("boom"), "failed", "boom", None),
+    ],
+)
+def test_job_outcomes(config, outcome, state, error, status_code):
+    table = JobTable()
+
+    async def run_action():
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def run():
+        job = table.submit("spawn", "svc", "chat", run_action)
+        assert job["state"] == "pending"
+        return await table.wait(job["job_id"])
+
+    job = asyncio.run(run())
+    assert (job["state"], job["error"], job["status_code"]) == (state, error, status_code)
+    assert job["started_at"] <= job["finished_at"]
+    assert table._tasks == {}
+
+
+def test_cancelled_waiter_does_not_cancel_the_job(config):
+    table = JobTable()
+    release = asyncio.Event()
+
+    async def run_action():
+        await release.wait()
+        return {"success": True, "message": "ok"}
+
+    async def run():
+        job = table.submit("spawn", "svc", "chat", run_action)
+        waiter = asyncio.create_task(table.wait(job["job_id"]))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        release.set()
+        return await table.wait(job["job_id"])
+
+    assert asyncio.run(run())["state"] == "succeeded"
+
+
+def test_finished_jobs_expire(config, monkeypatch):
+    table = JobTable(ttl_seconds=60)
+
+    async def run():
+        job = table.submit("stop", "svc", "chat", _succeed)
+        await table.wait(job["job_id"])
+        return job["job_id"]
+
+    job_id = asyncio.run(run())
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 30)
+    assert table.get(job_id) is not None
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert table.get(job_id) is None
+
+
+def test_records_from_other_processes_do_not_replace_local_jobs(config):
+    table = JobTable()
+    release = asyncio.Event()
+
+    async def run_action():
+        await release.wait()
+        return {"success": True, "message": "ok"}
+
+    async def run():
+        job = table.submit("spawn", "svc", "chat", run_action)
+        table.record({**job, "state": "failed"})
+        assert table.get(job["job_id"]) is job
+        release.set()
+        await table.wait(job["job_id"])
+
+        remote = {**job, "job_id": "remote", "state": "running"}
+        table.record(remote)
+        # Nothing runs here for a remote job, so waiting returns what was reported
+        return await table.wait("remote")
+
+    assert asyncio.run(run())["state"] == "running"
+
+
+def test_actions_return_a_job_to_poll(api, add_service, mock_upstream):
+    add_service(workers={"chat": "llm"})
+
+    async def run():
+        mock_upstream(lambda request: httpx.Response(200, json={"port": 9000}))
+        async with api:
+            accepted = await api.post("/api/v1/services/svc/workers/chat/spawn")
+            job_id = accepted.json()["job_id"]
+            await asyncio.sleep(0.05)
+            return (
+                accepted,
+                await api.get(f"/api/v1/jobs/{job_id}"),
+                await api.get("/api/v1/jobs"),
+                await api.get("/api/v1/jobs/nope"),
+            )
+
+    accepted, job, jobs, missing = asyncio.run(run())
+    assert accepted.status_code == 202
+    assert accepted.json()["state"] in ("pending", "running")
+    assert job.json()["state"] == "succeeded"
+    assert job.json()["result"]["data"] == {"port": 9000}
+    assert [j["job_id"] for j in jobs.json()["jobs"]] == [job.json()["job_id"]]
+    assert missing.status_code == 404
+
+
+def test_waiting_returns_the_result_or_the_upstream_error(api, add_service, mock_upstream):
+    add_service(workers={"chat": "llm"})
+
+    def handler(request: httpx.Request):
+        if request.url.path == "/stop/chat":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, json={})
+
+    async def run():
+        mock_upstream(handler)
+        async with api:
+            spawned = await api.post(
+                "/api/v1/services/svc/workers/chat/spawn", params={"wait": True}
+            )
+            stopped = await api.post(
+                "/api/v1/services/svc/workers/chat/stop", params={"wait": True}
+            )
+            return spawned, stopped
+
+    spawned, stopped = asyncio.run(run())
+    assert spawned.status_code == 200
+    assert spawned.json()["success"] is True and spawned.json()["job_id"]
+    assert stopped.status_code == 503
+    assert stopped.json()["detail"] == "Worker manager not reachable"
@@ -0,0 +1,153 @@
+"""Model catalog: gateway payloads, revalidation, concurrent refreshes and lookups by ID."""
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.api import models_router
+from src.services.model_catalog import ModelCatalog, model_catalog
+
+
+@pytest.fixture
+def global_catalog():
+    """The API serves the process-wide catalog; start and end empty."""
+    model_catalog.__init__()
+    yield model_catalog
+    model_catalog.__init__()
+
+
+@pytest.fixture
+def catalog(config, add_service):
+    add_service("alpha", workers={"chat": "llm"}, gateway_port=8001)
+    add_service("beta", workers={"eyes": "vlm"}, gateway_port=8002)
+    return ModelCatalog()
+
+
+def test_payload_shapes_and_search(catalog, mock_upstream):
+    payloads = {
+        "alpha-gw": {"data": [{"id": "mlx-community/Qwen3-8B", "alias": "chat"}, "raw-id"]},
+        "beta-gw": [{"name": "llava", "alias": ["not", "a", "string"], "type": 7}, {"id": "eyes"}],
+    }
+
+    async def run():
+        mock_upstream(lambda request: httpx.Response(200, json=payloads[request.url.host]))
+        await catalog.refresh()
+
+    asyncio.run(run())
+    assert {s: src["error"] for s, src in catalog.sources.items()} == {
+        "alpha": None,
+        "beta": None,
+    }
+    assert [m["model"] for m in catalog.search("qwen")] == ["mlx-community/Qwen3-8B"]
+    assert [m["type"] for m in catalog.search(service_id="alpha")] == ["llm", None]
+    llava = catalog.lookup("LLAVA")[0]
+    assert (llava["alias"], llava["type"]) == (None, None)
+    # Typed from the worker whose alias matches the model ID
+    assert [m["model"] for m in catalog.search(model_type="vlm")] == ["eyes"]
+    assert catalog.lookup("chat")[0]["service_id"] == "alpha"
+
+
+def test_unchanged_catalog_is_revalidated_with_etag(catalog, mock_upstream, config):
+    config.models.cache_ttl_seconds = 0
+    conditional = []
+
+    def handler(request: httpx.Request):
+        if request.headers.get("if-none-match") == '"v1"':
+            conditional.append(request.url.host)
+            return httpx.Response(304)
+        return httpx.Response(200, json={"data": [{"id": "m"}]}, headers={"ETag": '"v1"'})
+
+    async def run():
+        mock_upstream(handler)
+        await catalog.refresh()
+        await catalog.refresh()
+
+    asyncio.run(run())
+    assert sorted(conditional) == ["alpha-gw", "beta-gw"]
+    assert len(catalog.search("m")) == 2
+
+
+def test_stuck_gateway_does_not_block_readers(catalog, mock_upstream, config):
+    config.models.cache_ttl_seconds = 60
+    release = asyncio.Event()
+    calls = []
+
+    async def handler(request: httpx.Request):
+        calls.append(request.url.host)
+        if request.url.host == "alpha-gw" and len(calls) > 2:
+            await release.wait()
+        return httpx.Response(200, json={"data": [{"id": f"{request.url.host}-model"}]})
+
+    async def run():
+        mock_upstream(handler)
+        await catalog.refresh()
+        catalog.sources["alpha"]["fetched_at"] = time.time() - 120
+
+        stuck = asyncio.create_task(catalog.refresh())
+        await asyncio.sleep(0.01)
+        # Another reader is served the last catalog while alpha is refetched
+        await asyncio.wait_for(catalog.refresh(), 0.5)
+        served = [m["model"] for m in catalog.search()]
+        release.set()
+        await stuck
+        return served
+
+    served = asyncio.run(run())
+    assert sorted(served) == ["alpha-gw-model", "beta-gw-model"]
+    assert calls.count("alpha-gw") == 2
+
+
+def test_failed_gateway_keeps_its_last_catalog(catalog, mock_upstream):
+    failing = []
+
+    def handler(request: httpx.Request):
+        if request.url.host in failing:
+            return httpx.Response(502)
+        return httpx.Response(200, json={"data": [{"id": f"{request.url.host}-model"}]})
+
+    async def run():
+        mock_upstream(handler)
+        await catalog.refresh()
+        failing.append("beta-gw")
+        await catalog.refresh(force=True)
+
+    asyncio.run(run())
+    assert catalog.sources["beta"]["error"] == "HTTP 502"
+    assert sorted(m["model"] for m in catalog.search()) == ["alpha-gw-model", "beta-gw-model"]
+
+
+def test_removed_services_leave_the_index(catalog, mock_upstream, config):
+    async def run():
+        mock_upstream(lambda request: httpx.Response(200, json=[request.url.host]))
+        await catalog.refresh()
+        del config.services["beta"]
+        await catalog.refresh(force=True)
+
+    asyncio.run(run())
+    assert list(catalog.sources) == ["alpha"]
+    assert [m["model"] for m in catalog.search()] == ["alpha-gw"]
+
+
+def test_model_ids_with_slashes_resolve(catalog, global_catalog):
+    model = {
+        "model": "mlx-community/Qwen3-8B-4bit",
+        "alias": "chat",
+        "type": "llm",
+        "service_id": "alpha",
+        "service_name": "alpha",
+        "owned_by": None,
+    }
+    source = {"etag": None, "fetched_at": time.time(), "error": None, "models": [model]}
+    global_catalog.sources = {"alpha": source, "beta": {**source}}
+    global_catalog._rebuild_index()
+    app = FastAPI()
+    app.include_router(models_router)
+    client = TestClient(app)
+
+    response = client.get("/api/v1/models/mlx-community/Qwen3-8B-4bit")
+    assert response.status_code == 200
+    assert response.json()["models"][0]["service_id"] == "alpha"
+    assert client.get("/api/v1/models/unknown/model").status_code == 404
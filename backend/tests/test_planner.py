@@ -0,0 +1,202 @@
+"""Placement planner: which idle workers to evict so a spawn fits in memory."""
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from src.services.planner import PlacementPlanner
+from src.services.status_store import status_store
+
+WM_URL = "http://shared-wm:8100"
+
+
+@pytest.fixture
+def shared_manager(config, add_service):
+    """Services on one worker manager: ``shared_manager(id, workers={alias: type})``."""
+
+    def add(service_id: str, workers: dict[str, str]):
+        service_cfg = add_service(service_id, workers=workers)
+        service_cfg.worker_manager.host = "shared-wm"
+        return service_cfg
+
+    config.planner.headroom_gb = 1.0
+    config.planner.min_idle_seconds = 60
+    return add
+
+
+def _report(service_id: str, workers: dict[str, tuple[float, float] | None]):
+    """Store a poll: alias -> (memory_gb, idle_seconds) if running, None if stopped."""
+    status_store.update_service(
+        {
+            "service_id": service_id,
+            "status": "healthy",
+            "workers": [
+                {"alias": alias, "type": "llm", "status": "stopped"}
+                if state is None
+                else {
+                    "alias": alias,
+                    "type": "llm",
+                    "status": "running",
+                    "memory_gb": state[0],
+                    "idle_seconds": state[1],
+                }
+                for alias, state in workers.items()
+            ],
+        }
+    )
+
+
+def _available(gb: float):
+    status_store.update_worker_manager(WM_URL, {"service_id": "x", "memory": {"available_gb": gb}})
+
+
+def test_no_eviction_when_the_spawn_fits(shared_manager):
+    service_cfg = shared_manager("svc", {"big": "llm", "idle": "llm"})
+    service_cfg.workers[0].memory_gb = 8
+    _report("svc", {"big": None, "idle": (4, 600)})
+    _available(9)
+
+    plan = PlacementPlanner().plan(service_cfg, "big")
+    assert plan["feasible"] and plan["evict"] == []
+    assert plan["reason"] == "Enough memory available"
+
+
+def test_least_recently_used_first_then_redundant_picks_dropped(shared_manager):
+    service_cfg = shared_manager("svc", {"big": "llm", "a": "llm", "b": "llm"})
+    shared_manager("other", {"c": "llm", "busy": "llm"})
+    service_cfg.workers[0].memory_gb = 12
+    _report("svc", {"big": None, "a": (4, 500), "b": (10, 400)})
+    _report("other", {"c": (2, 300), "busy": (20, 5)})
+    _available(4)
+
+    plan = PlacementPlanner().plan(service_cfg, "big")
+    # Shortfall 9: LRU takes a (4) and b (10); b alone covers it
+    assert plan["shortfall_gb"] == 9
+    assert [(c["service_id"], c["alias"]) for c in plan["evict"]] == [("svc", "b")]
+    assert plan["freed_gb"] == 10 and plan["feasible"]
+
+
+def test_busy_workers_and_other_managers_are_never_evicted(shared_manager, add_service):
+    service_cfg = shared_manager("svc", {"big": "llm", "busy": "llm"})
+    add_service("elsewhere", workers={"idle": "llm"})
+    service_cfg.workers[0].memory_gb = 12
+    _report("svc", {"big": None, "busy": (20, 10)})
+    _report("elsewhere", {"idle": (20, 900)})
+    _available(4)
+
+    plan = PlacementPlanner().plan(service_cfg, "big")
+    assert not plan["feasible"]
+    assert plan["evict"] == []
+    assert plan["reason"] == "Not enough idle workers to free the required memory"
+
+
+def test_observed_footprint_beats_the_configured_estimate(shared_manager):
+    service_cfg = shared_manager("svc", {"big": "llm"})
+    service_cfg.workers[0].memory_gb = 4
+    _report("svc", {"big": (9, 0)})
+    _report("svc", {"big": None})
+    assert PlacementPlanner().expected_memory(service_cfg, "big") == 9
+
+
+@pytest.mark.parametrize(
+    "setup, reason",
+    [
+        (lambda cfg: _report("svc", {"big": (8, 0)}), "Worker already running"),
+        (lambda cfg: None, "No memory information from worker manager; spawning without plan"),
+        (
+            lambda cfg: (_available(1), setattr(cfg.workers[0], "memory_gb", None)),
+            "Unknown memory footprint; spawning without plan",
+        ),
+    ],
+)
+def test_spawns_without_a_plan_when_it_cannot_plan(shared_manager, setup, reason):
+    service_cfg = shared_manager("svc", {"big": "llm"})
+    service_cfg.workers[0].memory_gb = 8
+    setup(service_cfg)
+    plan = PlacementPlanner().plan(service_cfg, "big")
+    assert plan["feasible"] and plan["evict"] == [] and plan["reason"] == reason
+
+
+def test_random_plans_are_sufficient_and_minimal(shared_manager):
+    rng = random.Random(3)
+    for _ in range(200):
+        status_store.__init__()
+        aliases = [f"w{i}" for i in range(rng.randint(0, 6))]
+        service_cfg = shared_manager("svc", {"big": "llm", **{a: "llm" for a in aliases}})
+        service_cfg.workers[0].memory_gb = rng.randint(1, 30)
+        idle = {a: (rng.randint(1, 16), rng.choice([0, 120, 600, 3600])) for a in aliases}
+        _report("svc", {"big": None, **idle})
+        _available(rng.randint(0, 16))
+
+        plan = PlacementPlanner().plan(service_cfg, "big")
+        freed = sum(c["memory_gb"] for c in plan["evict"])
+        idle_gb = sum(gb for gb, seconds in idle.values() if seconds >= 60)
+        assert plan["feasible"] == (idle_gb >= plan["shortfall_gb"])
+        if plan["feasible"]:
+            assert freed >= plan["shortfall_gb"]
+            for c in plan["evict"]:
+                assert freed - c["memory_gb"] < plan["shortfall_gb"]
+                assert idle[c["alias"]][1] >= 60
+
+
+def test_execute_evicts_then_spawns(api, shared_manager, mock_upstream):
+    service_cfg = shared_manager("svc", {"big": "llm", "a": "llm", "b": "llm"})
+    service_cfg.workers[0].memory_gb = 12
+    _report("svc", {"big": None, "a": (6, 900), "b": (6, 800)})
+    _available(2)
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        return httpx.Response(200, json={})
+
+    async def run():
+        mock_upstream(handler)
+        async with api:
+            dry_run = await api.get("/api/v1/services/svc/workers/big/plan")
+            executed = await api.post(
+                "/api/v1/services/svc/workers/big/plan", params={"wait": True}
+            )
+            return dry_run, executed
+
+    dry_run, executed = asyncio.run(run())
+    assert [c["alias"] for c in dry_run.json()["evict"]] == ["a", "b"]
+    assert calls == ["/v1/system/evict/a", "/v1/system/evict/b", "/spawn/big"]
+    assert executed.json()["success"] is True
+
+
+def test_failed_eviction_aborts_the_spawn(shared_manager, mock_upstream):
+    service_cfg = shared_manager("svc", {"big": "llm", "a": "llm", "b": "llm"})
+    service_cfg.workers[0].memory_gb = 12
+    _report("svc", {"big": None, "a": (6, 900), "b": (6, 800)})
+    _available(2)
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        return httpx.Response(500 if request.url.path == "/v1/system/evict/b" else 200, json={})
+
+    async def run():
+        mock_upstream(handler)
+        planner = PlacementPlanner()
+        return await planner.execute(service_cfg, "big", planner.plan(service_cfg, "big"))
+
+    result = asyncio.run(run())
+    assert calls == ["/v1/system/evict/a", "/v1/system/evict/b"]
+    assert not result["success"]
+    assert result["action"] == "spawn" and result["data"]["evicted"] == ["a"]
+
+
+def test_infeasible_plan_is_a_conflict(api, shared_manager):
+    service_cfg = shared_manager("svc", {"big": "llm"})
+    service_cfg.workers[0].memory_gb = 12
+    _report("svc", {"big": None})
+    _available(2)
+
+    async def run():
+        async with api:
+            return await api.post("/api/v1/services/svc/workers/big/plan")
+
+    response = asyncio.run(run())
+    assert response.status_code == 409
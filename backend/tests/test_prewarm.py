@@ -0,0 +1,131 @@
+"""Pre-warming: demand recording per slot and spawning within the memory budget."""
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.services import prewarm as prewarm_module
+from src.services.prewarm import PrewarmScheduler
+from src.services.status_store import status_store
+
+DAY = datetime(2026, 3, 2)
+
+
+@pytest.fixture
+def scheduler(config, tmp_path):
+    config.prewarm.enabled = True
+    config.prewarm.history_path = str(tmp_path / "prewarm-history.json")
+    return PrewarmScheduler()
+
+
+@pytest.fixture
+def spawned(monkeypatch):
+    """Spawns submitted to the admission controller, as (service_id, alias)."""
+    calls = []
+
+    def submit(service_cfg, alias, action):
+        calls.append((service_cfg.id, alias))
+        return {"job_id": f"job-{len(calls)}", "finished_at": None}, False
+
+    monkeypatch.setattr(prewarm_module.admission_controller, "submit", submit)
+    return calls
+
+
+def _statuses(idle: dict[str, float | None], status: str = "running") -> list[dict]:
+    return [
+        {
+            "service_id": "svc",
+            "workers": [
+                {"alias": alias, "status": status, "idle_seconds": seconds}
+                for alias, seconds in idle.items()
+            ],
+        }
+    ]
+
+
+def _counts(scheduler: PrewarmScheduler, alias: str) -> list[float]:
+    return scheduler.history["workers"].get(f"svc/{alias}", [])
+
+
+def test_only_requests_in_the_current_slot_count(scheduler):
+    now = DAY.replace(hour=10, minute=5)
+    # Used at 09:15 (50 minutes ago) and at 10:02
+    scheduler._record(_statuses({"old": 50 * 60, "new": 3 * 60}), now)
+    assert _counts(scheduler, "old") == []
+    assert _counts(scheduler, "new")[10] == 1
+
+
+def test_demand_counts_once_per_slot_and_day(scheduler):
+    for minute in (5, 20, 40):
+        scheduler._record(_statuses({"chat": 1}), DAY.replace(hour=10, minute=minute))
+    scheduler._record(_statuses({"chat": 1}), DAY.replace(hour=11, minute=1))
+    counts = _counts(scheduler, "chat")
+    assert (counts[10], counts[11]) == (1, 1)
+
+    scheduler._record(_statuses({"chat": 1}), DAY.replace(day=3, hour=10, minute=5))
+    assert scheduler.history["days"] == 2
+    assert _counts(scheduler, "chat")[10] == 2
+
+
+def test_old_days_decay(scheduler):
+    scheduler.config.window_days = 2
+    for day in (2, 3, 4):
+        scheduler._record(_statuses({"chat": 1}), DAY.replace(day=day, hour=10, minute=5))
+    assert scheduler.history["days"] == 2
+    # Day 3 halves the two earlier days, then adds its own
+    assert _counts(scheduler, "chat")[10] == pytest.approx(2.0)
+
+
+def test_history_survives_a_restart(scheduler, config):
+    scheduler._record(_statuses({"chat": 1}), DAY.replace(hour=10, minute=5))
+    scheduler._save()
+    assert PrewarmScheduler().history == scheduler.history
+
+    config.prewarm.slot_minutes = 30
+    assert PrewarmScheduler().history["workers"] == {}
+
+
+def _learned(scheduler: PrewarmScheduler, add_service, **memory_gb):
+    service_cfg = add_service(workers={alias: "llm" for alias in memory_gb})
+    for worker_cfg in service_cfg.workers:
+        worker_cfg.memory_gb = memory_gb[worker_cfg.alias]
+    scheduler.history.update(
+        days=3,
+        workers={f"svc/{alias}": [0.0] * 9 + [3.0] + [0.0] * 14 for alias in memory_gb},
+    )
+    status_store.update_worker_manager(
+        service_cfg.worker_manager.url, {"service_id": "svc", "memory": {"available_gb": 64}}
+    )
+    return service_cfg
+
+
+def test_prewarms_ahead_of_the_slot_within_budget(scheduler, add_service, spawned):
+    scheduler.config.memory_budget_gb = 20
+    _learned(scheduler, add_service, small=8, large=30, unknown=None, second=8, third=8)
+
+    asyncio.run(scheduler._prewarm(DAY.replace(hour=8, minute=40)))
+    assert spawned == []
+
+    asyncio.run(scheduler._prewarm(DAY.replace(hour=8, minute=45)))
+    # Too large for the budget, unknown footprint, and the budget runs out after two
+    assert spawned == [("svc", "small"), ("svc", "second")]
+
+    # Planned once per slot
+    asyncio.run(scheduler._prewarm(DAY.replace(hour=8, minute=46)))
+    assert len(spawned) == 2
+
+
+def test_prewarmed_workers_are_not_their_own_demand(scheduler, add_service, spawned):
+    _learned(scheduler, add_service, chat=8)
+    asyncio.run(scheduler._prewarm(DAY.replace(hour=8, minute=45)))
+    assert spawned == [("svc", "chat")]
+    job = scheduler._prewarmed["svc/chat"]
+    job["finished_at"] = DAY.replace(hour=8, minute=46).timestamp()
+
+    # Idle since it was loaded: not demand
+    scheduler._record(_statuses({"chat": 19 * 60 + 30}), DAY.replace(hour=9, minute=5, second=30))
+    assert _counts(scheduler, "chat")[9] == 3
+    # Used at 09:10
+    scheduler._record(_statuses({"chat": 60}), DAY.replace(hour=9, minute=11))
+    assert _counts(scheduler, "chat")[9] == 4
+    assert "svc/chat" not in scheduler._prewarmed
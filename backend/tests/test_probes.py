@@ -0,0 +1,197 @@
+"""Gateway probe kinds, shared batch requests and probe intervals."""
+import asyncio
+import importlib.util
+import socket
+import time
+
+import httpx
+import pytest
+
+from src.core.config import ProbeConfig
+from src.services.probes import GatewayProber
+from src.services.status_store import status_store
+from src.services.upstream import upstream
+
+
+def _check(prober, mock_upstream, handler, *service_cfgs, **kwargs) -> list[dict]:
+    async def run():
+        mock_upstream(handler)
+        return await asyncio.gather(*(prober.check(cfg, **kwargs) for cfg in service_cfgs))
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def probed(add_service):
+    """A service whose gateway is checked with ``probed(kind, **options)``."""
+
+    def make(kind: str = "http", service_id: str = "svc", **options):
+        service_cfg = add_service(service_id)
+        service_cfg.probe = ProbeConfig(kind=kind, options=options, timeout_seconds=1.0)
+        return service_cfg
+
+    return make
+
+
+def _raise(error_type):
+    def handler(request: httpx.Request):
+        raise error_type("failed", request=request)
+
+    return handler
+
+
+@pytest.mark.parametrize(
+    "handler, expected",
+    [
+        (lambda request: httpx.Response(200), {"reachable": True}),
+        (lambda request: httpx.Response(503), {"reachable": False, "error": "HTTP 503"}),
+        (_raise(httpx.ConnectError), {"reachable": False, "error": "Connection refused"}),
+        (_raise(httpx.ReadTimeout), {"reachable": False, "error": "Timeout"}),
+    ],
+)
+def test_http_probe(probed, mock_upstream, handler, expected):
+    (result,) = _check(GatewayProber(), mock_upstream, handler, probed())
+    result.pop("latency_ms", None)
+    assert result == expected
+
+
+def test_http_probe_path_option(probed, mock_upstream):
+    paths = []
+
+    def handler(request: httpx.Request):
+        paths.append(request.url.path)
+        return httpx.Response(200)
+
+    _check(GatewayProber(), mock_upstream, handler, probed(), probed(service_id="b", path="/up"))
+    assert sorted(paths) == ["/healthz", "/up"]
+
+
+def test_open_circuit_keeps_the_last_known_gateway(config, probed, mock_upstream):
+    config.circuit_breaker.failure_threshold = 1
+    service_cfg = probed()
+    status_store.update_service(
+        {"service_id": "svc", "status": "healthy", "gateway": {"latency_ms": 12.0}}
+    )
+    prober = GatewayProber()
+    first, second = (
+        _check(prober, mock_upstream, _raise(httpx.ConnectError), service_cfg)[0],
+        _check(prober, mock_upstream, lambda request: httpx.Response(200), service_cfg)[0],
+    )
+    assert first["error"] == "Connection refused"
+    assert second["reachable"] is False and second["latency_ms"] == 12.0
+    assert second["error"].startswith("Circuit open")
+
+
+def test_tcp_probe_connects_without_a_request(config, add_service, monkeypatch):
+    monkeypatch.setattr(upstream, "breakers", {})
+    accepted = []
+
+    async def run():
+        server = await asyncio.start_server(
+            lambda reader, writer: (accepted.append(True), writer.close()), "127.0.0.1", 0
+        )
+        open_port = server.sockets[0].getsockname()[1]
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            closed_port = sock.getsockname()[1]
+
+        results = []
+        for port in (open_port, closed_port):
+            service_cfg = add_service(f"svc-{port}", gateway_port=port)
+            service_cfg.gateway.host = "127.0.0.1"
+            service_cfg.probe = ProbeConfig(kind="tcp", timeout_seconds=1.0)
+            results.append(await GatewayProber().check(service_cfg))
+        server.close()
+        await server.wait_closed()
+        return results
+
+    up, down = asyncio.run(run())
+    assert up["reachable"] is True and up["latency_ms"] >= 0
+    assert down == {"reachable": False, "error": "Connection refused"}
+    assert accepted == [True]
+
+
+def test_http2_probe_falls_back_without_h2(probed, mock_upstream):
+    if importlib.util.find_spec("h2") is not None:
+        pytest.skip("h2 is installed; the fallback is not used")
+    prober = GatewayProber()
+    (result,) = _check(prober, mock_upstream, lambda request: httpx.Response(200), probed("http2"))
+    assert result["reachable"] is True
+    assert prober._http2_missing
+
+
+@pytest.mark.parametrize(
+    "payload, expected",
+    [
+        ({"svc": True}, {"reachable": True}),
+        ({"targets": {"svc": "OK"}}, {"reachable": True}),
+        ({"svc": {"healthy": False}}, {"reachable": False, "error": "Reported unhealthy"}),
+        ({"svc": {"status": "running", "latency_ms": 3}}, {"reachable": True, "latency_ms": 3}),
+        ({"svc": "degraded"}, {"reachable": False, "error": "Reported unhealthy"}),
+        ({"other": True}, {"reachable": False, "error": "No entry for svc"}),
+        (["svc"], {"reachable": False, "error": "No entry for svc"}),
+    ],
+)
+def test_batch_probe_payloads(probed, mock_upstream, payload, expected):
+    (result,) = _check(
+        GatewayProber(),
+        mock_upstream,
+        lambda request: httpx.Response(200, json=payload),
+        probed("batch"),
+    )
+    if "latency_ms" not in expected:
+        result.pop("latency_ms")
+    assert result == expected
+
+
+def test_batch_probe_key_and_error_status(probed, mock_upstream):
+    service_cfg = probed("batch", url="http://hub/health", key="vision-gw")
+    responses = iter([httpx.Response(200, json={"vision-gw": "up"}), httpx.Response(502)])
+    prober = GatewayProber()
+    (up,) = _check(prober, mock_upstream, lambda request: next(responses), service_cfg)
+    assert up["reachable"] is True
+    status_store.mark_snapshot()
+    (failing,) = _check(prober, mock_upstream, lambda request: next(responses), service_cfg)
+    assert failing["error"] == "HTTP 502"
+
+
+def test_batch_probe_shares_one_request_per_poll(probed, mock_upstream):
+    services = [probed("batch", service_id=f"s{i}", url="http://hub/health") for i in range(5)]
+    requests = []
+
+    async def handler(request: httpx.Request):
+        requests.append(request.url.path)
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={f"s{i}": i % 2 == 0 for i in range(5)})
+
+    prober = GatewayProber()
+    results = _check(prober, mock_upstream, handler, *services)
+    assert [r["reachable"] for r in results] == [True, False, True, False, True]
+    assert len(requests) == 1
+
+    status_store.mark_snapshot()
+    _check(prober, mock_upstream, handler, *services)
+    assert len(requests) == 2
+
+
+def test_interval_reuses_the_last_result(probed, mock_upstream, monkeypatch):
+    service_cfg = probed()
+    service_cfg.probe.interval_seconds = 60
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request.url.path)
+        return httpx.Response(200)
+
+    prober = GatewayProber()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    first = _check(prober, mock_upstream, handler, service_cfg)[0]
+    monkeypatch.setattr(time, "time", lambda: now + 30)
+    assert _check(prober, mock_upstream, handler, service_cfg)[0] is first
+    assert len(calls) == 1
+
+    _check(prober, mock_upstream, handler, service_cfg, force=True)
+    monkeypatch.setattr(time, "time", lambda: now + 100)
+    _check(prober, mock_upstream, handler, service_cfg)
+    assert len(calls) == 3
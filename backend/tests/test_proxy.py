@@ -0,0 +1,170 @@
+"""Gateway proxy: encoding normalisation, the bounded TTL cache and streaming."""
+import asyncio
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+
+from src.services.proxy import ProxyCache, accepted_encodings, normalize_encoding
+
+MODELS_URL = "/api/v1/services/svc/models"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=0.5, deflate", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("BR;Q=0, GZIP;q=0", "identity"),
+        ("identity", "identity"),
+        ("", "identity"),
+        ("gzip;q=oops", "identity"),
+    ],
+)
+def test_normalize_encoding(header, expected):
+    assert normalize_encoding(header) == expected
+
+
+def test_accepted_encodings_drop_refused_codings():
+    assert accepted_encodings("gzip;q=0.001, br;q=0.0, *") == {"gzip", "*"}
+
+
+def test_cache_entries_expire(config, monkeypatch):
+    cache = ProxyCache()
+    cache.put(("a", "gzip"), 200, {}, b"body")
+    assert cache.get(("a", "gzip")) == (200, {}, b"body")
+    assert cache.get(("a", "identity")) is None
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + config.proxy.cache_ttl_seconds + 1)
+    assert cache.get(("a", "gzip")) is None
+    assert cache.entries == {} and cache.total_bytes == 0
+
+
+def test_cache_is_bounded_by_count_and_bytes(config):
+    config.proxy.max_cache_entries = 3
+    config.proxy.max_cache_total_bytes = 10
+    cache = ProxyCache()
+    for name in "abc":
+        cache.put((name, "identity"), 200, {}, b"xx")
+    cache.put(("d", "identity"), 200, {}, b"xx")
+    assert [k[0] for k in cache.entries] == ["b", "c", "d"]
+
+    cache.put(("e", "identity"), 200, {}, b"xxxxxxx")
+    assert [k[0] for k in cache.entries] == ["d", "e"]
+    assert cache.total_bytes == 9
+
+    # Replacing an entry does not count it twice
+    cache.put(("e", "identity"), 200, {}, b"yyyyyyy")
+    assert cache.total_bytes == 9
+    cache.put(("huge", "identity"), 200, {}, b"z" * 11)
+    assert ("huge", "identity") not in cache.entries
+
+
+def test_expired_entries_go_before_live_ones(config, monkeypatch):
+    config.proxy.max_cache_entries = 2
+    cache = ProxyCache()
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    cache.put(("live", "identity"), 200, {}, b"1")
+    cache.entries[("old", "identity")] = (now - 1, 200, {}, b"2")
+    cache.total_bytes += 1
+    cache.put(("new", "identity"), 200, {}, b"3")
+    assert set(k[0] for k in cache.entries) == {"live", "new"}
+
+
+def test_disabled_cache_stores_nothing(config):
+    config.proxy.cache_ttl_seconds = 0
+    cache = ProxyCache()
+    cache.put(("a", "identity"), 200, {}, b"body")
+    assert cache.entries == {}
+
+
+def _streamed(status_code: int, body: bytes, headers: dict | None = None) -> httpx.Response:
+    """An upstream response whose body arrives in chunks, like a real connection."""
+
+    async def chunks():
+        for start in range(0, len(body), 10):
+            yield body[start : start + 10]
+
+    return httpx.Response(status_code, content=chunks(), headers=headers)
+
+
+def _serve(api, mock_upstream, handler, requests: list[dict]) -> list[httpx.Response]:
+    async def run():
+        mock_upstream(handler)
+        async with api:
+            return [await api.get(MODELS_URL, headers=headers) for headers in requests]
+
+    return asyncio.run(run())
+
+
+def test_compressed_bodies_are_streamed_and_cached_raw(api, add_service, mock_upstream):
+    add_service()
+    models = {"data": [{"id": "qwen"}]}
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append(request.headers["accept-encoding"])
+        return _streamed(
+            200,
+            gzip.compress(json.dumps(models).encode()),
+            {"Content-Encoding": "gzip", "Connection": "keep-alive"},
+        )
+
+    first, second, plain = _serve(
+        api,
+        mock_upstream,
+        handler,
+        [
+            {"Accept-Encoding": "gzip"},
+            {"Accept-Encoding": "deflate, gzip"},
+            {"Accept-Encoding": "identity"},
+        ],
+    )
+    assert seen == ["gzip", "identity"]
+    assert [r.headers["x-cache"] for r in (first, second, plain)] == ["MISS", "HIT", "MISS"]
+    assert first.json() == second.json() == models
+    assert second.headers["content-encoding"] == "gzip"
+    assert "connection" not in first.headers
+
+
+def test_errors_and_large_bodies_are_not_cached(api, config, add_service, mock_upstream):
+    config.proxy.max_cache_bytes = 16
+    add_service()
+    bodies = iter([(500, b"oops"), (500, b"oops"), (200, b"x" * 64), (200, b"x" * 64)])
+
+    def handler(request: httpx.Request):
+        status_code, content = next(bodies)
+        return _streamed(status_code, content)
+
+    responses = _serve(api, mock_upstream, handler, [{}] * 4)
+    assert [r.status_code for r in responses] == [500, 500, 200, 200]
+    assert [r.headers["x-cache"] for r in responses] == ["MISS"] * 4
+    assert responses[3].content == b"x" * 64
+
+
+def test_unreachable_gateway_is_503(api, add_service, mock_upstream):
+    add_service()
+
+    def handler(request: httpx.Request):
+        raise httpx.ConnectError("refused", request=request)
+
+    (response,) = _serve(api, mock_upstream, handler, [{}])
+    assert response.status_code == 503
+
+
+def test_only_configured_endpoints_are_proxied(api, add_service):
+    add_service()
+
+    async def run():
+        async with api:
+            return (
+                await api.get("/api/v1/services/svc/endpoints/evict"),
+                await api.get("/api/v1/services/ghost/models"),
+            )
+
+    assert [r.status_code for r in asyncio.run(run())] == [404, 404]
@@ -0,0 +1,165 @@
+"""Service listings: filters, sorting, cursor pagination, projection and worker status."""
+import asyncio
+import random
+
+import httpx
+import pytest
+
+from src.api.services import get_worker_status
+from src.core.config import WorkerConfig
+from src.services.status_store import status_store
+
+
+def _status(service_id: str, state: str, latency_ms: float | None, workers: dict) -> dict:
+    return {
+        "service_id": service_id,
+        "name": service_id.upper(),
+        "description": "",
+        "icon": "",
+        "status": state,
+        "gateway": {"reachable": state == "healthy", "latency_ms": latency_ms},
+        "workers": [
+            {"alias": alias, "name": alias, "type": worker_type, "status": worker_status}
+            for alias, (worker_type, worker_status) in workers.items()
+        ],
+    }
+
+
+@pytest.fixture
+def fleet(config):
+    rng = random.Random(7)
+    statuses = []
+    for i in range(40):
+        workers = {
+            f"w{j}": (rng.choice(["llm", "vlm"]), rng.choice(["running", "stopped"]))
+            for j in range(rng.randint(0, 2))
+        }
+        latency = rng.choice([None, rng.randint(1, 20)])
+        status = _status(
+            f"svc-{i:02d}", rng.choice(["healthy", "unhealthy"]), latency, workers
+        )
+        status_store.update_service(status)
+        statuses.append(status)
+    return statuses
+
+
+def _get(api, url: str, **params) -> httpx.Response:
+    async def run():
+        async with api:
+            return await api.get(url, params=params)
+
+    return asyncio.run(run())
+
+
+def _pages(api, **params) -> list[str]:
+    """Follow ``next_cursor`` from the first page to the last, collecting service IDs."""
+
+    async def run():
+        ids, cursor = [], None
+        async with api:
+            while True:
+                page_params = {**params, "limit": 7, **({"cursor": cursor} if cursor else {})}
+                page = await api.get("/api/v1/services", params=page_params)
+                assert page.status_code == 200
+                body = page.json()
+                ids.extend(s["service_id"] for s in body["services"])
+                cursor = body["next_cursor"]
+                if cursor is None:
+                    return ids
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("sort", ["service_id", "-service_id", "name", "-status", "latency_ms"])
+def test_pages_cover_the_sorted_listing(api, fleet, sort):
+    field = sort.removeprefix("-")
+
+    def key(status):
+        if field == "latency_ms":
+            latency = status["gateway"]["latency_ms"]
+            return (latency if latency is not None else float("inf"), status["service_id"])
+        value = status[field].lower() if field == "name" else status[field]
+        return (value, status["service_id"])
+
+    expected = [s["service_id"] for s in sorted(fleet, key=key, reverse=sort.startswith("-"))]
+    assert _pages(api, sort=sort) == expected
+
+
+def test_filters_match_brute_force(api, fleet):
+    expected = [
+        s["service_id"]
+        for s in fleet
+        if s["status"] == "healthy"
+        and any(w["type"] == "vlm" and w["status"] == "running" for w in s["workers"])
+    ]
+    body = _get(
+        api, "/api/v1/services", status="healthy", type="vlm", worker_status="running"
+    ).json()
+    assert [s["service_id"] for s in body["services"]] == expected
+    assert body["total"] == len(expected)
+
+
+def test_filtered_pages_match_brute_force(api, fleet):
+    expected = [s["service_id"] for s in fleet if s["status"] == "unhealthy"]
+    assert _pages(api, status="unhealthy") == expected
+
+
+def test_field_projection(api, fleet):
+    body = _get(api, "/api/v1/services", fields="service_id,status", limit=2).json()
+    assert body["services"] == [
+        {"service_id": s["service_id"], "status": s["status"]} for s in fleet[:2]
+    ]
+    assert body["total"] == len(fleet)
+
+
+@pytest.mark.parametrize(
+    "params", [{"fields": "service_id,secret"}, {"sort": "memory"}, {"cursor": "garbage"}]
+)
+def test_bad_parameters_are_400(api, fleet, params):
+    assert _get(api, "/api/v1/services", **params).status_code == 400
+
+
+WORKERS = [
+    WorkerConfig(alias="chat", name="Chat", type="llm"),
+    WorkerConfig(alias="found", name="Found", type="vlm", discovered=True),
+]
+
+
+def _worker_status(mock_upstream, handler) -> list[dict]:
+    async def run():
+        mock_upstream(handler)
+        return await get_worker_status("http://wm:8100", WORKERS, "svc")
+
+    return [w.model_dump() for w in asyncio.run(run())]
+
+
+def test_worker_status_from_manager(mock_upstream):
+    workers = _worker_status(
+        mock_upstream,
+        lambda request: httpx.Response(200, json={"workers": {"chat": {"idle_seconds": 5}}}),
+    )
+    assert [(w["alias"], w["status"], w["discovered"]) for w in workers] == [
+        ("chat", "running", False),
+        ("found", "stopped", True),
+    ]
+
+
+def _refuse(request):
+    raise httpx.ConnectError("refused", request=request)
+
+
+@pytest.mark.parametrize(
+    "handler",
+    [
+        lambda request: httpx.Response(500),
+        lambda request: httpx.Response(200, content=b"not json"),
+        _refuse,
+    ],
+    ids=["error-status", "invalid-json", "unreachable"],
+)
+def test_worker_status_keeps_its_shape_on_errors(mock_upstream, handler):
+    workers = _worker_status(mock_upstream, handler)
+    assert [(w["status"], w["discovered"]) for w in workers] == [
+        ("unknown", False),
+        ("unknown", True),
+    ]
@@ -0,0 +1,160 @@
+"""conf.d service files: merging, validation and the parsed registry cache."""
+import os
+import pickle
+import threading
+
+import pytest
+
+from src.core import config as config_module
+from src.core.config import REGISTRY_CACHE_VERSION, load_config, load_services_dir
+
+
+def _service_yaml(service_id: str, port: int = 8000, aliases: tuple[str, ...] = ("chat",)) -> str:
+    workers = "".join(
+        f"\n    - alias: {alias}\n      name: {alias}\n      type: llm" for alias in aliases
+    )
+    return (
+        f"{service_id}:\n  name: {service_id.title()}\n"
+        f"  gateway:\n    host: {service_id}\n    port: {port}\n"
+        f"  workers:{workers or ' []'}\n"
+    )
+
+
+def _config_yaml(*service_ids: str, extra: str = "services_dir: conf.d\n") -> str:
+    """config.yaml with the given services inline, plus ``extra`` top-level settings."""
+    services = "".join(_service_yaml(service_id) for service_id in service_ids)
+    return "services:\n" + "".join(f"  {line}\n" for line in services.splitlines()) + extra
+
+
+@pytest.fixture
+def conf_d(tmp_path):
+    directory = tmp_path / "conf.d"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Names of the services parsed from files, one list per file."""
+    parsed = []
+    lock = threading.Lock()
+    parse = config_module._parse_service_file
+
+    def counting(data: bytes):
+        services = parse(data)
+        with lock:
+            parsed.append(sorted(services))
+        return services
+
+    monkeypatch.setattr(config_module, "_parse_service_file", counting)
+    return parsed
+
+
+def test_config_and_directory_are_merged(tmp_path, conf_d):
+    (tmp_path / "config.yaml").write_text(
+        _config_yaml("vision", extra="services_dir: conf.d\nregistry_cache: registry.pickle\n")
+    )
+    (conf_d / "voice.yaml").write_text(_service_yaml("voice", 8001))
+    (conf_d / "text.yml").write_text(_config_yaml("text", extra=""))
+    (conf_d / "notes.txt").write_text("not: [a, service")
+    (conf_d / "example.yaml.sample").write_text(_service_yaml("sample"))
+
+    config = load_config(tmp_path / "config.yaml")
+    assert sorted(config.services) == ["text", "vision", "voice"]
+    assert config.services["voice"].gateway.port == 8001
+    assert [w.alias for w in config.services["text"].workers] == ["chat"]
+    assert (tmp_path / "registry.pickle").exists()
+
+
+def test_service_defined_twice_is_rejected(tmp_path, conf_d):
+    (conf_d / "a.yaml").write_text(_service_yaml("voice"))
+    (conf_d / "b.yaml").write_text(_service_yaml("voice"))
+    with pytest.raises(ValueError, match="'voice' is defined in a.yaml and b.yaml"):
+        load_services_dir(conf_d)
+
+    (conf_d / "b.yaml").unlink()
+    (tmp_path / "config.yaml").write_text(_config_yaml("voice"))
+    with pytest.raises(ValueError, match=r"both config.yaml and conf.d: \['voice'\]"):
+        load_config(tmp_path / "config.yaml")
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        (_service_yaml("svc", port=70000), "invalid port 70000"),
+        (_service_yaml("svc", aliases=("chat", "chat")), "worker aliases must be unique"),
+        (_service_yaml("svc") + "  probe:\n    kind: ping\n", "unknown probe kind 'ping'"),
+        ("svc: [not, a, mapping]\n", "Invalid service file"),
+        ("svc: {name: [unclosed\n", "Invalid service file"),
+    ],
+)
+def test_invalid_files_name_the_file(conf_d, content, message):
+    (conf_d / "broken.yaml").write_text(content)
+    with pytest.raises(ValueError, match=message) as exc_info:
+        load_services_dir(conf_d)
+    if "Invalid service file" not in message:
+        assert "broken.yaml" in str(exc_info.value)
+
+
+def test_restart_only_reparses_edited_files(tmp_path, conf_d, parses):
+    cache = tmp_path / "registry.pickle"
+    for i in range(5):
+        (conf_d / f"svc{i}.yaml").write_text(_service_yaml(f"svc{i}"))
+
+    first = load_services_dir(conf_d, cache)
+    assert len(parses) == 5
+
+    parses.clear()
+    assert load_services_dir(conf_d, cache) == first
+    assert parses == []
+
+    (conf_d / "svc2.yaml").write_text(_service_yaml("svc2", port=9002))
+    (conf_d / "svc5.yaml").write_text(_service_yaml("svc5"))
+    (conf_d / "svc0.yaml").unlink()
+    services = load_services_dir(conf_d, cache)
+    assert sorted(parses) == [["svc2"], ["svc5"]]
+    assert sorted(services) == ["svc1", "svc2", "svc3", "svc4", "svc5"]
+    assert services["svc2"].gateway.port == 9002
+
+    with open(cache, "rb") as f:
+        assert sorted(pickle.load(f)["files"]) == [f"svc{i}.yaml" for i in range(1, 6)]
+
+
+def test_touched_files_are_matched_by_content(tmp_path, conf_d, parses):
+    cache = tmp_path / "registry.pickle"
+    file = conf_d / "svc.yaml"
+    file.write_text(_service_yaml("svc"))
+    load_services_dir(conf_d, cache)
+
+    stat = file.stat()
+    os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    parses.clear()
+    load_services_dir(conf_d, cache)
+    assert parses == []
+    # The new mtime is cached, so the next start skips even the hash
+    with open(cache, "rb") as f:
+        assert pickle.load(f)["files"]["svc.yaml"]["mtime_ns"] == stat.st_mtime_ns + 10**9
+
+
+@pytest.mark.parametrize(
+    "cache_content",
+    [
+        b"garbage",
+        b"",
+        pickle.dumps({"version": REGISTRY_CACHE_VERSION - 1, "files": {}}),
+        pickle.dumps(["not", "a", "dict"]),
+    ],
+)
+def test_unusable_caches_are_rebuilt(tmp_path, conf_d, parses, cache_content):
+    cache = tmp_path / "registry.pickle"
+    cache.write_bytes(cache_content)
+    (conf_d / "svc.yaml").write_text(_service_yaml("svc"))
+
+    assert list(load_services_dir(conf_d, cache)) == ["svc"]
+    assert parses == [["svc"]]
+    with open(cache, "rb") as f:
+        assert pickle.load(f)["version"] == REGISTRY_CACHE_VERSION
+
+
+def test_missing_directory_has_no_services(tmp_path):
+    assert load_services_dir(tmp_path / "nope") == {}
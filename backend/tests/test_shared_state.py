@@ -0,0 +1,149 @@
+"""Shared state: leader lock, snapshot mirroring and the Unix socket hub."""
+import asyncio
+import json
+
+import pytest
+
+from src.services import shared_state as shared_state_module
+from src.services.shared_state import LeaderLock, SharedState, UnixSocketBackend
+from src.services.status_store import status_store
+
+
+def _service(service_id: str, state: str = "healthy") -> dict:
+    return {"service_id": service_id, "status": state, "gateway": {}, "workers": []}
+
+
+def _snapshot(origin: str, services: list[dict], **extra) -> dict:
+    return {
+        "origin": origin,
+        "kind": "snapshot",
+        "services": {s["service_id"]: s for s in services},
+        "worker_managers": extra.get("worker_managers", {}),
+        "footprints": extra.get("footprints", []),
+        "revision": extra.get("revision", 1),
+    }
+
+
+def test_only_one_leader_per_lock_file(tmp_path):
+    path = str(tmp_path / "leader.lock")
+    leader, follower = LeaderLock(path), LeaderLock(path)
+    assert leader.try_acquire()
+    assert leader.try_acquire()
+    assert not follower.try_acquire()
+    leader.release()
+    assert follower.try_acquire()
+    follower.release()
+
+
+def test_follower_mirrors_snapshots(config):
+    state = SharedState()
+    wm = {"url": "http://wm:8100", "service_id": "a"}
+
+    async def run():
+        await state._on_message(
+            _snapshot(
+                "leader",
+                [_service("a"), _service("peer/b")],
+                worker_managers={"http://wm:8100": wm, "http://gone:8100": wm},
+                footprints=[["a", "chat", 6.0]],
+                revision=7,
+            )
+        )
+        # The leader dropped a service (a federated peer went away) and a manager
+        await state._on_message(
+            _snapshot(
+                "leader",
+                [_service("a", "unhealthy")],
+                worker_managers={"http://wm:8100": wm},
+                footprints=[["a", "chat", 4.0]],
+                revision=8,
+            )
+        )
+
+    asyncio.run(run())
+    assert status_store.sorted_ids == ["a"]
+    assert status_store.get_service("a")["status"] == "unhealthy"
+    assert list(status_store.worker_managers) == ["http://wm:8100"]
+    assert status_store.footprints[("a", "chat")] == 6.0
+    assert status_store.overview()["services_count"] == 1
+    assert status_store.content_revision == "8.0"
+
+
+def test_own_messages_are_ignored(config):
+    state = SharedState()
+    asyncio.run(state._on_message(_snapshot(state.origin, [_service("a")])))
+    assert status_store.services == {}
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "state.sock")
+
+
+async def _next(queue: asyncio.Queue) -> dict:
+    return await asyncio.wait_for(queue.get(), 2)
+
+
+def test_unix_hub_relays_between_processes(socket_path):
+    async def run():
+        inboxes = [asyncio.Queue() for _ in range(3)]
+        leader, *followers = [UnixSocketBackend(inbox.put, socket_path) for inbox in inboxes]
+        await leader.start(leader=True)
+        # Large enough to overflow the default 64 KiB stream limit
+        snapshot = {"kind": "snapshot", "blob": "x" * 5_000_000}
+        await leader.store_snapshot(snapshot)
+        for follower in followers:
+            await follower.start(leader=False)
+        try:
+            assert (await _next(inboxes[1]))["blob"] == snapshot["blob"]
+            assert (await _next(inboxes[2]))["blob"] == snapshot["blob"]
+
+            await leader.publish({"kind": "broadcast", "n": 1})
+            assert (await _next(inboxes[1]))["n"] == 1
+            assert (await _next(inboxes[2]))["n"] == 1
+
+            # A follower's broadcast reaches the leader and the other follower only
+            await followers[0].publish({"kind": "broadcast", "n": 2})
+            assert (await _next(inboxes[0]))["n"] == 2
+            assert (await _next(inboxes[2]))["n"] == 2
+            await asyncio.sleep(0.05)
+            assert inboxes[1].empty()
+        finally:
+            for backend in (*followers, leader):
+                await backend.stop()
+
+    asyncio.run(run())
+
+
+def test_slow_follower_is_dropped(socket_path, monkeypatch):
+    monkeypatch.setattr(shared_state_module, "UNIX_PEER_QUEUE_SIZE", 4)
+
+    async def run():
+        leader = UnixSocketBackend(asyncio.Queue().put, socket_path)
+        await leader.start(leader=True)
+        # Connected but never reading
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        while not leader._peers:
+            await asyncio.sleep(0.01)
+        try:
+            line = {"kind": "broadcast", "blob": "x" * 1_000_000}
+            for _ in range(50):
+                await leader.publish(line)
+                await asyncio.sleep(0)
+            return len(leader._peers)
+        finally:
+            writer.close()
+            await leader.stop()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_snapshot_is_one_json_line(socket_path):
+    async def run():
+        leader = UnixSocketBackend(asyncio.Queue().put, socket_path)
+        await leader.store_snapshot({"text": "line\nbreak"})
+        return leader._snapshot
+
+    line = asyncio.run(run())
+    assert line.count(b"\n") == 1
+    assert json.loads(line) == {"text": "line\nbreak"}
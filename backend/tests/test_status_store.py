@@ -0,0 +1,129 @@
+"""StatusStore: incremental aggregates and filter index match a full recount."""
+import random
+
+from src.services.status_store import StatusStore
+
+WORKER_TYPES = {"llm-a": "llm", "llm-b": "llm", "vlm-a": "vlm", "tts-a": "tts"}
+
+
+def _status(service_id: str, status: str, workers: dict[str, str]) -> dict:
+    return {
+        "service_id": service_id,
+        "status": status,
+        "gateway": {"reachable": status == "healthy"},
+        "workers": [
+            {"alias": alias, "type": WORKER_TYPES[alias], "status": worker_status}
+            for alias, worker_status in workers.items()
+        ],
+    }
+
+
+def _recount(store: StatusStore) -> dict:
+    statuses = list(store.services.values())
+    workers = [w for s in statuses for w in s["workers"]]
+    return {
+        "services_count": len(statuses),
+        "healthy_services": sum(s["status"] == "healthy" for s in statuses),
+        "unhealthy_services": sum(s["status"] == "unhealthy" for s in statuses),
+        "total_workers": len(workers),
+        "running_workers": sum(w["status"] == "running" for w in workers),
+    }
+
+
+def _brute_query(store: StatusStore, status=None, worker_type=None, worker_status=None) -> set:
+    matches = set()
+    for sid, s in store.services.items():
+        if status is not None and s["status"] != status:
+            continue
+        if not any(
+            (worker_type is None or w["type"] == worker_type)
+            and (worker_status is None or w["status"] == worker_status)
+            for w in s["workers"]
+        ) and (worker_type is not None or worker_status is not None):
+            continue
+        matches.add(sid)
+    return matches
+
+
+def test_overview_counts_follow_transitions():
+    store = StatusStore()
+    store.update_service(_status("a", "healthy", {"llm-a": "running", "vlm-a": "stopped"}))
+    store.update_service(_status("b", "unhealthy", {"tts-a": "stopped"}))
+    assert store.overview()["running_workers"] == 1
+
+    store.update_service(_status("a", "unhealthy", {"llm-a": "stopped", "vlm-a": "stopped"}))
+    overview = store.overview()
+    assert overview["healthy_services"] == 0
+    assert overview["unhealthy_services"] == 2
+    assert overview["total_workers"] == 3
+    assert overview["running_workers"] == 0
+
+
+def test_unchanged_state_does_not_bump_version():
+    store = StatusStore()
+    status = _status("a", "healthy", {"llm-a": "running"})
+    assert store.update_service(status) is True
+    version = store.version
+    # Same state, different latency: stored, but aggregates are untouched
+    assert not store.update_service({**status, "gateway": {"reachable": True, "latency_ms": 3}})
+    assert store.version == version
+    assert store.get_service("a")["gateway"]["latency_ms"] == 3
+
+
+def test_remove_service_updates_counts_index_and_order():
+    store = StatusStore()
+    for sid in ("c", "a", "b"):
+        store.update_service(_status(sid, "healthy", {"llm-a": "running"}))
+    assert store.sorted_ids == ["a", "b", "c"]
+
+    assert store.remove_service("b") is True
+    assert store.remove_service("b") is False
+    assert store.sorted_ids == ["a", "c"]
+    assert store.query(status="healthy") == {"a", "c"}
+    assert store.overview()["services_count"] == 2
+
+
+def test_content_revision_moves_on_writes_between_snapshots():
+    store = StatusStore()
+    store.update_service(_status("a", "healthy", {"llm-a": "running"}))
+    store.mark_snapshot()
+    after_poll = store.content_revision
+
+    store.update_service(
+        {**_status("a", "healthy", {"llm-a": "running"}), "gateway": {"latency_ms": 9}}
+    )
+    assert store.content_revision != after_poll
+
+    store.mark_snapshot(revision=7)
+    assert store.content_revision == "7.0"
+
+
+def test_random_updates_match_recount_and_brute_force_queries():
+    rng = random.Random(42)
+    store = StatusStore()
+    service_ids = [f"svc-{i:02d}" for i in range(30)]
+
+    for _ in range(2000):
+        sid = rng.choice(service_ids)
+        if rng.random() < 0.05:
+            store.remove_service(sid)
+            continue
+        aliases = rng.sample(sorted(WORKER_TYPES), rng.randint(0, len(WORKER_TYPES)))
+        workers = {alias: rng.choice(["running", "stopped", "unknown"]) for alias in aliases}
+        store.update_service(
+            _status(sid, rng.choice(["healthy", "unhealthy", "unknown"]), workers)
+        )
+
+        overview = store.overview()
+        assert {k: overview[k] for k in _recount(store)} == _recount(store)
+
+    assert store.sorted_ids == sorted(store.services)
+    for status in ("healthy", "unhealthy", "unknown", None):
+        for worker_type in ("llm", "vlm", "tts", None):
+            for worker_status in ("running", "stopped", None):
+                expected = _brute_query(store, status, worker_type, worker_status)
+                actual = store.query(status, worker_type, worker_status)
+                if status is None and worker_type is None and worker_status is None:
+                    assert actual is None
+                else:
+                    assert actual == expected, (status, worker_type, worker_status)
@@ -0,0 +1,115 @@
+"""Synthetic inference probes: requests, breaker isolation and idle-time correction."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.services.status_store import status_store
+from src.services.synthetic_probes import PROBE_HEADERS, SyntheticProber
+from src.services.upstream import upstream
+
+
+@pytest.fixture
+def prober(config):
+    config.synthetic_probes.enabled = True
+    config.synthetic_probes.min_idle_seconds = 30
+    return SyntheticProber()
+
+
+def _running(service_id: str, idle: dict[str, float | None], timestamp: float | None = None):
+    status_store.update_service(
+        {
+            "service_id": service_id,
+            "status": "healthy",
+            "timestamp": timestamp or time.time(),
+            "workers": [
+                {"alias": alias, "type": "llm", "status": "running", "idle_seconds": seconds}
+                for alias, seconds in idle.items()
+            ],
+        }
+    )
+
+
+def test_probe_requests_per_type(prober, add_service, mock_upstream):
+    service_cfg = add_service(workers={"chat": "llm", "ears": "stt"})
+    seen = []
+
+    def handler(request: httpx.Request):
+        seen.append(request)
+        return httpx.Response(200, json={})
+
+    async def run():
+        mock_upstream(handler)
+        return [await prober.probe(service_cfg, w) for w in service_cfg.workers]
+
+    results = asyncio.run(run())
+    assert [r["ok"] for r in results] == [True, True]
+    chat, ears = seen
+    assert chat.url.path == "/v1/chat/completions"
+    assert b'"model":"chat"' in chat.content.replace(b" ", b"")
+    assert ears.url.path == "/v1/audio/transcriptions"
+    assert b"probe.wav" in ears.content
+    assert all(r.headers["X-Synthetic-Probe"] == PROBE_HEADERS["X-Synthetic-Probe"] for r in seen)
+    assert [s["samples"] for s in prober.summary()] == [1, 1]
+
+
+def test_slow_inference_does_not_open_the_gateway_breaker(prober, add_service, mock_upstream):
+    service_cfg = add_service(workers={"chat": "llm"})
+
+    def handler(request: httpx.Request):
+        raise httpx.ReadTimeout("slow", request=request)
+
+    async def run():
+        mock_upstream(handler)
+        for _ in range(5):
+            result = await prober.probe(service_cfg, service_cfg.workers[0])
+            assert not result["ok"]
+
+    asyncio.run(run())
+    breaker = upstream.breaker(service_cfg.gateway.url)
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+
+
+def test_probes_skip_an_open_breaker(prober, add_service, mock_upstream):
+    service_cfg = add_service(workers={"chat": "llm"})
+    breaker = upstream.breaker(service_cfg.gateway.url)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    calls = []
+
+    async def run():
+        mock_upstream(lambda request: calls.append(request) or httpx.Response(200))
+        return await prober.probe(service_cfg, service_cfg.workers[0])
+
+    result = asyncio.run(run())
+    assert calls == []
+    assert "Circuit open" in result["error"]
+
+
+def test_due_selects_idle_running_workers_of_probed_types(prober, add_service):
+    prober.config.types = {"tts": {"enabled": False}}
+    add_service(workers={"busy": "llm", "idle": "llm", "unknown": "llm", "voice": "tts"})
+    _running("svc", {"busy": 5, "idle": 120, "unknown": None, "voice": 500})
+
+    assert sorted(w.alias for _, w in prober._due()) == ["idle", "unknown"]
+
+
+def test_effective_idle_ignores_our_own_probe(prober, add_service, mock_upstream):
+    service_cfg = add_service(workers={"chat": "llm"})
+    # Last real request 1000s ago
+    _running("svc", {"chat": 1000})
+
+    async def run():
+        mock_upstream(lambda request: httpx.Response(200))
+        await prober.probe(service_cfg, service_cfg.workers[0])
+
+    asyncio.run(run())
+    # The manager now reports the probe as the last request
+    assert prober.effective_idle("svc", "chat", 0.0) == pytest.approx(1000, abs=1)
+    # A request after the probe: the manager's figure is right again
+    started, finished, _ = prober._probed[("svc", "chat")]
+    prober._probed[("svc", "chat")] = (started - 60, finished - 60, started - 1060)
+    assert prober.effective_idle("svc", "chat", 10.0) == 10.0
+    assert ("svc", "chat") not in prober._probed
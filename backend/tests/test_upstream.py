@@ -0,0 +1,142 @@
+"""Circuit breakers: state machine, and which upstream errors count against a host."""
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.services.upstream import CircuitBreaker, CircuitOpenError, UpstreamClient
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000.0]
+    monkeypatch.setattr(time, "time", lambda: now[0])
+    return now
+
+
+def _open_breaker(clock) -> CircuitBreaker:
+    breaker = CircuitBreaker("gw:80", failure_threshold=3, recovery_timeout_seconds=30)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    return breaker
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker("gw:80", failure_threshold=3, recovery_timeout_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+
+
+def test_only_one_probe_trial_after_recovery(clock):
+    breaker = _open_breaker(clock)
+    assert not breaker.allow(probe=True)
+
+    clock[0] += 30
+    assert not breaker.allow()
+    assert breaker.allow(probe=True)
+    assert breaker.state == "half_open"
+    assert not breaker.allow(probe=True)
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_failed_trial_reopens(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    assert breaker.allow(probe=True)
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opened_at == clock[0]
+    assert not breaker.allow(probe=True)
+
+
+def test_aborted_trial_frees_the_slot(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    assert breaker.allow(probe=True)
+    breaker.abort_trial()
+    assert breaker.state == "half_open"
+    assert breaker.allow(probe=True)
+
+
+def _send(client: UpstreamClient, handler, url: str = "http://gw:8000/health"):
+    async def run():
+        client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client._loop = asyncio.get_running_loop()
+        try:
+            return await client.get(url, timeout=1)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def _raise(error: type[httpx.TransportError]):
+    def handler(request: httpx.Request):
+        raise error("boom", request=request)
+
+    return handler
+
+
+def test_transport_errors_count_but_pool_timeouts_do_not(config):
+    config.circuit_breaker.failure_threshold = 2
+    client = UpstreamClient()
+
+    for _ in range(5):
+        with pytest.raises(httpx.PoolTimeout):
+            _send(client, _raise(httpx.PoolTimeout))
+    assert client.breaker("http://gw:8000").failures == 0
+
+    # Any HTTP response means the host is up
+    response = _send(client, lambda request: httpx.Response(503))
+    assert response.status_code == 503
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            _send(client, _raise(httpx.ConnectError))
+    assert client.breaker("http://gw:8000").state == "open"
+    with pytest.raises(CircuitOpenError):
+        _send(client, lambda request: httpx.Response(200))
+    # Breakers are per host:port
+    assert _send(client, lambda r: httpx.Response(200), "http://gw:9000/").status_code == 200
+
+
+def test_unprobed_host_recovers_through_ordinary_calls(clock):
+    breaker = _open_breaker(clock)
+    clock[0] += 30
+    assert not breaker.allow()
+    clock[0] += 30
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_slow_responses_do_not_count(config):
+    config.circuit_breaker.failure_threshold = 2
+    client = UpstreamClient()
+
+    for error in (httpx.ReadTimeout, httpx.RemoteProtocolError, httpx.ReadError):
+        for _ in range(3):
+            with pytest.raises(error):
+                _send(client, _raise(error))
+    assert client.breaker("http://gw:8000").failures == 0
+
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectTimeout):
+            _send(client, _raise(httpx.ConnectTimeout))
+    assert client.breaker("http://gw:8000").state == "open"
@@ -1,11 +1,12 @@
 import { useEffect, useRef, useCallback } from 'react';
 import { useDashboardStore } from '../stores/dashboardStore';
-import type { ServiceStatus } from '../types';
+import type { ServiceStatus, SystemOverview, WSHeartbeat } from '../types';
 
 export function useWebSocket() {
   const wsRef = useRef<WebSocket | null>(null);
   const reconnectTimeoutRef = useRef<number | null>(null);
   const updateService = useDashboardStore((state) => state.updateService);
+  const setSystemOverview = useDashboardStore((state) => state.setSystemOverview);
   const setWsConnected = useDashboardStore((state) => state.setWsConnected);
 
   const connect = useCallback(() => {
@@ -30,8 +31,14 @@ export function useWebSocket() {
       try {
         const message = JSON.parse(event.data);
 
-        if (message.type === 'services_update') {
+        if (message.type === 'heartbeat') {
+          // Answer server heartbeats so the connection isn't reaped as dead
+          const { seq } = (message as WSHeartbeat).data;
+          ws.send(JSON.stringify({ type: 'heartbeat_ack', seq }));
+        } else if (message.type === 'services_update') {
           updateService(message.data as ServiceStatus);
+        } else if (message.type === 'overview_update') {
+          setSystemOverview(message.data as SystemOverview);
         }
       } catch (e) {
         console.error('Failed to parse WebSocket message:', e);
@@ -55,7 +62,7 @@ export function useWebSocket() {
     };
 
     wsRef.current = ws;
-  }, [updateService, setWsConnected]);
+  }, [updateService, setSystemOverview, setWsConnected]);
 
   useEffect(() => {
     connect();
@@ -1,6 +1,7 @@
-import type { ServiceStatus, SystemOverview, WorkerActionResponse } from '../types';
+import type { JobStatus, ServiceStatus, SystemOverview, WorkerActionResponse } from '../types';
 
 const API_BASE = '/api/v1';
+const JOB_POLL_INTERVAL_MS = 1000;
 
 export async function fetchServices(): Promise<{ services: ServiceStatus[]; timestamp: number }> {
   const response = await fetch(`${API_BASE}/services`);
@@ -26,6 +27,26 @@ export async function fetchSystemOverview(): Promise<SystemOverview> {
   return response.json();
 }
 
+export async function fetchJob(jobId: string): Promise<JobStatus> {
+  const response = await fetch(`${API_BASE}/jobs/${jobId}`);
+  if (!response.ok) {
+    throw new Error(`Failed to fetch job: ${response.statusText}`);
+  }
+  return response.json();
+}
+
+// Worker actions run as background jobs; poll until the job finishes.
+async function waitForJob(job: JobStatus): Promise<WorkerActionResponse> {
+  while (job.state === 'pending' || job.state === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    job = await fetchJob(job.job_id);
+  }
+  if (!job.result) {
+    throw new Error(job.error ?? `Worker ${job.action} failed`);
+  }
+  return job.result;
+}
+
 export async function spawnWorker(
   serviceId: string,
   alias: string
@@ -37,7 +58,7 @@ export async function spawnWorker(
   if (!response.ok) {
     throw new Error(`Failed to spawn worker: ${response.statusText}`);
   }
-  return response.json();
+  return waitForJob(await response.json());
 }
 
 export async function stopWorker(
@@ -51,7 +72,7 @@ export async function stopWorker(
   if (!response.ok) {
     throw new Error(`Failed to stop worker: ${response.statusText}`);
   }
-  return response.json();
+  return waitForJob(await response.json());
 }
 
 export async function evictWorker(
@@ -65,7 +86,7 @@ export async function evictWorker(
   if (!response.ok) {
     throw new Error(`Failed to evict worker: ${response.statusText}`);
   }
-  return response.json();
+  return waitForJob(await response.json());
 }
 
 export async function stopAllWorkers(serviceId: string): Promise<{ success: boolean; message: string }> {
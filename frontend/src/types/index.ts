@@ -13,6 +13,7 @@ export interface WorkerStatus {
   memory_gb?: number;
   uptime_seconds?: number;
   idle_seconds?: number;
+  discovered?: boolean;
 }
 
 export interface ServiceStatus {
@@ -56,6 +57,21 @@ export interface WorkerActionResponse {
   worker_alias: string;
   action: string;
   data?: Record<string, unknown>;
+  job_id?: string;
+}
+
+export interface JobStatus {
+  job_id: string;
+  action: string;
+  service_id: string;
+  worker_alias: string;
+  state: 'pending' | 'running' | 'succeeded' | 'failed';
+  created_at: number;
+  started_at?: number;
+  finished_at?: number;
+  result?: WorkerActionResponse;
+  error?: string;
+  status_code?: number;
 }
 
 // WebSocket message types
@@ -74,3 +90,16 @@ export interface WSWorkerUpdate extends WSMessage {
   type: 'workers_update';
   data: WorkerStatus;
 }
+
+export interface WSOverviewUpdate extends WSMessage {
+  type: 'overview_update';
+  data: SystemOverview;
+}
+
+export interface WSHeartbeat extends WSMessage {
+  type: 'heartbeat';
+  data: {
+    seq: number;
+    rtt_ms: number | null;
+  };
+}